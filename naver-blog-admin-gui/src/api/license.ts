@@ -1,4 +1,5 @@
 import axios from "axios";
+import { client } from "./client";
 
 const API_BASE = import.meta.env.VITE_API_BASE || "http://localhost:8001";
 
@@ -22,8 +23,46 @@ export async function issueLicense({
   return res.data;
 }
 
-export async function getLicenses() {
-  const res = await axios.get(`${API_BASE}/licenses`);
+export interface License {
+  id: number;
+  user_id: number;
+  key: string;
+  plan: string;
+  status: string;
+  issued_at: string;
+  expire_at: string | null;
+}
+
+// 라이선스 목록 조회 조건 (서버에서 필터링, 최신순 / 목록에 없는 파라미터는 400)
+export interface LicenseListParams {
+  limit?: number; // 페이지 크기 (최대 200)
+  cursor?: string | null; // 이전 응답의 next_cursor
+  user_id?: number;
+  status?: string;
+  plan?: string;
+}
+
+// 라이선스 목록 응답 (키셋 커서 페이지네이션)
+export interface PaginatedLicenses {
+  items: License[];
+  total: number; // total_exact가 false면 이 이상
+  total_exact: boolean;
+  size: number;
+  next_cursor: string | null; // 마지막 페이지면 null
+}
+
+// 라이선스 목록 조회 (로그인 필요, 관리자는 전체 / 일반 사용자는 본인 것만)
+export async function getLicenses(
+  params: LicenseListParams = {}
+): Promise<PaginatedLicenses> {
+  const query = Object.fromEntries(
+    Object.entries(params).filter(
+      ([, value]) => value !== undefined && value !== null && value !== ""
+    )
+  );
+  const res = await client.get<PaginatedLicenses>("/licenses/", {
+    params: query,
+  });
   return res.data;
 }
 
@@ -36,15 +75,15 @@ export async function updateLicense({
   status?: string;
   expire_at?: string;
 }) {
-  const res = await axios.patch(`${API_BASE}/licenses/${id}`, {
+  const res = await client.patch<License>(`/licenses/${id}`, {
     status,
     expire_at,
   });
   return res.data;
 }
 
-export async function getLicenseDetail(id: number) {
-  const res = await axios.get(`${API_BASE}/licenses/${id}`);
+export async function getLicenseDetail(id: number): Promise<License> {
+  const res = await client.get<License>(`/licenses/${id}`);
   return res.data;
 }
 
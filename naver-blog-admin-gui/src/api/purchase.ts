@@ -1,4 +1,5 @@
 import axios from "axios";
+import { client } from "./client";
 
 const API_BASE = import.meta.env.VITE_API_BASE || "http://localhost:8000";
 
@@ -148,9 +149,38 @@ export async function validateLicense({
   return res.data;
 }
 
-// 구매 목록 조회
-export async function getPurchases(): Promise<Purchase[]> {
-  const res = await axios.get(`${API_BASE}/purchases/`);
+// 구매 목록 조회 조건 (서버에서 필터링, 최신순)
+export interface PurchaseListParams {
+  limit?: number; // 페이지 크기 (최대 200)
+  cursor?: string | null; // 이전 응답의 next_cursor
+  status?: Purchase["status"];
+  version?: string;
+  customer_email?: string;
+  created_from?: string; // ISO 날짜/시각 (포함)
+  created_to?: string; // ISO 날짜/시각 (미포함)
+}
+
+// 구매 목록 응답 (키셋 커서 페이지네이션)
+export interface PaginatedPurchases {
+  items: Purchase[];
+  total: number; // total_exact가 false면 이 이상
+  total_exact: boolean;
+  size: number;
+  next_cursor: string | null; // 마지막 페이지면 null
+}
+
+// 구매 목록 조회 (다음 페이지는 next_cursor를 cursor로 전달)
+export async function getPurchases(
+  params: PurchaseListParams = {}
+): Promise<PaginatedPurchases> {
+  const query = Object.fromEntries(
+    Object.entries(params).filter(
+      ([, value]) => value !== undefined && value !== null && value !== ""
+    )
+  );
+  const res = await client.get<PaginatedPurchases>("/purchases/", {
+    params: query,
+  });
   return res.data;
 }
 
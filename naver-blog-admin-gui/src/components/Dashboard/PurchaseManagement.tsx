@@ -21,7 +21,6 @@ import {
   Grid,
   IconButton,
   Tooltip,
-  Pagination,
   Stack,
   FormControl,
   InputLabel,
@@ -33,7 +32,7 @@ import RefreshIcon from "@mui/icons-material/Refresh";
 import VisibilityIcon from "@mui/icons-material/Visibility";
 import SearchIcon from "@mui/icons-material/Search";
 import StatusBadge from "../common/StatusBadge";
-import { client } from "../../api/client";
+import { getPurchases, type PurchaseListParams } from "../../api/purchase";
 
 const StyledCard = styled(Card)(({ theme }) => ({
   background: "rgba(255, 255, 255, 0.05)",
@@ -72,48 +71,37 @@ const PurchaseManagement: React.FC = () => {
   );
   const [detailOpen, setDetailOpen] = useState(false);
 
-  // 페이징 상태
-  const [currentPage, setCurrentPage] = useState(1);
+  // 페이징 상태 (서버 키셋 커서: cursors[i]는 i+1번째 페이지를 요청할 때 쓰는 커서)
+  const [cursors, setCursors] = useState<(string | null)[]>([null]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [total, setTotal] = useState(0);
+  const [totalExact, setTotalExact] = useState(true);
   const [itemsPerPage, setItemsPerPage] = useState(10);
-  const [searchTerm, setSearchTerm] = useState("");
+  const [emailFilter, setEmailFilter] = useState("");
   const [statusFilter, setStatusFilter] = useState("all");
 
-  // 필터링된 데이터 계산
-  const filteredPurchases = purchases.filter((purchase) => {
-    const matchesSearch =
-      purchase.customer_name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      purchase.order_id.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      purchase.customer_email.toLowerCase().includes(searchTerm.toLowerCase());
-    const matchesStatus =
-      statusFilter === "all" || purchase.status === statusFilter;
-    return matchesSearch && matchesStatus;
-  });
-
-  // 페이징된 데이터 계산
-  const totalPages = Math.ceil(filteredPurchases.length / itemsPerPage);
+  const currentPage = cursors.length;
   const startIndex = (currentPage - 1) * itemsPerPage;
-  const paginatedPurchases = filteredPurchases.slice(
-    startIndex,
-    startIndex + itemsPerPage
-  );
+  // 건수가 많으면 서버가 상한까지만 세므로 "+" 표시
+  const totalLabel = `${total.toLocaleString()}${totalExact ? "" : "+"}`;
 
-  // 페이지 변경 시 첫 페이지로 리셋
-  useEffect(() => {
-    setCurrentPage(1);
-  }, [searchTerm, statusFilter, itemsPerPage]);
-
-  const fetchPurchases = async () => {
+  const fetchPurchases = async (pageCursors: (string | null)[] = cursors) => {
     try {
       setLoading(true);
-      console.log("🔍 디버깅 - API 호출 시작");
-
-      const response = await client.get("/purchases/");
-
-      console.log("🔍 디버깅 - 응답 상태:", response.status);
-      console.log("🔍 디버깅 - 받은 데이터:", response.data);
-      console.log("🔍 디버깅 - 데이터 개수:", response.data.length);
-
-      setPurchases(response.data);
+      const page = await getPurchases({
+        limit: itemsPerPage,
+        cursor: pageCursors[pageCursors.length - 1],
+        status:
+          statusFilter === "all"
+            ? undefined
+            : (statusFilter as PurchaseListParams["status"]),
+        customer_email: emailFilter.trim() || undefined,
+      });
+      setPurchases(page.items);
+      setNextCursor(page.next_cursor);
+      setTotal(page.total);
+      setTotalExact(page.total_exact);
+      setCursors(pageCursors);
     } catch (error: any) {
       console.error("구매 목록 조회 중 오류:", error);
       console.error("오류 상세:", error.response?.data || error.message);
@@ -122,9 +110,19 @@ const PurchaseManagement: React.FC = () => {
     }
   };
 
+  // 필터/페이지 크기가 바뀌면 첫 페이지부터 다시 조회 (이메일은 입력을 멈춘 뒤)
   useEffect(() => {
-    fetchPurchases();
-  }, []);
+    const timer = setTimeout(() => fetchPurchases([null]), 300);
+    return () => clearTimeout(timer);
+  }, [emailFilter, statusFilter, itemsPerPage]);
+
+  const goToNextPage = () => {
+    if (nextCursor) fetchPurchases([...cursors, nextCursor]);
+  };
+
+  const goToPreviousPage = () => {
+    if (cursors.length > 1) fetchPurchases(cursors.slice(0, -1));
+  };
 
   const getStatusColor = (status: string) => {
     switch (status) {
@@ -220,7 +218,7 @@ const PurchaseManagement: React.FC = () => {
             </Typography>
             <Tooltip title="새로고침">
               <IconButton
-                onClick={fetchPurchases}
+                onClick={() => fetchPurchases()}
                 disabled={loading}
                 sx={{ color: "rgba(255, 255, 255, 0.8)" }}
               >
@@ -241,13 +239,11 @@ const PurchaseManagement: React.FC = () => {
             }}
           >
             <Typography variant="h6" sx={{ color: "blue", fontWeight: "bold" }}>
-              🔍 디버깅: purchases 배열 길이 = {purchases.length}, loading ={" "}
+              🔍 디버깅: 현재 페이지 {currentPage}, loading ={" "}
               {loading.toString()}
             </Typography>
             <Typography variant="body2" sx={{ color: "blue", mt: 1 }}>
-              데이터가 {purchases.length}개 로드되었습니다. 필터링 후{" "}
-              {filteredPurchases.length}개, 현재 페이지{" "}
-              {paginatedPurchases.length}개 표시
+              필터 결과 {totalLabel}개 중 현재 페이지 {purchases.length}개 표시
             </Typography>
           </Box>
 
@@ -264,9 +260,9 @@ const PurchaseManagement: React.FC = () => {
               <Grid item xs={12} md={4}>
                 <TextField
                   fullWidth
-                  placeholder="고객명, 주문번호, 이메일로 검색..."
-                  value={searchTerm}
-                  onChange={(e) => setSearchTerm(e.target.value)}
+                  placeholder="고객 이메일로 검색 (정확히 일치)"
+                  value={emailFilter}
+                  onChange={(e) => setEmailFilter(e.target.value)}
                   InputProps={{
                     startAdornment: (
                       <SearchIcon sx={{ color: "white", mr: 1 }} />
@@ -338,8 +334,7 @@ const PurchaseManagement: React.FC = () => {
               </Grid>
               <Grid item xs={12} md={3}>
                 <Typography variant="body2" sx={{ color: "white" }}>
-                  총 {filteredPurchases.length}개 주문 (전체 {purchases.length}
-                  개)
+                  총 {totalLabel}개 주문
                 </Typography>
               </Grid>
             </Grid>
@@ -450,28 +445,28 @@ const PurchaseManagement: React.FC = () => {
                   {/* 실제 데이터 렌더링 */}
                   {(() => {
                     console.log(
-                      "🔥 paginatedPurchases 전체 배열:",
-                      paginatedPurchases
+                      "🔥 purchases 전체 배열:",
+                      purchases
                     );
                     console.log(
-                      "🔥 paginatedPurchases.length:",
-                      paginatedPurchases.length
+                      "🔥 purchases.length:",
+                      purchases.length
                     );
                     console.log(
-                      "🔥 Array.isArray(paginatedPurchases):",
-                      Array.isArray(paginatedPurchases)
+                      "🔥 Array.isArray(purchases):",
+                      Array.isArray(purchases)
                     );
 
-                    if (paginatedPurchases.length > 0) {
-                      console.log("🔥 첫번째 purchase:", paginatedPurchases[0]);
+                    if (purchases.length > 0) {
+                      console.log("🔥 첫번째 purchase:", purchases[0]);
                       console.log(
                         "🔥 첫번째 purchase의 키들:",
-                        Object.keys(paginatedPurchases[0])
+                        Object.keys(purchases[0])
                       );
                     }
 
-                    return paginatedPurchases.length > 0 ? (
-                      paginatedPurchases.map((purchase, index) => {
+                    return purchases.length > 0 ? (
+                      purchases.map((purchase, index) => {
                         console.log(
                           `🔍 렌더링할 purchase[${index}]:`,
                           purchase
@@ -678,7 +673,7 @@ const PurchaseManagement: React.FC = () => {
                           }}
                         >
                           ❌ 현재 페이지에 표시할 데이터가 없습니다! (전체:{" "}
-                          {filteredPurchases.length}개)
+                          {totalLabel}개)
                         </TableCell>
                       </TableRow>
                     );
@@ -697,41 +692,35 @@ const PurchaseManagement: React.FC = () => {
               }}
             >
               <Stack direction="row" spacing={2} alignItems="center">
+                <Button
+                  variant="outlined"
+                  onClick={goToPreviousPage}
+                  disabled={loading || currentPage === 1}
+                  sx={{ color: "white", borderColor: "white" }}
+                >
+                  이전
+                </Button>
                 <Typography variant="body2" sx={{ color: "white" }}>
-                  {startIndex + 1}-
-                  {Math.min(
-                    startIndex + itemsPerPage,
-                    filteredPurchases.length
-                  )}{" "}
-                  / {filteredPurchases.length}개 표시
+                  {purchases.length > 0 ? startIndex + 1 : 0}-
+                  {startIndex + purchases.length} / {totalLabel}개 표시
                 </Typography>
-                <Pagination
-                  count={totalPages}
-                  page={currentPage}
-                  onChange={(_, page) => setCurrentPage(page)}
-                  color="primary"
-                  size="large"
-                  sx={{
-                    "& .MuiPaginationItem-root": {
-                      color: "white",
-                      borderColor: "white",
-                      "&:hover": { backgroundColor: "rgba(255,255,255,0.1)" },
-                      "&.Mui-selected": {
-                        backgroundColor: "rgba(59, 130, 246, 0.8)",
-                        color: "white",
-                      },
-                    },
-                  }}
-                />
+                <Button
+                  variant="outlined"
+                  onClick={goToNextPage}
+                  disabled={loading || !nextCursor}
+                  sx={{ color: "white", borderColor: "white" }}
+                >
+                  다음
+                </Button>
               </Stack>
             </Box>
 
-            {paginatedPurchases.length === 0 &&
+            {purchases.length === 0 &&
               !loading &&
-              filteredPurchases.length === 0 && (
+              currentPage === 1 && (
                 <Box textAlign="center" py={4}>
                   <Typography sx={{ color: "rgba(255, 255, 255, 0.6)" }}>
-                    {searchTerm || statusFilter !== "all"
+                    {emailFilter || statusFilter !== "all"
                       ? "검색 조건에 맞는 구매 내역이 없습니다."
                       : "구매 내역이 없습니다."}
                   </Typography>
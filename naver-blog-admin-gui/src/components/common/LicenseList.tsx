@@ -9,42 +9,49 @@ import {
   Paper,
   Button,
   Typography,
+  Stack,
 } from "@mui/material";
-import axios from "axios";
+import { License, getLicenses, updateLicense } from "../../api/license";
 
-interface License {
-  id: number;
-  user_id: number;
-  key: string;
-  plan: string;
-  status: string;
-  issued_at: string;
-  expire_at: string | null;
-}
+const PAGE_SIZE = 50;
 
 const LicenseList: React.FC = () => {
   const [licenses, setLicenses] = useState<License[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  // 서버 키셋 커서: cursors[i]는 i+1번째 페이지를 요청할 때 쓰는 커서
+  const [cursors, setCursors] = useState<(string | null)[]>([null]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [total, setTotal] = useState(0);
+  const [totalExact, setTotalExact] = useState(true);
 
-  const fetchLicenses = () => {
+  const fetchLicenses = (pageCursors: (string | null)[] = cursors) => {
     setLoading(true);
-    axios
-      .get("/licenses")
-      .then((res) => setLicenses(res.data))
+    getLicenses({
+      limit: PAGE_SIZE,
+      cursor: pageCursors[pageCursors.length - 1],
+    })
+      .then((page) => {
+        setLicenses(page.items);
+        setNextCursor(page.next_cursor);
+        setTotal(page.total);
+        setTotalExact(page.total_exact);
+        setCursors(pageCursors);
+        setError(null);
+      })
       .catch(() => setError("인증키 목록을 불러오지 못했습니다."))
       .finally(() => setLoading(false));
   };
 
   useEffect(() => {
-    fetchLicenses();
+    fetchLicenses([null]);
   }, []);
 
   const handleRevoke = async (id: number) => {
     if (!window.confirm("정말로 이 인증키를 회수(비활성화)하시겠습니까?"))
       return;
     try {
-      await axios.patch(`/licenses/${id}`, { status: "inactive" });
+      await updateLicense({ id, status: "inactive" });
       fetchLicenses();
     } catch {
       alert("회수에 실패했습니다.");
@@ -54,6 +61,8 @@ const LicenseList: React.FC = () => {
   if (loading) return <Typography>로딩 중...</Typography>;
   if (error) return <Typography color="error">{error}</Typography>;
 
+  const startIndex = (cursors.length - 1) * PAGE_SIZE;
+
   return (
     <TableContainer component={Paper}>
       <Table>
@@ -96,6 +105,27 @@ const LicenseList: React.FC = () => {
           ))}
         </TableBody>
       </Table>
+      <Stack direction="row" spacing={2} alignItems="center" sx={{ p: 2 }}>
+        <Button
+          variant="outlined"
+          onClick={() => fetchLicenses(cursors.slice(0, -1))}
+          disabled={cursors.length === 1}
+        >
+          이전
+        </Button>
+        <Typography variant="body2">
+          {licenses.length > 0 ? startIndex + 1 : 0}-
+          {startIndex + licenses.length} / {total.toLocaleString()}
+          {totalExact ? "" : "+"}개
+        </Typography>
+        <Button
+          variant="outlined"
+          onClick={() => nextCursor && fetchLicenses([...cursors, nextCursor])}
+          disabled={!nextCursor}
+        >
+          다음
+        </Button>
+      </Stack>
     </TableContainer>
   );
 };
@@ -166,6 +166,33 @@ export const useWebSocket = (options: UseWebSocketOptions) => {
             return;
           }
 
+          // 자동화 상태 스냅샷(연결 직후) / 주기별 변경분
+          if (message.type === "automation_status_snapshot") {
+            const users = ((message as any).users || []) as UserActivity[];
+            setUserActivities(
+              users
+                .map((entry) => ({ ...entry, type: "user_activity" as const }))
+                .slice(-50)
+            );
+          } else if (message.type === "automation_status_batch") {
+            const updates = ((message as any).updates || []) as UserActivity[];
+            const removed: string[] = (message as any).removed || [];
+            setUserActivities((prev) => {
+              const changed = new Set([
+                ...removed,
+                ...updates.map((entry) => entry.user_id),
+              ]);
+              const kept = prev.filter((a) => !changed.has(a.user_id));
+              return [
+                ...kept,
+                ...updates.map((entry) => ({
+                  ...entry,
+                  type: "user_activity" as const,
+                })),
+              ].slice(-50);
+            });
+          }
+
           // 사용자 활동 업데이트
           if (message.type === "user_activity") {
             const activity = message as UserActivity;
@@ -0,0 +1,41 @@
+"""Add activation_idempotency_keys table
+
+Revision ID: a9d4e7b2c6f1
+Revises: f5c2a8e9d3b7
+Create Date: 2026-10-18 14:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d4e7b2c6f1'
+down_revision: Union[str, None] = 'f5c2a8e9d3b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('activation_idempotency_keys',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('idempotency_key', sa.String(), nullable=False),
+    sa.Column('temporary_license', sa.String(), nullable=False),
+    sa.Column('hardware_id', sa.String(), nullable=False),
+    sa.Column('final_license', sa.String(), nullable=False),
+    sa.Column('expire_date', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_activation_idempotency_keys_id'), 'activation_idempotency_keys', ['id'], unique=False)
+    op.create_index(op.f('ix_activation_idempotency_keys_idempotency_key'), 'activation_idempotency_keys', ['idempotency_key'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_activation_idempotency_keys_idempotency_key'), table_name='activation_idempotency_keys')
+    op.drop_index(op.f('ix_activation_idempotency_keys_id'), table_name='activation_idempotency_keys')
+    op.drop_table('activation_idempotency_keys')
@@ -0,0 +1,51 @@
+"""Add download_events table
+
+Revision ID: b6e3d9f2a7c4
+Revises: a9d4e7b2c6f1
+Create Date: 2026-10-18 18:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e3d9f2a7c4'
+down_revision: Union[str, None] = 'a9d4e7b2c6f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('download_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('purchase_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('channel', sa.String(), nullable=True),
+    sa.Column('bytes_sent', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_download_events_id'), 'download_events', ['id'], unique=False)
+    op.create_index(op.f('ix_download_events_created_at'), 'download_events', ['created_at'], unique=False)
+    op.create_index('ix_download_events_purchase_id_id', 'download_events', ['purchase_id', 'id'], unique=False)
+    op.create_table('download_stats_checkpoints',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('last_event_id', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # 기존 download_count는 그대로 두고 이후 이벤트부터 더함
+    op.execute("INSERT INTO download_stats_checkpoints (id, last_event_id) VALUES (1, 0)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('download_stats_checkpoints')
+    op.drop_index('ix_download_events_purchase_id_id', table_name='download_events')
+    op.drop_index(op.f('ix_download_events_created_at'), table_name='download_events')
+    op.drop_index(op.f('ix_download_events_id'), table_name='download_events')
+    op.drop_table('download_events')
@@ -0,0 +1,34 @@
+"""Add purchase keyset pagination indexes
+
+Revision ID: c8f4a1e6b3d5
+Revises: b6e3d9f2a7c4
+Create Date: 2026-10-18 19:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f4a1e6b3d5'
+down_revision: Union[str, None] = 'b6e3d9f2a7c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_purchases_created_at_id', 'purchases', ['created_at', 'id'], unique=False)
+    op.create_index('ix_purchases_status_created_at_id', 'purchases', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_purchases_version_created_at_id', 'purchases', ['version', 'created_at', 'id'], unique=False)
+    op.create_index('ix_purchases_customer_email_created_at_id', 'purchases', ['customer_email', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_purchases_customer_email_created_at_id', table_name='purchases')
+    op.drop_index('ix_purchases_version_created_at_id', table_name='purchases')
+    op.drop_index('ix_purchases_status_created_at_id', table_name='purchases')
+    op.drop_index('ix_purchases_created_at_id', table_name='purchases')
@@ -0,0 +1,44 @@
+"""Add keyset pagination indexes for users, licenses, payments and usages
+
+Revision ID: d2a7e5c9f8b1
+Revises: c8f4a1e6b3d5
+Create Date: 2026-10-18 20:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7e5c9f8b1'
+down_revision: Union[str, None] = 'c8f4a1e6b3d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_users_plan_id', 'users', ['plan', 'id']),
+    ('ix_users_is_admin_id', 'users', ['is_admin', 'id']),
+    ('ix_users_is_active_id', 'users', ['is_active', 'id']),
+    ('ix_licenses_user_id_id', 'licenses', ['user_id', 'id']),
+    ('ix_licenses_status_id', 'licenses', ['status', 'id']),
+    ('ix_licenses_plan_id', 'licenses', ['plan', 'id']),
+    ('ix_payments_user_id_id', 'payments', ['user_id', 'id']),
+    ('ix_payments_status_id', 'payments', ['status', 'id']),
+    ('ix_payments_method_id', 'payments', ['method', 'id']),
+    ('ix_usages_date_id', 'usages', ['date', 'id']),
+    ('ix_usages_user_id_date_id', 'usages', ['user_id', 'date', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,60 @@
+"""Add mail campaign tables for bulk mail
+
+Revision ID: d7a3c9e1f4b2
+Revises: c4e1f0a7b2d9
+Create Date: 2026-10-18 11:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3c9e1f4b2'
+down_revision: Union[str, None] = 'c4e1f0a7b2d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('mail_campaigns',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('subject', sa.String(), nullable=False),
+    sa.Column('html_body', sa.Text(), nullable=False),
+    sa.Column('version', sa.String(), nullable=True),
+    sa.Column('purchase_status', sa.String(), nullable=True),
+    sa.Column('expire_before', sa.DateTime(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('last_purchase_id', sa.Integer(), nullable=True),
+    sa.Column('sent_count', sa.Integer(), nullable=True),
+    sa.Column('failed_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_mail_campaigns_id'), 'mail_campaigns', ['id'], unique=False)
+    op.create_table('mail_campaign_deliveries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('campaign_id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('purchase_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['campaign_id'], ['mail_campaigns.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('campaign_id', 'email', name='uq_mail_campaign_deliveries_campaign_email')
+    )
+    op.create_index(op.f('ix_mail_campaign_deliveries_id'), 'mail_campaign_deliveries', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_mail_campaign_deliveries_id'), table_name='mail_campaign_deliveries')
+    op.drop_table('mail_campaign_deliveries')
+    op.drop_index(op.f('ix_mail_campaigns_id'), table_name='mail_campaigns')
+    op.drop_table('mail_campaigns')
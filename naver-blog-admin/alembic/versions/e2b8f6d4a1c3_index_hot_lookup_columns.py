@@ -0,0 +1,37 @@
+"""Index hot lookup columns and add refresh_token to user
+
+Revision ID: e2b8f6d4a1c3
+Revises: d7a3c9e1f4b2
+Create Date: 2026-10-18 11:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8f6d4a1c3'
+down_revision: Union[str, None] = 'd7a3c9e1f4b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # a9cc13238fdf는 빈 마이그레이션이라 컬럼이 실제로 생성되지 않았음
+    op.add_column('users', sa.Column('refresh_token', sa.String(), nullable=True))
+    op.add_column('users', sa.Column('refresh_token_expire', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_users_refresh_token'), 'users', ['refresh_token'], unique=True)
+    op.create_index(op.f('ix_purchases_temporary_license'), 'purchases', ['temporary_license'], unique=True)
+    op.create_index(op.f('ix_purchases_hardware_id'), 'purchases', ['hardware_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_purchases_hardware_id'), table_name='purchases')
+    op.drop_index(op.f('ix_purchases_temporary_license'), table_name='purchases')
+    op.drop_index(op.f('ix_users_refresh_token'), table_name='users')
+    op.drop_column('users', 'refresh_token_expire')
+    op.drop_column('users', 'refresh_token')
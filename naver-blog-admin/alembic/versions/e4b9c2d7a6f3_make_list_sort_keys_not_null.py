@@ -0,0 +1,39 @@
+"""Make keyset sort keys purchases.created_at and usages.date NOT NULL
+
+Revision ID: e4b9c2d7a6f3
+Revises: d2a7e5c9f8b1
+Create Date: 2026-10-18 22:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9c2d7a6f3'
+down_revision: Union[str, None] = 'd2a7e5c9f8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 키셋 페이지네이션 정렬 키 (NULL이면 커서 비교에서 빠지므로 채운 뒤 NOT NULL로 변경)
+COLUMNS = [
+    ('purchases', 'created_at'),
+    ('usages', 'date'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in COLUMNS:
+        op.execute(f"UPDATE {table} SET {column} = CURRENT_TIMESTAMP WHERE {column} IS NULL")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in reversed(COLUMNS):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.DateTime(), nullable=True)
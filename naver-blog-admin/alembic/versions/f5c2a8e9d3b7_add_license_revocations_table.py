@@ -0,0 +1,41 @@
+"""Add license_revocations table
+
+Revision ID: f5c2a8e9d3b7
+Revises: e2b8f6d4a1c3
+Create Date: 2026-10-18 13:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c2a8e9d3b7'
+down_revision: Union[str, None] = 'e2b8f6d4a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('license_revocations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('order_id', sa.String(), nullable=True),
+    sa.Column('license_digest', sa.String(), nullable=True),
+    sa.Column('reason', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_license_revocations_id'), 'license_revocations', ['id'], unique=False)
+    op.create_index(op.f('ix_license_revocations_order_id'), 'license_revocations', ['order_id'], unique=False)
+    op.create_index(op.f('ix_license_revocations_license_digest'), 'license_revocations', ['license_digest'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_license_revocations_license_digest'), table_name='license_revocations')
+    op.drop_index(op.f('ix_license_revocations_order_id'), table_name='license_revocations')
+    op.drop_index(op.f('ix_license_revocations_id'), table_name='license_revocations')
+    op.drop_table('license_revocations')
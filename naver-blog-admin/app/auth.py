@@ -1,19 +1,32 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.requests import HTTPConnection
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from . import models, schemas
+from .config import get_settings
 from .database import get_db
+from .identity_cache import UserSnapshot, get_user_snapshot
 
-# 보안 설정
-SECRET_KEY = "your-secret-key-here"  # 실제 운영 시에는 환경 변수로 관리
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# 보안 설정 (발급과 검증이 같은 키를 쓰도록 Settings에서 읽음)
+settings = get_settings()
+SECRET_KEY = settings.SECRET_KEY
+ALGORITHM = settings.ALGORITHM
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+
+# 최근 검증한 토큰 LRU (토큰 digest -> (claims, exp)), exp가 지나면 무효
+TOKEN_CACHE_SIZE = 1024
+_verified_tokens: "OrderedDict[bytes, tuple[dict, float]]" = OrderedDict()
+_verified_tokens_lock = threading.Lock()
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -47,30 +60,107 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
+def decode_access_token(token: str) -> dict:
+    """
+    액세스 토큰 검증 후 claims 반환 (실패 시 JWTError)
+    같은 토큰으로 반복 호출하는 클라이언트는 exp까지 HMAC 검증을 생략
+    반환된 claims는 캐시와 공유되므로 수정하지 말 것
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    with _verified_tokens_lock:
+        cached = _verified_tokens.get(digest)
+        if cached is not None:
+            claims, exp = cached
+            if exp > time.time():
+                _verified_tokens.move_to_end(digest)
+                return claims
+            del _verified_tokens[digest]
+
+    claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    exp = claims.get("exp")
+    if exp is not None:
+        with _verified_tokens_lock:
+            _verified_tokens[digest] = (claims, float(exp))
+            if len(_verified_tokens) > TOKEN_CACHE_SIZE:
+                _verified_tokens.popitem(last=False)
+    return claims
+
+
+def resolve_request_auth(request: Request) -> Optional[dict]:
+    """
+    요청의 Bearer 토큰을 한 번만 검증하여 request.state에 저장
+    (로깅 미들웨어와 인증 의존성이 같은 결과를 공유)
+    """
+    token, claims = None, None
+    auth_header = request.headers.get("authorization")
+    if auth_header and auth_header.lower().startswith("bearer "):
+        token = auth_header[7:].strip()
+        try:
+            claims = decode_access_token(token)
+        except JWTError:
+            claims = None
+    request.state.auth_token = token
+    request.state.auth_claims = claims
+    return claims
+
+
+def get_token_claims(request: Request, token: str) -> Optional[dict]:
+    """request.state에 검증 결과가 있으면 재사용, 없으면 검증 (실패 시 None)"""
+    if getattr(request.state, "auth_token", None) == token:
+        return request.state.auth_claims
+    try:
+        return decode_access_token(token)
+    except JWTError:
+        return None
+
+
+def get_websocket_user(websocket: HTTPConnection, db: Session) -> Optional[UserSnapshot]:
+    """
+    WebSocket 핸드셰이크의 토큰을 get_current_user와 같은 방식으로 검증해 사용자 반환
+    (브라우저는 헤더를 붙일 수 없으므로 ?token= 쿼리도 허용, 실패/비활성 사용자는 None)
+    """
+    token = websocket.query_params.get("token")
+    auth_header = websocket.headers.get("authorization")
+    if not token and auth_header and auth_header.lower().startswith("bearer "):
+        token = auth_header[7:].strip()
+    if not token:
+        return None
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        return None
+    email = payload.get("sub")
+    if email is None:
+        return None
+    user = get_user_snapshot(db, email)
+    if user is None or not user.is_active:
+        return None
+    return user
+
+
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    request: Request, token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
+    payload = get_token_claims(request, token)
+    if payload is None:
+        raise credentials_exception
+    email: str = payload.get("sub")
+    if email is None:
         raise credentials_exception
 
-    user = db.query(models.User).filter(models.User.email == email).first()
+    user = get_user_snapshot(db, email)
     if user is None:
         raise credentials_exception
     return user
 
 
 async def get_current_active_user(
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
 ):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
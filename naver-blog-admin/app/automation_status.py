@@ -0,0 +1,124 @@
+"""
+자동화 상태 집계 (/ws/user/{user_id}의 automation_status -> 관리자)
+
+- 사용자별 최신 상태 한 건만 보관하고 바뀐 사용자만 표시해 둠 (update/remove는 O(1))
+- AUTOMATION_STATUS_TICK_SECONDS 주기로 바뀐 항목만 묶어 관리자에게 한 번에 전송
+  (사용자가 초당 여러 번 보내도 관리자에게는 주기당 사용자별 최신 값 하나만 전달)
+- 새로 연결한 관리자에게는 현재 전체 상태를 스냅샷으로 전송
+
+메시지 형식
+- {"type": "automation_status_batch", "updates": [항목...], "removed": [user_id...], "timestamp": ...}
+- {"type": "automation_status_snapshot", "users": [항목...], "timestamp": ...}
+- 항목: {"user_id", "status", "progress", "message", "timestamp"} (기존 user_activity와 같은 필드)
+
+여러 워커 실행 시 배치는 broadcast_to_admins로 다른 워커의 관리자에게도 중계되지만,
+스냅샷은 관리자가 연결된 워커에 접속한 사용자 상태만 포함함
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from .config import get_settings
+from .logger import logger
+from .websocket_manager import manager
+
+
+class AutomationStatusAggregator:
+    def __init__(self, manager, tick_seconds: Optional[float] = None):
+        self.manager = manager
+        self.tick_seconds = tick_seconds or get_settings().AUTOMATION_STATUS_TICK_SECONDS
+        # user_id -> 최신 상태 항목
+        self._latest: dict[str, dict] = {}
+        # 마지막 전송 이후 바뀐/제거된 user_id
+        self._dirty: set[str] = set()
+        self._removed: set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.received = 0
+        self.batches = 0
+
+    def update(self, user_id: str, status: Optional[str], progress=0, message: str = ""):
+        """사용자 상태 갱신 (값이 그대로면 다음 배치에 넣지 않음)"""
+        self.received += 1
+        entry = self._latest.get(user_id)
+        if entry is not None and (entry["status"], entry["progress"], entry["message"]) == (status, progress, message):
+            return
+        self._latest[user_id] = {
+            "user_id": user_id,
+            "status": status,
+            "progress": progress,
+            "message": message,
+            "timestamp": datetime.now().isoformat(),
+        }
+        self._dirty.add(user_id)
+        self._removed.discard(user_id)
+        self._ensure_ticking()
+
+    def remove(self, user_id: str):
+        """사용자 연결 해제 시 상태 제거 (다음 배치의 removed에 포함)"""
+        if self._latest.pop(user_id, None) is None:
+            return
+        self._dirty.discard(user_id)
+        self._removed.add(user_id)
+        self._ensure_ticking()
+
+    def snapshot(self) -> dict:
+        """현재 전체 상태 (관리자 연결 직후 또는 재동기화 요청 시 전송)"""
+        return {
+            "type": "automation_status_snapshot",
+            "users": list(self._latest.values()),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    def _ensure_ticking(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._tick())
+
+    async def _tick(self):
+        """바뀐 항목이 있는 동안 주기마다 배치 전송 (보낼 것이 없으면 종료)"""
+        while self._dirty or self._removed:
+            await asyncio.sleep(self.tick_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"자동화 상태 배치 전송 실패: {e}")
+
+    async def flush(self) -> int:
+        """바뀐 항목을 묶어 관리자에게 전송하고 받은 관리자 수 반환"""
+        if not self._dirty and not self._removed:
+            return 0
+        updates = [self._latest[user_id] for user_id in self._dirty]
+        removed = list(self._removed)
+        self._dirty.clear()
+        self._removed.clear()
+        # 관리자가 하나도 없으면 보내지 않음 (새 관리자는 스냅샷으로 받음)
+        if self.manager.total_counts()[0] == 0:
+            return 0
+        self.batches += 1
+        return await self.manager.broadcast_to_admins({
+            "type": "automation_status_batch",
+            "updates": updates,
+            "removed": removed,
+            "timestamp": datetime.now().isoformat(),
+        })
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "tracked_users": len(self._latest),
+            "pending": len(self._dirty) + len(self._removed),
+            "received": self.received,
+            "batches": self.batches,
+            "tick_seconds": self.tick_seconds,
+        }
+
+
+automation_status = AutomationStatusAggregator(manager)
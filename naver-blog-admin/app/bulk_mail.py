@@ -0,0 +1,267 @@
+"""
+구매자 대상 일괄 메일 발송 (만료 안내, 신규 버전 안내 등)
+
+- purchases 테이블을 id 순서로 청크 단위 조회하여 전체를 메모리에 올리지 않음
+- 로그인된 SMTP 세션 하나로 여러 메시지를 보내고, 설정한 초당 발송 수로 속도 제한
+- 메시지마다 발송 기록과 체크포인트(last_purchase_id)를 함께 커밋하여
+  중단된 캠페인을 다시 실행하면 이미 보낸 수신자는 건너뛰고 실패한 수신자만 다시 발송
+
+실행: python -m app.bulk_mail <campaign_id> (naver-blog-admin 폴더에서)
+"""
+
+import argparse
+import time
+from datetime import datetime
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import get_settings
+from .database import SessionLocal
+from .email_templates import CompiledTemplate, escape_field
+from .logger import logger
+from .mail_queue import SMTPConnection
+
+settings = get_settings()
+
+# 캠페인 제목/본문에서 사용할 수 있는 구매 정보 필드
+RECIPIENT_COLUMNS = (
+    models.Purchase.id,
+    models.Purchase.customer_email,
+    models.Purchase.customer_name,
+    models.Purchase.order_id,
+    models.Purchase.version,
+    models.Purchase.account_count,
+    models.Purchase.post_count,
+    models.Purchase.months,
+    models.Purchase.expire_date,
+    models.Purchase.temporary_license,
+)
+TEMPLATE_FIELDS = frozenset(
+    [column.key for column in RECIPIENT_COLUMNS if column.key != "id"] + ["download_url"]
+)
+
+
+def create_campaign(
+    db: Session,
+    name: str,
+    subject: str,
+    html_body: str,
+    version: Optional[str] = None,
+    purchase_status: Optional[str] = None,
+    expire_before: Optional[datetime] = None,
+) -> models.MailCampaign:
+    # 템플릿 필드 오류는 발송 전에 확인
+    for template in (subject, html_body):
+        unknown = CompiledTemplate(template).fields - TEMPLATE_FIELDS
+        if unknown:
+            raise ValueError(f"알 수 없는 템플릿 필드: {', '.join(sorted(unknown))}")
+    campaign = models.MailCampaign(
+        name=name,
+        subject=subject,
+        html_body=html_body,
+        version=version,
+        purchase_status=purchase_status,
+        expire_before=expire_before,
+    )
+    db.add(campaign)
+    db.commit()
+    db.refresh(campaign)
+    return campaign
+
+
+def _template_values(row) -> dict:
+    return {
+        "customer_email": row.customer_email,
+        "customer_name": row.customer_name or "",
+        "order_id": row.order_id,
+        "version": row.version,
+        "account_count": row.account_count,
+        "post_count": row.post_count,
+        "months": row.months,
+        "expire_date": row.expire_date.strftime("%Y-%m-%d") if row.expire_date else "",
+        "temporary_license": row.temporary_license or "",
+        "download_url": f"{settings.BASE_URL}/purchases/download/{row.temporary_license}",
+    }
+
+
+class BulkMailer:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        connection_factory: Callable[[], SMTPConnection],
+        rate_per_second: float = 5,
+        chunk_size: int = 500,
+        messages_per_session: int = 100,
+        max_consecutive_failures: int = 10,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.session_factory = session_factory
+        self.connection_factory = connection_factory
+        self.interval = 1 / rate_per_second if rate_per_second > 0 else 0
+        self.chunk_size = chunk_size
+        self.messages_per_session = messages_per_session
+        self.max_consecutive_failures = max_consecutive_failures
+        self.sleep = sleep
+
+    def run(self, campaign_id: int) -> models.MailCampaign:
+        """캠페인 발송 (중단된 캠페인은 체크포인트 이후부터 이어서 발송)"""
+        db = self.session_factory()
+        connection = self.connection_factory()
+        try:
+            campaign = self._send(db, connection, campaign_id)
+            db.refresh(campaign)
+            db.expunge(campaign)
+            return campaign
+        finally:
+            connection.close()
+            db.close()
+
+    def _send(self, db: Session, connection: SMTPConnection, campaign_id: int) -> models.MailCampaign:
+        campaign = db.get(models.MailCampaign, campaign_id)
+        if campaign is None:
+            raise ValueError(f"캠페인을 찾을 수 없습니다: {campaign_id}")
+        if campaign.status == "completed":
+            return campaign
+        # 실패한 수신자가 있으면 그 위치부터 다시 훑음 (이미 보낸 수신자는 건너뜀)
+        first_failed = (
+            db.query(func.min(models.MailCampaignDelivery.purchase_id))
+            .filter(
+                models.MailCampaignDelivery.campaign_id == campaign.id,
+                models.MailCampaignDelivery.status == "failed",
+            )
+            .scalar()
+        )
+        if first_failed is not None and first_failed <= (campaign.last_purchase_id or 0):
+            campaign.last_purchase_id = first_failed - 1
+        campaign.status = "running"
+        db.commit()
+
+        subject = CompiledTemplate(campaign.subject)
+        body = CompiledTemplate(campaign.html_body)
+        session_messages = 0
+        consecutive_failures = 0
+        next_send_at = time.monotonic()
+
+        for row, previous in self._iter_recipients(db, campaign):
+            if previous == "sent":
+                campaign.last_purchase_id = row.id
+                continue
+
+            # 초당 발송 수 제한
+            delay = next_send_at - time.monotonic()
+            if delay > 0:
+                self.sleep(delay)
+            next_send_at = max(next_send_at, time.monotonic()) + self.interval
+
+            if session_messages >= self.messages_per_session:
+                # 서버의 세션당 메시지 수 제한에 걸리지 않도록 주기적으로 재연결
+                connection.close()
+                session_messages = 0
+
+            values = _template_values(row)
+            if previous == "failed":
+                # 이전 실행에서 실패한 수신자는 기록을 재사용하여 다시 발송
+                delivery = (
+                    db.query(models.MailCampaignDelivery)
+                    .filter(
+                        models.MailCampaignDelivery.campaign_id == campaign.id,
+                        models.MailCampaignDelivery.email == row.customer_email,
+                    )
+                    .one()
+                )
+                delivery.purchase_id = row.id
+                campaign.failed_count = max(0, (campaign.failed_count or 0) - 1)
+            else:
+                delivery = models.MailCampaignDelivery(
+                    campaign_id=campaign.id, email=row.customer_email, purchase_id=row.id
+                )
+            delivery.sent_at = datetime.utcnow()
+            try:
+                connection.send(
+                    row.customer_email,
+                    subject.render({k: str(v) for k, v in values.items()}),
+                    body.render(values, escape=escape_field),
+                )
+                session_messages += 1
+                consecutive_failures = 0
+                delivery.status = "sent"
+                delivery.error = None
+                campaign.sent_count = (campaign.sent_count or 0) + 1
+            except Exception as e:
+                connection.close()
+                session_messages = 0
+                consecutive_failures += 1
+                delivery.status = "failed"
+                delivery.error = str(e)
+                campaign.failed_count = (campaign.failed_count or 0) + 1
+                logger.warning(f"캠페인 {campaign.id} 발송 실패 ({row.customer_email}): {e}")
+
+            # 발송 기록과 체크포인트를 한 트랜잭션으로 커밋
+            db.add(delivery)
+            campaign.last_purchase_id = row.id
+            db.commit()
+
+            if consecutive_failures >= self.max_consecutive_failures:
+                campaign.status = "paused"
+                db.commit()
+                logger.error(f"캠페인 {campaign.id} 연속 실패로 일시 중지")
+                return campaign
+
+        campaign.status = "completed"
+        campaign.finished_at = datetime.utcnow()
+        db.commit()
+        logger.info(
+            f"캠페인 {campaign.id} 완료: 발송 {campaign.sent_count}건, 실패 {campaign.failed_count}건"
+        )
+        return campaign
+
+    def _iter_recipients(self, db: Session, campaign: models.MailCampaign) -> Iterator[tuple]:
+        """체크포인트 이후 구매자를 id 순서로 청크 조회 (이메일별 이전 발송 상태 포함)"""
+        last_id = campaign.last_purchase_id or 0
+        while True:
+            query = db.query(*RECIPIENT_COLUMNS).filter(models.Purchase.id > last_id)
+            if campaign.version:
+                query = query.filter(models.Purchase.version == campaign.version)
+            if campaign.purchase_status:
+                query = query.filter(models.Purchase.status == campaign.purchase_status)
+            if campaign.expire_before:
+                query = query.filter(models.Purchase.expire_date < campaign.expire_before)
+            rows = query.order_by(models.Purchase.id).limit(self.chunk_size).all()
+            if not rows:
+                return
+
+            emails = {row.customer_email for row in rows}
+            previous = dict(
+                db.query(models.MailCampaignDelivery.email, models.MailCampaignDelivery.status)
+                .filter(
+                    models.MailCampaignDelivery.campaign_id == campaign.id,
+                    models.MailCampaignDelivery.email.in_(emails),
+                )
+                .all()
+            )
+            for row in rows:
+                yield row, previous.get(row.customer_email)
+                # 같은 이메일로 여러 번 구매한 경우 한 번만 발송
+                previous[row.customer_email] = "sent"
+            last_id = rows[-1].id
+
+
+def _create_bulk_mailer() -> BulkMailer:
+    return BulkMailer(
+        SessionLocal,
+        lambda: SMTPConnection.from_settings(settings),
+        rate_per_second=settings.BULK_MAIL_RATE_PER_SECOND,
+        chunk_size=settings.BULK_MAIL_CHUNK_SIZE,
+        messages_per_session=settings.BULK_MAIL_MESSAGES_PER_SESSION,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="구매자 대상 일괄 메일 발송")
+    parser.add_argument("campaign_id", type=int, help="발송(또는 이어서 발송)할 캠페인 ID")
+    args = parser.parse_args()
+    result = _create_bulk_mailer().run(args.campaign_id)
+    print(f"[BULK MAIL] {result.status}: 발송 {result.sent_count}건, 실패 {result.failed_count}건")
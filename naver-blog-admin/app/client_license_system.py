@@ -3,20 +3,35 @@
 이 코드는 실제 소비자 프로그램(naver_blog_hybrid)에 통합될 예정
 """
 
+import asyncio
 import jwt
 import requests
+import base64
 import hashlib
+import json
+import os
 import platform
+import time
 import uuid
 from datetime import datetime
 from typing import Dict, Optional, List
 
 class LicenseManager:
-    def __init__(self, server_url: str = "http://localhost:8000"):
+    BATCH_VALIDATE_MAX_ITEMS = 1000  # 서버 /purchases/validate/batch 요청당 최대 항목 수
+    REVOCATION_CACHE_FILE = "~/.naver_blog_auto/revocations.json"
+    REVOCATION_REFRESH_SECONDS = 3600  # 취소 목록 갱신 주기 (ETag 조건부 요청이라 변경 없으면 304)
+    PUBLIC_KEY_ALGORITHMS = ("EdDSA", "ES256")  # 서버 공개키로 로컬 서명 검증이 가능한 방식
+    ACTIVATION_RETRIES = 3  # 네트워크 오류/서버 오류 시 활성화 요청 시도 횟수
+
+    def __init__(self, server_url: str = "http://localhost:8000", public_key_info: Optional[Dict] = None):
         self.server_url = server_url
         self.hardware_id = self._generate_hardware_id()
         self.stored_license = None
         self.allowed_features = []
+        # {"algorithm", "kid", "public_key"} - 프로그램에 포함해 배포 (네트워크로 받은 키로 바꾸지 않음)
+        self.public_key_info = public_key_info
+        self.revocations = None  # {"version", "etag", "bits", "hashes", "filter"}
+        self._revocations_checked_at = 0.0
         
     def _generate_hardware_id(self) -> str:
         """하드웨어 고유 ID 생성"""
@@ -34,22 +49,35 @@ class LicenseManager:
             return str(uuid.uuid4()).replace("-", "")[:32]
 
     async def activate_license(self, temporary_license: str) -> Dict:
-        """임시 라이선스를 최종 인증키로 활성화"""
+        """임시 라이선스를 최종 인증키로 활성화 (응답을 못 받으면 같은 Idempotency-Key로 재시도)"""
+        # 재시도해도 서버는 처음 발급한 최종 인증키를 그대로 돌려줌
+        idempotency_key = uuid.uuid4().hex
         try:
-            response = requests.post(
-                f"{self.server_url}/purchases/activate",
-                json={
-                    "temporary_license": temporary_license,
-                    "hardware_id": self.hardware_id,
-                    "system_info": {
-                        "os": platform.system(),
-                        "os_version": platform.release(),
-                        "processor": platform.processor(),
-                        "machine": platform.machine()
-                    }
-                },
-                timeout=30
-            )
+            for attempt in range(self.ACTIVATION_RETRIES):
+                try:
+                    response = requests.post(
+                        f"{self.server_url}/purchases/activate",
+                        json={
+                            "temporary_license": temporary_license,
+                            "hardware_id": self.hardware_id,
+                            "system_info": {
+                                "os": platform.system(),
+                                "os_version": platform.release(),
+                                "processor": platform.processor(),
+                                "machine": platform.machine()
+                            }
+                        },
+                        headers={"Idempotency-Key": idempotency_key},
+                        timeout=30
+                    )
+                except requests.RequestException:
+                    if attempt == self.ACTIVATION_RETRIES - 1:
+                        raise
+                    await asyncio.sleep(2 ** attempt)
+                    continue
+                if response.status_code < 500 or attempt == self.ACTIVATION_RETRIES - 1:
+                    break
+                await asyncio.sleep(2 ** attempt)
             
             if response.status_code == 200:
                 result = response.json()
@@ -112,10 +140,216 @@ class LicenseManager:
             # 오프라인 모드로 전환
             return self._offline_validation()
 
+    async def validate_licenses_batch(self, licenses: List[Dict]) -> List[Dict]:
+        """여러 대의 라이선스를 요청 한 번으로 검증 (licenses: [{"license_key", "hardware_id"}, ...])"""
+        results: List[Dict] = []
+        try:
+            # 서버 일괄 검증 한도(1000개) 단위로 나눠 요청
+            for start in range(0, len(licenses), self.BATCH_VALIDATE_MAX_ITEMS):
+                chunk = licenses[start:start + self.BATCH_VALIDATE_MAX_ITEMS]
+                response = requests.post(
+                    f"{self.server_url}/purchases/validate/batch",
+                    json=[
+                        {"license_key": item["license_key"], "hardware_id": item["hardware_id"]}
+                        for item in chunk
+                    ],
+                    timeout=30
+                )
+                if response.status_code != 200:
+                    return results + [
+                        {"valid": False, "reason": "서버 연결 실패"}
+                        for _ in licenses[len(results):]
+                    ]
+                results.extend(response.json())
+            return results
+        except Exception as e:
+            return results + [
+                {"valid": False, "reason": f"네트워크 오류: {str(e)}"}
+                for _ in licenses[len(results):]
+            ]
+
+    def refresh_revocations(self) -> bool:
+        """서버 취소 목록(블룸 필터) 갱신 - 캐시된 버전 이후 추가분만 받음, 실패 시 캐시 유지"""
+        if self.revocations is None:
+            self.revocations = self._load_revocations_from_file()
+
+        headers = {}
+        params = {}
+        if self.revocations:
+            headers["If-None-Match"] = self.revocations["etag"]
+            params["since"] = self.revocations["version"]
+
+        try:
+            response = requests.get(
+                f"{self.server_url}/purchases/revocations",
+                headers=headers,
+                params=params,
+                timeout=10
+            )
+        except Exception:
+            return False
+
+        self._revocations_checked_at = time.time()
+        if response.status_code == 304:
+            return True
+        if response.status_code != 200:
+            return False
+
+        result = response.json()
+        if result["full"] or not self.revocations:
+            self.revocations = {
+                "bits": result["bits"],
+                "hashes": result["hashes"],
+                "filter": bytearray(base64.b64decode(result["filter"])),
+            }
+        else:
+            for token in result["added"]:
+                self._bloom_add(token)
+        self.revocations["version"] = result["version"]
+        self.revocations["etag"] = response.headers.get("ETag", f'"rev-{result["version"]}"')
+        self._save_revocations_to_file()
+        return True
+
+    def is_possibly_revoked(self, license_key: Optional[str] = None) -> bool:
+        """취소 목록에 있을 수 있는지 로컬 확인 (블룸 필터라 False면 확실히 취소되지 않음)"""
+        license_key = license_key or self.stored_license
+        if not license_key or not self.revocations:
+            return False
+
+        digest = hashlib.sha256(license_key.encode()).hexdigest()
+        if self._bloom_contains(f"digest:{digest}"):
+            return True
+        try:
+            order_id = jwt.decode(license_key, options={"verify_signature": False}).get("order_id")
+        except Exception:
+            return False
+        return bool(order_id) and self._bloom_contains(f"order:{order_id}")
+
+    async def validate_license_cached(self) -> Dict:
+        """취소 목록으로 로컬 검증 - 목록에 걸린 경우에만 서버 실시간 검증 (오탐 확인)"""
+        if not self.stored_license:
+            self.stored_license = self._load_license_from_file()
+
+        if not self.stored_license:
+            return {"valid": False, "reason": "라이선스가 없습니다"}
+
+        if time.time() - self._revocations_checked_at > self.REVOCATION_REFRESH_SECONDS:
+            self.refresh_revocations()
+
+        if self.is_possibly_revoked():
+            return await self.validate_license_realtime()
+
+        try:
+            algorithm = jwt.get_unverified_header(self.stored_license).get("alg")
+            if algorithm not in self.PUBLIC_KEY_ALGORITHMS:
+                if self.public_key_info:
+                    # 공개키가 있으면 더 약한 서명 방식을 주장하는 인증키는 거부 (서명 방식 다운그레이드 방지)
+                    return {"valid": False, "reason": "허용되지 않는 서명 방식입니다"}
+                # HS256 인증키는 서버 비밀키가 있어야 서명을 확인할 수 있으므로 서버 검증 (오프라인이면 제한 모드)
+                return await self.validate_license_realtime()
+            license_data = self._verify_signature(algorithm)
+            if license_data is None:
+                # 공개키가 없거나 다른 키로 서명된 경우 서버 검증
+                return await self.validate_license_realtime()
+        except jwt.InvalidTokenError:
+            return {"valid": False, "reason": "유효하지 않은 라이선스입니다"}
+
+        result = self._check_license_data(license_data)
+        if result["valid"]:
+            self._update_allowed_features(license_data)
+        return result
+
+    def _verify_signature(self, algorithm: str) -> Optional[Dict]:
+        """
+        프로그램에 포함된 공개키로 인증키 서명 검증 후 내용 반환 (서명 불일치 시 jwt.InvalidTokenError)
+        공개키가 없거나 kid가 다르면(키 교체 후 발급된 인증키) None - 호출한 쪽에서 서버 검증
+        """
+        kid = jwt.get_unverified_header(self.stored_license).get("kid")
+        key_info = self.public_key_info
+        if not key_info or key_info["algorithm"] != algorithm:
+            return None
+        if kid is not None and key_info.get("kid") != kid:
+            return None
+        return jwt.decode(self.stored_license, key_info["public_key"], algorithms=[algorithm])
+
+    def _check_license_data(self, license_data: Dict) -> Dict:
+        """인증키 내용 확인 (하드웨어 ID, 만료일)"""
+        if license_data.get("hardware_id") != self.hardware_id:
+            return {"valid": False, "reason": "하드웨어 ID가 일치하지 않습니다"}
+        if datetime.utcnow() > datetime.fromisoformat(license_data["expire_date"]):
+            return {"valid": False, "reason": "라이선스가 만료되었습니다"}
+        return {
+            "valid": True,
+            "version": license_data["version"],
+            "account_count": license_data["account_count"],
+            "post_count": license_data["post_count"],
+            "expire_date": license_data["expire_date"]
+        }
+
+    def _bloom_positions(self, item: str):
+        """서버 app/revocation.py BloomFilter와 같은 해시 규칙 (sha256 double hashing)"""
+        digest = hashlib.sha256(item.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        bits = self.revocations["bits"]
+        return ((h1 + i * h2) % bits for i in range(self.revocations["hashes"]))
+
+    def _bloom_add(self, item: str):
+        data = self.revocations["filter"]
+        for position in self._bloom_positions(item):
+            data[position >> 3] |= 1 << (position & 7)
+
+    def _bloom_contains(self, item: str) -> bool:
+        data = self.revocations["filter"]
+        return all(data[position >> 3] & (1 << (position & 7)) for position in self._bloom_positions(item))
+
+    def _save_revocations_to_file(self):
+        """취소 목록 캐시 저장"""
+        try:
+            cache_file = os.path.expanduser(self.REVOCATION_CACHE_FILE)
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file, "w", encoding="utf-8") as f:
+                json.dump({
+                    **self.revocations,
+                    "filter": base64.b64encode(bytes(self.revocations["filter"])).decode(),
+                }, f)
+        except Exception as e:
+            print(f"취소 목록 저장 실패: {e}")
+
+    def _load_revocations_from_file(self) -> Optional[Dict]:
+        """취소 목록 캐시 로드"""
+        try:
+            cache_file = os.path.expanduser(self.REVOCATION_CACHE_FILE)
+            if not os.path.exists(cache_file):
+                return None
+            with open(cache_file, "r", encoding="utf-8") as f:
+                revocations = json.load(f)
+            revocations["filter"] = bytearray(base64.b64decode(revocations["filter"]))
+            return revocations
+        except Exception as e:
+            print(f"취소 목록 로드 실패: {e}")
+            return None
+
     def _offline_validation(self) -> Dict:
         """오프라인 라이선스 검증 (제한적)"""
         if not self.stored_license:
             return {"valid": False, "reason": "오프라인 상태에서 라이선스를 찾을 수 없습니다"}
+
+        # 공개키 서명 인증키는 프로그램에 포함된 공개키로 서명까지 확인되면 전체 기능 허용
+        try:
+            algorithm = jwt.get_unverified_header(self.stored_license).get("alg")
+            if algorithm not in self.PUBLIC_KEY_ALGORITHMS and self.public_key_info:
+                return {"valid": False, "reason": "허용되지 않는 서명 방식입니다"}
+            if algorithm in self.PUBLIC_KEY_ALGORITHMS:
+                license_data = self._verify_signature(algorithm)
+                if license_data is not None:
+                    result = self._check_license_data(license_data)
+                    if result["valid"]:
+                        self._update_allowed_features(license_data)
+                        result.update(offline_mode=True, message="오프라인 모드 (서명 검증 완료)")
+                    return result
+        except jwt.InvalidTokenError:
+            return {"valid": False, "reason": "라이선스 서명이 올바르지 않습니다"}
         
         try:
             # JWT 디코드 (서명 검증 없이 내용만 확인)
@@ -164,9 +398,9 @@ class LicenseManager:
         except:
             return None
 
-    def _update_allowed_features(self):
-        """허용된 기능 리스트 업데이트"""
-        license_data = self._decode_license()
+    def _update_allowed_features(self, license_data: Optional[Dict] = None):
+        """허용된 기능 리스트 업데이트 (license_data: 서명을 확인한 인증키 내용)"""
+        license_data = license_data or self._decode_license()
         if not license_data:
             self.allowed_features = ["basic_posting"]
             return
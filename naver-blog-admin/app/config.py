@@ -4,10 +4,27 @@ from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
+    ENVIRONMENT: str = "development"  # development | production (production이면 서명 키 등 필수 설정 누락 시 시작 실패)
     DATABASE_URL: str = "sqlite:///./sql_app.db"
+    # 커넥션 풀 (SQLite 메모리 DB 제외)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20  # 버스트 시 pool_size 초과로 추가 허용할 연결 수
+    DB_POOL_TIMEOUT: int = 30  # 풀이 가득 찼을 때 연결을 기다리는 최대 시간(초)
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # 서버/프록시의 유휴 연결 종료 전에 재연결
+    DB_POOL_PRE_PING: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # 쓰기 락 대기 시간
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    IDENTITY_CACHE_TTL_SECONDS: int = 60  # 인증 사용자 조회 캐시 유지 시간
+    # HS256 최종 인증키 서명 키 (개발 환경이 아니면 필수)
+    LICENSE_SECRET_KEY: str = ""
+    # 최종 인증키 서명: HS256 | EdDSA | ES256 (EdDSA/ES256은 소비자 프로그램이 공개키로 오프라인 검증)
+    LICENSE_SIGNING_ALGORITHM: str = "HS256"
+    # EdDSA/ES256 개인키 (PEM 내용 또는 파일 경로, 둘 다 없으면 시작 실패 - 서버에서 생성하지 않음)
+    LICENSE_PRIVATE_KEY: str = ""
+    LICENSE_PRIVATE_KEY_PATH: str = ""
+    LICENSE_REVOCATION_SYNC_SECONDS: float = 1.0  # 검증 전 취소 목록(license_revocations) 확인 간격 (0 = 매 요청)
 
     # Email Settings
     MAIL_USERNAME: str = "your-email@gmail.com"
@@ -16,20 +33,45 @@ class Settings(BaseSettings):
     MAIL_PORT: int = 587
     MAIL_SERVER: str = "smtp.gmail.com"
     MAIL_TLS: bool = True
-    MAIL_SSL: bool
+    MAIL_SSL: bool = False
+    MAIL_QUEUE_ENABLED: bool = True  # 백그라운드 발송 워커 실행 여부
+    MAIL_QUEUE_POLL_SECONDS: float = 2.0
+    MAIL_MAX_ATTEMPTS: int = 5  # 초과 시 dead 상태로 보관
+    MAIL_RETRY_BACKOFF_SECONDS: int = 30  # 재시도 간격 (실패할 때마다 2배)
+    BULK_MAIL_RATE_PER_SECOND: float = 5  # 일괄 발송 초당 메시지 수
+    BULK_MAIL_CHUNK_SIZE: int = 500  # 구매자 조회 청크 크기
+    BULK_MAIL_MESSAGES_PER_SESSION: int = 100  # SMTP 세션당 최대 메시지 수
+
+    # WebSocket
+    WS_SEND_QUEUE_SIZE: int = 256  # 연결별 발송 큐 크기 (가득 차면 오래된 메시지부터 버림)
+    WS_SEND_TIMEOUT_SECONDS: float = 5.0  # 메시지 하나 발송이 이보다 오래 막히면 연결 종료
+    WS_PUBSUB_BACKEND: str = "memory"  # memory | unix (멀티 워커 시 unix로 워커 간 브로드캐스트 중계)
+    WS_PUBSUB_SOCKET_PATH: str = "./ws_pubsub.sock"
+    AUTOMATION_STATUS_TICK_SECONDS: float = 0.25  # 자동화 상태를 관리자에게 묶어 보내는 주기 (0.25 = 4Hz)
 
     # Admin Settings
     ADMIN_EMAIL: str = "admin@naverblog.com"
     ADMIN_PASSWORD: str = "admin123"
 
-    # Rate Limiting
-    RATE_LIMIT_PER_MINUTE: int
+    # Rate Limiting (IP별 분당 허용 요청 수)
+    RATE_LIMIT_PER_MINUTE: int = 60
+    RATE_LIMIT_VALIDATE_PER_MINUTE: int = 120  # /purchases/validate
+    RATE_LIMIT_ADMIN_PER_MINUTE: int = 300  # 관리자 대시보드 폴링
+    RATE_LIMIT_BACKEND: str = "memory"  # memory | sqlite (멀티 워커 시 sqlite)
+    RATE_LIMIT_STORE_PATH: str = "./rate_limit.db"
+    RATE_LIMIT_BUSY_TIMEOUT_MS: int = 50  # 저장소 락 대기 상한 (넘으면 제한 없이 통과)
 
     # Base URL for download links
     BASE_URL: str = "http://localhost:8000"
 
     # File paths
     DOWNLOAD_DIR: str = "static/downloads"
+    RELEASE_POLL_SECONDS: float = 5.0  # DOWNLOAD_DIR 변경 확인 주기 (0이면 시작 시 한 번만 스캔)
+
+    # 다운로드 통계 (download_events)
+    DOWNLOAD_EVENT_FLUSH_SECONDS: float = 1.0  # 다운로드 이벤트를 묶어서 기록하는 주기
+    DOWNLOAD_EVENT_BATCH_SIZE: int = 500  # 한 번에 INSERT하는 최대 이벤트 수 (버퍼가 이만큼 차면 바로 기록)
+    DOWNLOAD_STATS_MATERIALIZE_SECONDS: float = 60.0  # purchases.download_count 반영 주기 (0이면 반영 안 함)
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,275 @@
+"""
+다운로드 이벤트 로그
+
+- 다운로드 경로에서는 메모리 버퍼에 추가만 하고 DB에 쓰지 않음
+  (같은 구매 행을 read-modify-write 하느라 동시 다운로드가 줄 서거나 횟수가 빠지지 않도록)
+- DownloadEventLog(백그라운드 스레드)가 DOWNLOAD_EVENT_FLUSH_SECONDS마다 download_events에 묶어서 INSERT
+- DOWNLOAD_STATS_MATERIALIZE_SECONDS마다 체크포인트 이후 이벤트를 구매별로 집계해
+  purchases.download_count/last_download_date에 반영 (여러 워커가 동시에 돌려도 체크포인트 선점으로 한 번만 반영)
+- 대시보드 합계/일별 히스토그램은 반영된 카운터 + 아직 반영되지 않은 이벤트로 계산
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import get_settings
+from .database import SessionLocal
+from .logger import logger
+
+settings = get_settings()
+
+# full: 처음부터 받은 다운로드, resume: 이어받기, patch: 패치 파일
+KINDS = ("full", "resume", "patch")
+# purchases.download_count에 더하는 종류
+COUNTED_KINDS = ("full",)
+CHECKPOINT_ID = 1
+
+
+class DownloadEventLog:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        flush_seconds: float = 1.0,
+        batch_size: int = 500,
+        max_pending: int = 100_000,
+        materialize_seconds: float = 60.0,
+    ):
+        self.session_factory = session_factory
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.materialize_seconds = materialize_seconds
+        self._pending: deque[dict] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # 직전 반영 때 본 최대 이벤트 id (이번에는 여기까지만 반영해 아직 커밋 전인 앞 id를 건너뛰지 않도록 함)
+        self._observed_event_id: Optional[int] = None
+        self.recorded = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.flush_failures = 0
+        self.materialized = 0
+
+    def record(self, purchase_id: int, kind: str, channel: Optional[str] = None, bytes_sent: int = 0,
+               at: Optional[datetime] = None):
+        """다운로드 1건 기록 (메모리 버퍼에 추가만 함)"""
+        event = {
+            "purchase_id": purchase_id,
+            "kind": kind,
+            "channel": channel,
+            "bytes_sent": bytes_sent,
+            "created_at": at or datetime.utcnow(),
+        }
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                # DB 장애가 길어져도 메모리가 무한히 늘지 않도록 가장 오래된 것부터 버림
+                self._pending.popleft()
+                self.dropped += 1
+            self._pending.append(event)
+            self.recorded += 1
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="download-event-log", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._thread = None
+        # 종료 전에 남은 이벤트 기록
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"다운로드 이벤트 기록 실패 ({len(self._pending)}건 유실): {e}")
+
+    def _run(self):
+        last_materialize = time.monotonic()
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"다운로드 이벤트 기록 실패: {e}")
+            if self.materialize_seconds > 0 and time.monotonic() - last_materialize >= self.materialize_seconds:
+                last_materialize = time.monotonic()
+                try:
+                    # 첫 회는 최대 id만 관찰하고 반영은 다음 주기부터
+                    self.materialize(self._observed_event_id or 0)
+                except Exception as e:
+                    logger.error(f"다운로드 통계 반영 실패: {e}")
+
+    def flush(self) -> int:
+        """버퍼의 이벤트를 batch_size씩 INSERT하고 기록한 건수 반환 (실패하면 버퍼 앞에 되돌리고 예외)"""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                if not batch:
+                    return written
+                try:
+                    with self.session_factory() as db:
+                        db.execute(insert(models.DownloadEvent), batch)
+                        db.commit()
+                except Exception:
+                    with self._lock:
+                        self._pending.extendleft(reversed(batch))
+                        self.flush_failures += 1
+                    raise
+                written += len(batch)
+                self.flushed += len(batch)
+
+    def materialize(self, upper_event_id: Optional[int] = None) -> int:
+        """
+        체크포인트 이후 ~ upper_event_id(없으면 현재 최대 id) 이벤트를 purchases 통계에 반영하고 반영한 이벤트 수 반환
+        (다른 워커가 먼저 체크포인트를 옮겼으면 0)
+        """
+        db = self.session_factory()
+        try:
+            last_event_id = _checkpoint(db)
+            self._observed_event_id = db.scalar(select(func.max(models.DownloadEvent.id)))
+            upper = self._observed_event_id if upper_event_id is None else upper_event_id
+            if upper is None or upper <= last_event_id:
+                return 0
+
+            event = models.DownloadEvent
+            window = (event.id > last_event_id, event.id <= upper)
+            rows = db.execute(
+                select(event.purchase_id, func.count(), func.max(event.created_at))
+                .where(*window, event.kind.in_(COUNTED_KINDS))
+                .group_by(event.purchase_id)
+            ).all()
+            # 체크포인트 선점: 같은 구간을 다른 워커가 이미 반영했으면 아무것도 하지 않음
+            claimed = db.execute(
+                update(models.DownloadStatsCheckpoint)
+                .where(models.DownloadStatsCheckpoint.id == CHECKPOINT_ID,
+                       models.DownloadStatsCheckpoint.last_event_id == last_event_id)
+                .values(last_event_id=upper, updated_at=datetime.utcnow())
+            )
+            if claimed.rowcount != 1:
+                db.rollback()
+                return 0
+            purchase = models.Purchase
+            for purchase_id, count, newest in rows:
+                db.execute(
+                    update(purchase)
+                    .where(purchase.id == purchase_id)
+                    .values(
+                        download_count=func.coalesce(purchase.download_count, 0) + count,
+                        last_download_date=case(
+                            (purchase.last_download_date.is_(None), newest),
+                            (purchase.last_download_date < newest, newest),
+                            else_=purchase.last_download_date,
+                        ),
+                    )
+                )
+            events = db.scalar(select(func.count()).where(*window)) or 0
+            db.commit()
+        finally:
+            db.close()
+        self.materialized += events
+        return events
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "flush_failures": self.flush_failures,
+            "materialized": self.materialized,
+            "flush_seconds": self.flush_seconds,
+            "materialize_seconds": self.materialize_seconds,
+        }
+
+
+def _checkpoint(db: Session) -> int:
+    """반영된 마지막 이벤트 id (체크포인트 행이 없으면 만듦)"""
+    last_event_id = db.scalar(
+        select(models.DownloadStatsCheckpoint.last_event_id).where(models.DownloadStatsCheckpoint.id == CHECKPOINT_ID)
+    )
+    if last_event_id is not None:
+        return last_event_id
+    try:
+        db.add(models.DownloadStatsCheckpoint(id=CHECKPOINT_ID, last_event_id=0))
+        db.commit()
+    except IntegrityError:
+        # 다른 워커가 먼저 만듦
+        db.rollback()
+    return db.scalar(
+        select(models.DownloadStatsCheckpoint.last_event_id).where(models.DownloadStatsCheckpoint.id == CHECKPOINT_ID)
+    )
+
+
+def purchase_download_stats(db: Session, purchase: models.Purchase) -> tuple[int, Optional[datetime]]:
+    """구매별 다운로드 횟수/마지막 다운로드 (반영된 카운터 + 아직 반영되지 않은 이벤트)"""
+    event = models.DownloadEvent
+    count, newest = db.execute(
+        select(func.count(), func.max(event.created_at))
+        .where(event.purchase_id == purchase.id, event.id > _checkpoint(db), event.kind.in_(COUNTED_KINDS))
+    ).one()
+    last = purchase.last_download_date
+    if newest is not None and (last is None or newest > last):
+        last = newest
+    return (purchase.download_count or 0) + count, last
+
+
+def download_summary(db: Session, days: int = 30, today: Optional[date] = None) -> dict:
+    """전체 다운로드 수와 최근 days일 일별 히스토그램 (종류별 건수/전송 바이트)"""
+    event = models.DownloadEvent
+    today = today or datetime.utcnow().date()
+    since = today - timedelta(days=days - 1)
+    pending_total = db.scalar(
+        select(func.count()).where(event.id > _checkpoint(db), event.kind.in_(COUNTED_KINDS))
+    ) or 0
+    total = (db.scalar(select(func.sum(models.Purchase.download_count))) or 0) + pending_total
+
+    day = func.date(event.created_at)
+    rows = db.execute(
+        select(day, event.kind, func.count(), func.sum(event.bytes_sent))
+        .where(event.created_at >= datetime.combine(since, datetime.min.time()))
+        .group_by(day, event.kind)
+    ).all()
+    histogram = {
+        (since + timedelta(days=offset)).isoformat(): {**{kind: 0 for kind in KINDS}, "bytes": 0}
+        for offset in range(days)
+    }
+    for day_value, kind, count, bytes_sent in rows:
+        bucket = histogram.get(str(day_value))
+        if bucket is None or kind not in KINDS:
+            continue
+        bucket[kind] += count
+        bucket["bytes"] += bytes_sent or 0
+    return {
+        "total_downloads": total,
+        "days": [{"date": key, **bucket} for key, bucket in histogram.items()],
+    }
+
+
+download_event_log = DownloadEventLog(
+    SessionLocal,
+    flush_seconds=settings.DOWNLOAD_EVENT_FLUSH_SECONDS,
+    batch_size=settings.DOWNLOAD_EVENT_BATCH_SIZE,
+    materialize_seconds=settings.DOWNLOAD_STATS_MATERIALIZE_SECONDS,
+)
@@ -0,0 +1,206 @@
+"""
+프로그램 다운로드 응답 (조건부/이어받기)
+
+- 파일 크기/수정 시각/내용 해시(ETag)는 파일이 바뀔 때만 계산 (release_registry가 메모리에 보관)
+- If-None-Match가 같으면 304, Range(단일 구간)는 206으로 남은 바이트만 전송
+- If-Range가 현재 ETag/Last-Modified와 다르면(파일 교체) 전체를 다시 전송
+- 서버가 ASGI zerocopysend 확장을 지원하면 sendfile로 전송, 아니면 os.pread로 큰 청크 단위 전송
+"""
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from email.utils import formatdate
+from typing import Optional
+from urllib.parse import quote
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+HASH_CHUNK_SIZE = 1024 * 1024
+SEND_CHUNK_SIZE = 256 * 1024
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+@dataclass(frozen=True)
+class Artifact:
+    path: str
+    size: int
+    mtime_ns: int
+    inode: int
+    sha256: str
+    last_modified: str
+
+    @property
+    def etag(self) -> str:
+        """내용 SHA-256 기반 strong ETag"""
+        return f'"{self.sha256[:32]}"'
+
+    @property
+    def media_type(self) -> str:
+        return "application/zip" if self.path.endswith(".zip") else "application/octet-stream"
+
+    def matches(self, stat_result: os.stat_result) -> bool:
+        return (stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino) == (
+            self.size, self.mtime_ns, self.inode
+        )
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_artifact(path: str, stat_result: os.stat_result, previous: Optional[Artifact] = None) -> Artifact:
+    """파일 메타데이터 생성 (stat 결과가 이전과 같으면 해시를 다시 계산하지 않음)"""
+    if previous is not None and previous.path == path and previous.matches(stat_result):
+        return previous
+    return Artifact(
+        path=path,
+        size=stat_result.st_size,
+        mtime_ns=stat_result.st_mtime_ns,
+        inode=stat_result.st_ino,
+        sha256=_hash_file(path),
+        last_modified=formatdate(stat_result.st_mtime, usegmt=True),
+    )
+
+
+@dataclass(frozen=True)
+class DownloadPlan:
+    status_code: int  # 200 | 206 | 304 | 416
+    start: int = 0
+    end: int = 0  # 마지막 바이트 다음 위치
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match는 weak 비교 (W/ 접두사 무시)
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def _parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    단일 bytes 구간 -> (start, end)
+    형식이 잘못됐거나 여러 구간이면 None (전체 전송), 만족할 수 없는 구간이면 ValueError
+    """
+    match = _RANGE_PATTERN.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # bytes=-N: 마지막 N바이트
+        suffix = int(last)
+        if suffix == 0:
+            raise ValueError("빈 구간")
+        return max(size - suffix, 0), size
+    start = int(first)
+    end = min(int(last) + 1, size) if last else size
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError("파일 크기를 벗어난 구간")
+    return start, end
+
+
+def plan_download(artifact: Artifact, headers: Headers) -> DownloadPlan:
+    """조건부 요청/Range 헤더로 응답 형태 결정"""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, artifact.etag):
+        return DownloadPlan(304)
+
+    full = DownloadPlan(200, 0, artifact.size)
+    range_header = headers.get("range")
+    if range_header is None:
+        return full
+    # If-Range는 strong 비교: 파일이 바뀌었으면 이어받지 않고 전체 전송
+    if_range = headers.get("if-range")
+    if if_range is not None and if_range.strip() not in (artifact.etag, artifact.last_modified):
+        return full
+    try:
+        byte_range = _parse_range(range_header, artifact.size)
+    except ValueError:
+        return DownloadPlan(416)
+    if byte_range is None:
+        return full
+    return DownloadPlan(206, *byte_range)
+
+
+def content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted == filename:
+        return f'attachment; filename="{filename}"'
+    return f"attachment; filename*=utf-8''{quoted}"
+
+
+class ArtifactResponse(Response):
+    """DownloadPlan대로 Artifact의 일부/전체를 전송하는 응답"""
+
+    def __init__(self, artifact: Artifact, plan: DownloadPlan, filename: Optional[str] = None):
+        super().__init__(status_code=plan.status_code)
+        self.artifact = artifact
+        self.plan = plan
+        self.headers["etag"] = artifact.etag
+        self.headers["last-modified"] = artifact.last_modified
+        self.headers["accept-ranges"] = "bytes"
+        if plan.status_code == 304:
+            return
+        if plan.status_code == 416:
+            self.headers["content-range"] = f"bytes */{artifact.size}"
+            return
+        self.headers["content-type"] = artifact.media_type
+        self.headers["content-length"] = str(plan.length)
+        if plan.status_code == 206:
+            self.headers["content-range"] = f"bytes {plan.start}-{plan.end - 1}/{artifact.size}"
+        if filename:
+            self.headers["content-disposition"] = content_disposition(filename)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.plan.status_code not in (200, 206) or scope.get("method") == "HEAD":
+            await super().__call__(scope, receive, send)
+            return
+
+        file = await anyio.to_thread.run_sync(open, self.artifact.path, "rb", 0)
+        try:
+            # 등록된 ETag와 다른 파일로 교체됐으면 잘못된 바이트를 보내지 않음 (다음 스캔에서 반영)
+            if not self.artifact.matches(os.fstat(file.fileno())):
+                await Response(status_code=503, headers={"Retry-After": "1"})(scope, receive, send)
+                return
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            extensions = scope.get("extensions") or {}
+            if "http.response.zerocopysend" in extensions:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "offset": self.plan.start,
+                    "count": self.plan.length,
+                })
+            else:
+                await self._send_chunks(file.fileno(), send)
+        finally:
+            file.close()
+
+    async def _send_chunks(self, fd: int, send: Send):
+        offset, remaining = self.plan.start, self.plan.length
+        while remaining > 0:
+            chunk = await anyio.to_thread.run_sync(os.pread, fd, min(SEND_CHUNK_SIZE, remaining), offset)
+            if not chunk:
+                break
+            offset += len(chunk)
+            remaining -= len(chunk)
+            await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
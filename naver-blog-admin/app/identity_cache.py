@@ -0,0 +1,115 @@
+"""
+인증된 사용자 조회 캐시
+
+- get_current_user가 요청마다 users 테이블을 조회하지 않도록 이메일 기준 TTL 캐시 사용
+- 캐시에는 ORM 객체 대신 불변 스냅샷(id, email, is_admin, is_active)만 저장
+- User 행이 수정/삭제되면 SQLAlchemy 이벤트로 즉시 무효화
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import get_settings
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    id: int
+    email: str
+    is_admin: bool
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: models.User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_admin=bool(user.is_admin),
+            is_active=bool(user.is_active),
+        )
+
+
+class IdentityCache:
+    def __init__(self, ttl: float = 60, maxsize: int = 10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple[UserSnapshot, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, email: str) -> Optional[UserSnapshot]:
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is not None:
+                snapshot, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(email)
+                    self.hits += 1
+                    return snapshot
+                del self._entries[email]
+            self.misses += 1
+            return None
+
+    def put(self, snapshot: UserSnapshot):
+        with self._lock:
+            self._entries[snapshot.email] = (snapshot, time.monotonic() + self.ttl)
+            self._entries.move_to_end(snapshot.email)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, email: Optional[str] = None, user_id: Optional[int] = None):
+        with self._lock:
+            if email is not None:
+                self._entries.pop(email, None)
+            if user_id is not None:
+                for key in [k for k, (s, _) in self._entries.items() if s.id == user_id]:
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "size": len(self._entries),
+                "ttl": self.ttl,
+            }
+
+
+identity_cache = IdentityCache(ttl=get_settings().IDENTITY_CACHE_TTL_SECONDS)
+
+
+def get_user_snapshot(db: Session, email: str) -> Optional[UserSnapshot]:
+    """캐시에 없을 때만 DB에서 사용자 조회"""
+    snapshot = identity_cache.get(email)
+    if snapshot is not None:
+        return snapshot
+    user = db.query(models.User).filter(models.User.email == email).first()
+    if user is None:
+        return None
+    snapshot = UserSnapshot.from_user(user)
+    identity_cache.put(snapshot)
+    return snapshot
+
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _invalidate_user(mapper, connection, target):
+    """사용자 정보 변경(비활성화, 권한 변경, 이메일 변경 등) 시 캐시 무효화"""
+    history = inspect(target).attrs.email.history
+    for email in (target.email, *(history.deleted or ())):
+        identity_cache.invalidate(email=email)
+    identity_cache.invalidate(user_id=target.id)
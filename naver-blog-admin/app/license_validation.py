@@ -0,0 +1,402 @@
+"""
+라이선스 검증 엔진 (/purchases/validate)
+
+- 설치된 모든 클라이언트가 주기적으로 같은 라이선스를 검증하므로
+  (라이선스 다이제스트, hardware_id) 기준 LRU에 판정 결과를 보관
+- 유효 판정은 라이선스의 expire_date까지만 재사용하고, 만료/불일치 판정은 계속 재사용
+- 취소 내역은 license_revocations(id = 버전)가 기준: 검증 전에 sync_revocations()로 알고 있는 버전 이후
+  추가분을 읽어 반영 (다른 워커나 ORM 이벤트를 거치지 않는 UPDATE로 취소한 경우도 포함,
+  LICENSE_REVOCATION_SYNC_SECONDS 간격으로 확인)
+- 이 프로세스의 Purchase 상태 변경 이벤트는 revoke()로 바로 반영
+- validate_many(): 여러 대를 운영하는 고객용 일괄 검증 (캐시 조회 1회, 같은 인증키는 한 번만 검증)
+- LicenseSigner: LICENSE_SIGNING_ALGORITHM이 EdDSA/ES256이면 개인키로 서명하고
+  공개키를 소비자 프로그램에 포함해 배포하고 프로그램이 오프라인에서 서명 검증
+  (기존 HS256 인증키도 계속 검증)
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import get_settings
+
+# LICENSE_SECRET_KEY가 없을 때 개발 환경에서만 쓰는 서명 키
+DEVELOPMENT_SECRET_KEY = "your-secret-key-here"
+# .env.example 등의 예시 값 (개발 환경이 아니면 설정하지 않은 것으로 취급)
+_PLACEHOLDER_SECRET_KEYS = frozenset([DEVELOPMENT_SECRET_KEY, "your-license-secret-key"])
+
+# 이 상태의 구매 건에 발급된 최종 인증키는 검증 실패 처리
+REVOKED_STATUSES = frozenset(["expired", "revoked"])
+
+# 공개키 서명 방식 (소비자 프로그램이 공개키만으로 검증 가능)
+ASYMMETRIC_ALGORITHMS = frozenset(["EdDSA", "ES256"])
+
+_NEVER = float("inf")
+
+
+def license_digest(license_key: str) -> bytes:
+    return hashlib.sha256(license_key.encode()).digest()
+
+
+def _expire_timestamp(expire_date: str) -> float:
+    # 인증키의 expire_date는 UTC 기준 naive ISO 문자열
+    return datetime.fromisoformat(expire_date).replace(tzinfo=timezone.utc).timestamp()
+
+
+def generate_private_key_pem(algorithm: str) -> bytes:
+    """서명용 개인키 생성 (EdDSA: Ed25519, ES256: P-256)"""
+    if algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    elif algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        raise ValueError(f"공개키 서명 방식이 아닙니다: {algorithm}")
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+def _secret_key_from_settings(settings) -> str:
+    """HS256 최종 인증키 서명 키 (LICENSE_SECRET_KEY, 개발 환경이 아니면 없거나 예시 값일 때 시작 실패)"""
+    if settings.ENVIRONMENT == "development":
+        return settings.LICENSE_SECRET_KEY or DEVELOPMENT_SECRET_KEY
+    if not settings.LICENSE_SECRET_KEY or settings.LICENSE_SECRET_KEY in _PLACEHOLDER_SECRET_KEYS:
+        raise ValueError(f"ENVIRONMENT={settings.ENVIRONMENT}에서는 LICENSE_SECRET_KEY 설정이 필요합니다")
+    return settings.LICENSE_SECRET_KEY
+
+
+# 최종 인증키 서명 키 (HS256)
+SECRET_KEY = _secret_key_from_settings(get_settings())
+
+
+def _private_key_pem_from_settings(settings) -> bytes:
+    """
+    서명용 개인키 (LICENSE_PRIVATE_KEY 환경변수의 PEM 또는 LICENSE_PRIVATE_KEY_PATH 파일)
+    서버에서 새로 만들지 않음 - 배포마다 키가 바뀌면 이미 발급한 인증키가 모두 검증에 실패하므로 없으면 시작 실패
+    """
+    if settings.LICENSE_PRIVATE_KEY:
+        # 한 줄 환경변수에 넣을 수 있도록 \n 표기도 허용
+        return settings.LICENSE_PRIVATE_KEY.replace("\\n", "\n").encode()
+    if settings.LICENSE_PRIVATE_KEY_PATH:
+        try:
+            with open(settings.LICENSE_PRIVATE_KEY_PATH, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise ValueError(f"개인키 파일이 없습니다: {settings.LICENSE_PRIVATE_KEY_PATH}")
+    raise ValueError(
+        f"{settings.LICENSE_SIGNING_ALGORITHM} 서명에는 LICENSE_PRIVATE_KEY 또는 LICENSE_PRIVATE_KEY_PATH 설정이 필요합니다"
+    )
+
+
+class LicenseSigner:
+    """최종 인증키 서명 (HS256: 서버 비밀키 / EdDSA·ES256: 개인키 서명 + 공개키 배포)"""
+
+    def __init__(self, algorithm: str = "HS256", secret_key: str = SECRET_KEY, private_key_pem: Optional[bytes] = None):
+        if algorithm != "HS256" and algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(f"지원하지 않는 서명 방식입니다: {algorithm}")
+        self.algorithm = algorithm
+        self.secret_key = secret_key
+        self.private_key = None
+        self.public_key = None
+        self.kid = None
+        if algorithm in ASYMMETRIC_ALGORITHMS:
+            if private_key_pem is None:
+                raise ValueError(f"{algorithm} 서명에는 개인키가 필요합니다")
+            self.private_key = serialization.load_pem_private_key(private_key_pem, password=None)
+            self.public_key = self.private_key.public_key()
+            der = self.public_key.public_bytes(
+                serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo
+            )
+            # 키 교체 시 클라이언트가 캐시한 공개키와 구분하기 위한 키 ID
+            self.kid = hashlib.sha256(der).hexdigest()[:16]
+
+    @classmethod
+    def from_settings(cls, settings=None) -> "LicenseSigner":
+        settings = settings or get_settings()
+        algorithm = settings.LICENSE_SIGNING_ALGORITHM
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            return cls(algorithm)
+        return cls(algorithm, private_key_pem=_private_key_pem_from_settings(settings))
+
+    def sign(self, payload: dict) -> str:
+        if self.private_key is None:
+            return jwt.encode(payload, self.secret_key, algorithm="HS256")
+        return jwt.encode(payload, self.private_key, algorithm=self.algorithm, headers={"kid": self.kid})
+
+    def public_key_pem(self) -> Optional[str]:
+        if self.public_key is None:
+            return None
+        return self.public_key.public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode()
+
+    def public_key_info(self) -> Optional[dict]:
+        """소비자 프로그램에 배포하는 검증용 공개키 (HS256이면 None)"""
+        if self.public_key is None:
+            return None
+        return {"algorithm": self.algorithm, "kid": self.kid, "public_key": self.public_key_pem()}
+
+
+class LicenseValidator:
+    def __init__(self, secret_key: str = SECRET_KEY, maxsize: int = 50000, signer: Optional[LicenseSigner] = None):
+        self.secret_key = secret_key
+        # HS256 인증키는 secret_key로, 공개키 서명 인증키는 signer의 공개키로 검증
+        self.public_key = signer.public_key if signer is not None else None
+        self.public_algorithm = signer.algorithm if self.public_key is not None else None
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # (digest, hardware_id) -> (판정 결과, 재사용 가능 시각)
+        self._verdicts: "OrderedDict[tuple[bytes, str], tuple[dict, float]]" = OrderedDict()
+        self._revoked: set[bytes] = set()
+        # 주문 단위 취소 (같은 주문으로 재발급된 인증키 포함)
+        self._revoked_orders: set[str] = set()
+        # 반영한 license_revocations 최대 id와 마지막 확인 시각
+        self.revocation_version = 0
+        self._revocations_checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def validate(self, license_key: str, hardware_id: str, now: Optional[float] = None) -> dict:
+        if now is None:
+            now = time.time()
+        digest = license_digest(license_key)
+        key = (digest, hardware_id)
+        with self._lock:
+            if digest in self._revoked:
+                return {"valid": False, "reason": "취소된 라이선스입니다"}
+            entry = self._verdicts.get(key)
+            if entry is not None and entry[1] > now:
+                self._verdicts.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            version = self.revocation_version
+
+        verdict, until = self._verify(license_key, hardware_id, now)
+        if until > now:
+            with self._lock:
+                # 검증하는 동안 취소되었으면 캐시하지 않음
+                if digest not in self._revoked and version == self.revocation_version:
+                    self._verdicts[key] = (verdict, until)
+                    self._verdicts.move_to_end(key)
+                    if len(self._verdicts) > self.maxsize:
+                        self._verdicts.popitem(last=False)
+        return verdict
+
+    def validate_many(self, items: Iterable[tuple[str, str]], now: Optional[float] = None) -> list[dict]:
+        """(license_key, hardware_id) 목록을 한 번에 검증 (입력 순서대로 결과 반환)"""
+        if now is None:
+            now = time.time()
+        items = list(items)
+        keys = [(license_digest(license_key), hardware_id) for license_key, hardware_id in items]
+        results: list[Optional[dict]] = [None] * len(keys)
+        misses: dict[tuple[bytes, str], list[int]] = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key[0] in self._revoked:
+                    results[i] = {"valid": False, "reason": "취소된 라이선스입니다"}
+                    continue
+                entry = self._verdicts.get(key)
+                if entry is not None and entry[1] > now:
+                    self._verdicts.move_to_end(key)
+                    self.hits += 1
+                    results[i] = entry[0]
+                else:
+                    self.misses += 1
+                    misses.setdefault(key, []).append(i)
+            version = self.revocation_version
+
+        if misses:
+            verified = []
+            for key, positions in misses.items():
+                license_key, hardware_id = items[positions[0]]
+                verdict, until = self._verify(license_key, hardware_id, now)
+                for i in positions:
+                    results[i] = verdict
+                if until > now:
+                    verified.append((key, verdict, until))
+            with self._lock:
+                for key, verdict, until in verified:
+                    if key[0] not in self._revoked and version == self.revocation_version:
+                        self._verdicts[key] = (verdict, until)
+                        self._verdicts.move_to_end(key)
+                while len(self._verdicts) > self.maxsize:
+                    self._verdicts.popitem(last=False)
+        return results
+
+    def _decode(self, license_key: str) -> dict:
+        if self.public_key is None:
+            return jwt.decode(license_key, self.secret_key, algorithms=["HS256"])
+        algorithm = jwt.get_unverified_header(license_key).get("alg")
+        if algorithm == self.public_algorithm:
+            return jwt.decode(license_key, self.public_key, algorithms=[algorithm])
+        return jwt.decode(license_key, self.secret_key, algorithms=["HS256"])
+
+    def _verify(self, license_key: str, hardware_id: str, now: float) -> tuple[dict, float]:
+        """판정 결과와 그 결과를 재사용할 수 있는 시각 반환"""
+        try:
+            license_data = self._decode(license_key)
+
+            if license_data.get("order_id") in self._revoked_orders:
+                return {"valid": False, "reason": "취소된 라이선스입니다"}, _NEVER
+
+            # 하드웨어 ID 검증
+            if license_data.get("hardware_id") != hardware_id:
+                return {"valid": False, "reason": "하드웨어 ID가 일치하지 않습니다"}, _NEVER
+
+            # 만료일 검증
+            expire_at = _expire_timestamp(license_data["expire_date"])
+            if now > expire_at:
+                return {"valid": False, "reason": "라이선스가 만료되었습니다"}, _NEVER
+
+            return {
+                "valid": True,
+                "version": license_data["version"],
+                "account_count": license_data["account_count"],
+                "post_count": license_data["post_count"],
+                "expire_date": license_data["expire_date"],
+            }, expire_at
+
+        except jwt.InvalidTokenError:
+            return {"valid": False, "reason": "유효하지 않은 라이선스입니다"}, _NEVER
+        except Exception as e:
+            # 형식 오류 등은 캐시하지 않음
+            return {"valid": False, "reason": f"검증 중 오류: {str(e)}"}, 0
+
+    def revoke(self, license_key: str):
+        """서버에서 취소한 라이선스 등록 (이후 검증은 캐시와 관계없이 실패)"""
+        digest = license_digest(license_key)
+        with self._lock:
+            self._revoked.add(digest)
+            self._evict(digest)
+
+    def restore(self, license_key: str):
+        digest = license_digest(license_key)
+        with self._lock:
+            self._revoked.discard(digest)
+            self._evict(digest)
+
+    def _evict(self, digest: bytes):
+        for key in [key for key in self._verdicts if key[0] == digest]:
+            del self._verdicts[key]
+
+    def load_revocations(self, license_keys: Iterable[str] = (), digests: Iterable[bytes] = (),
+                         order_ids: Iterable[str] = (), version: int = 0):
+        with self._lock:
+            self._revoked = {license_digest(key) for key in license_keys} | set(digests)
+            self._revoked_orders = set(order_ids)
+            self.revocation_version = version
+            self._verdicts.clear()
+
+    def revocation_check_due(self, interval: float, now: Optional[float] = None) -> bool:
+        """license_revocations를 다시 확인할 때인지 (interval이 0이면 매번)"""
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            if now - self._revocations_checked_at < interval:
+                return False
+            self._revocations_checked_at = now
+            return True
+
+    def apply_revocations(self, rows: Iterable[tuple[int, Optional[str], Optional[str]]]):
+        """license_revocations 추가분 (id, order_id, license_digest hex) 반영"""
+        with self._lock:
+            for revocation_id, order_id, digest in rows:
+                if digest:
+                    digest = bytes.fromhex(digest)
+                    self._revoked.add(digest)
+                    self._evict(digest)
+                if order_id and order_id not in self._revoked_orders:
+                    self._revoked_orders.add(order_id)
+                    # 캐시 키에 주문번호가 없으므로 전부 비움 (취소는 드물게 일어남)
+                    self._verdicts.clear()
+                self.revocation_version = max(self.revocation_version, revocation_id)
+
+    def clear(self):
+        with self._lock:
+            self._verdicts.clear()
+            self._revoked.clear()
+            self._revoked_orders.clear()
+            self.revocation_version = 0
+            self._revocations_checked_at = float("-inf")
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "size": len(self._verdicts),
+                "revoked": len(self._revoked),
+                "revoked_orders": len(self._revoked_orders),
+                "revocation_version": self.revocation_version,
+            }
+
+
+license_signer = LicenseSigner.from_settings()
+license_validator = LicenseValidator(signer=license_signer)
+
+
+def _revocation_rows(since: int):
+    revocation = models.LicenseRevocation
+    return (
+        select(revocation.id, revocation.order_id, revocation.license_digest)
+        .where(revocation.id > since)
+        .order_by(revocation.id)
+    )
+
+
+def load_revoked_licenses(db: Session):
+    """서버 시작 시 취소 상태 구매 건의 최종 인증키와 취소 목록(license_revocations)을 불러옴"""
+    rows = db.query(models.Purchase.final_license).filter(
+        models.Purchase.status.in_(REVOKED_STATUSES),
+        models.Purchase.final_license.isnot(None),
+    )
+    revocations = db.execute(_revocation_rows(0)).all()
+    license_validator.load_revocations(
+        (final_license for (final_license,) in rows),
+        (bytes.fromhex(digest) for _, _, digest in revocations if digest),
+        (order_id for _, order_id, _ in revocations if order_id),
+        version=max((revocation_id for revocation_id, _, _ in revocations), default=0),
+    )
+
+
+async def sync_revocations(db: AsyncSession, validator: Optional[LicenseValidator] = None,
+                           interval: Optional[float] = None):
+    """
+    검증 캐시를 쓰기 전에 license_revocations에서 알고 있는 버전 이후 추가분을 읽어 반영
+    (다른 워커에서 취소했거나 ORM 이벤트 없이 기록된 취소도 interval초 안에 반영)
+    """
+    validator = validator or license_validator
+    if interval is None:
+        interval = get_settings().LICENSE_REVOCATION_SYNC_SECONDS
+    if not validator.revocation_check_due(interval):
+        return
+    rows = (await db.execute(_revocation_rows(validator.revocation_version))).all()
+    if rows:
+        validator.apply_revocations(rows)
+
+
+@event.listens_for(models.Purchase, "after_update")
+def _sync_revocation(mapper, connection, target):
+    """구매 건 상태가 취소/만료로 바뀌거나 인증키가 재발급되면 검증 캐시에 반영"""
+    if target.final_license is None:
+        return
+    if target.status in REVOKED_STATUSES:
+        license_validator.revoke(target.final_license)
+    else:
+        license_validator.restore(target.final_license)
@@ -0,0 +1,287 @@
+"""
+이메일 발송 큐
+
+- 요청 경로에서는 outbound_emails 테이블에 적재만 하고 바로 응답
+- MailQueueWorker(백그라운드 스레드)가 로그인된 SMTP 세션 하나를 재사용하며 발송
+- 실패 시 지수 백오프로 재시도, MAIL_MAX_ATTEMPTS회 실패하면 dead 상태로 보관
+"""
+
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Callable, Optional
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import get_settings
+from .database import SessionLocal
+from .logger import logger
+
+settings = get_settings()
+
+
+class SMTPConnection:
+    """STARTTLS/로그인까지 마친 SMTP 세션을 여러 메시지에 재사용"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        mail_from: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = False,
+        use_ssl: bool = False,
+        timeout: float = 30,
+        idle_timeout: float = 60,
+    ):
+        self.host = host
+        self.port = port
+        self.mail_from = mail_from
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.connects = 0
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+
+    @classmethod
+    def from_settings(cls, settings) -> "SMTPConnection":
+        return cls(
+            settings.MAIL_SERVER,
+            settings.MAIL_PORT,
+            settings.MAIL_FROM,
+            username=settings.MAIL_USERNAME,
+            password=settings.MAIL_PASSWORD,
+            use_tls=settings.MAIL_TLS,
+            use_ssl=settings.MAIL_SSL,
+        )
+
+    def _open(self):
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        smtp = smtp_class(self.host, self.port, timeout=self.timeout)
+        if self.use_tls and not self.use_ssl:
+            smtp.starttls()
+        if self.username and self.password:
+            smtp.login(self.username, self.password)
+        self._smtp = smtp
+        self.connects += 1
+
+    def _ensure_open(self):
+        # 서버가 유휴 연결을 끊었을 수 있으므로 오래 쉬었으면 새로 연결
+        if self._smtp is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            self.close()
+        if self._smtp is None:
+            self._open()
+
+    def send(self, to_address: str, subject: str, html_body: str):
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = self.mail_from
+        msg['To'] = to_address
+        msg.attach(MIMEText(html_body, 'html', 'utf-8'))
+
+        self._ensure_open()
+        try:
+            self._smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # 끊어진 세션은 한 번만 재연결 후 재시도
+            self.close()
+            self._open()
+            self._smtp.send_message(msg)
+        self._last_used = time.monotonic()
+
+    def close(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            pass
+        self._smtp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def enqueue_email(db: Session, to_address: str, subject: str, html_body: str) -> models.OutboundEmail:
+    """발송 큐에 적재 (호출한 쪽 트랜잭션과 함께 커밋됨)"""
+    email = models.OutboundEmail(to_address=to_address, subject=subject, html_body=html_body)
+    db.add(email)
+    # 커밋되면 워커가 폴링 주기를 기다리지 않고 바로 처리
+    event.listen(db, "after_commit", lambda session: mail_queue_worker.wake(), once=True)
+    return email
+
+
+class MailQueueWorker:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        connection_factory: Callable[[], SMTPConnection],
+        batch_size: int = 20,
+        poll_interval: float = 2.0,
+        max_attempts: int = 5,
+        backoff_seconds: float = 30,
+        max_backoff_seconds: float = 3600,
+        stale_after_seconds: float = 600,
+        requeue_interval: float = 60,
+    ):
+        self.session_factory = session_factory
+        self.connection_factory = connection_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        # sending 상태가 이보다 오래되면 발송 도중 종료된 것으로 보고 재적재 (requeue_interval마다 확인)
+        self.stale_after_seconds = stale_after_seconds
+        self.requeue_interval = requeue_interval
+        self._connection: Optional[SMTPConnection] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._requeue_interrupted()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="mail-queue-worker", daemon=True)
+        self._thread.start()
+        logger.info("메일 발송 워커 시작")
+
+    def stop(self, timeout: float = 10):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._thread = None
+        if self._connection is not None:
+            self._connection.close()
+        logger.info("메일 발송 워커 종료")
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        last_requeue = time.monotonic()
+        while not self._stop.is_set():
+            # 다른 워커가 발송 도중 종료되었다가 start() 시점의 기준보다 일찍 재시작해도 결국 재적재되도록 주기적으로 확인
+            if time.monotonic() - last_requeue >= self.requeue_interval:
+                last_requeue = time.monotonic()
+                try:
+                    self._requeue_interrupted()
+                except Exception as e:
+                    logger.error(f"발송 중단 메일 재적재 실패: {e}")
+            try:
+                processed = self.run_once()
+            except Exception as e:
+                logger.error(f"메일 큐 처리 실패: {e}")
+                processed = 0
+            if processed == 0:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def run_once(self) -> int:
+        """발송 시각이 된 메일을 한 배치 처리하고 처리 건수 반환"""
+        db = self.session_factory()
+        try:
+            emails = self._claim_batch(db)
+            for email in emails:
+                self._deliver(db, email)
+            return len(emails)
+        finally:
+            db.close()
+
+    def _claim_batch(self, db: Session) -> list:
+        now = datetime.utcnow()
+        candidates = (
+            db.query(models.OutboundEmail.id)
+            .filter(
+                models.OutboundEmail.status == "queued",
+                models.OutboundEmail.next_attempt_at <= now,
+            )
+            .order_by(models.OutboundEmail.id)
+            .limit(self.batch_size)
+            .all()
+        )
+        claimed = []
+        for (email_id,) in candidates:
+            # 조건부 UPDATE로 선점하여 여러 워커가 같은 메일을 보내지 않도록 함
+            result = db.execute(
+                update(models.OutboundEmail)
+                .where(models.OutboundEmail.id == email_id, models.OutboundEmail.status == "queued")
+                .values(status="sending", next_attempt_at=now)
+            )
+            if result.rowcount == 1:
+                claimed.append(email_id)
+        db.commit()
+        if not claimed:
+            return []
+        return db.query(models.OutboundEmail).filter(models.OutboundEmail.id.in_(claimed)).all()
+
+    def _deliver(self, db: Session, email: models.OutboundEmail):
+        if self._connection is None:
+            self._connection = self.connection_factory()
+        try:
+            self._connection.send(email.to_address, email.subject, email.html_body)
+        except Exception as e:
+            self._connection.close()
+            email.attempts = (email.attempts or 0) + 1
+            email.last_error = str(e)
+            if email.attempts >= self.max_attempts:
+                email.status = "dead"
+                logger.error(f"메일 발송 최종 실패 (id={email.id}, to={email.to_address}): {e}")
+            else:
+                delay = min(
+                    self.backoff_seconds * 2 ** (email.attempts - 1), self.max_backoff_seconds
+                )
+                email.status = "queued"
+                email.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+                logger.warning(f"메일 발송 실패, {delay:.0f}초 후 재시도 (id={email.id}): {e}")
+        else:
+            email.attempts = (email.attempts or 0) + 1
+            email.status = "sent"
+            email.sent_at = datetime.utcnow()
+            email.last_error = None
+        db.commit()
+
+    def _requeue_interrupted(self) -> int:
+        """발송 도중 프로세스가 종료되어 sending으로 남은 메일을 재적재하고 건수 반환"""
+        stale_after = timedelta(seconds=self.stale_after_seconds)
+        db = self.session_factory()
+        try:
+            # 다른 워커가 지금 발송 중인 메일은 건드리지 않도록 선점 후 오래된 것만 대상
+            result = db.execute(
+                update(models.OutboundEmail)
+                .where(
+                    models.OutboundEmail.status == "sending",
+                    models.OutboundEmail.next_attempt_at < datetime.utcnow() - stale_after,
+                )
+                .values(status="queued")
+            )
+            db.commit()
+            return result.rowcount
+        finally:
+            db.close()
+
+
+mail_queue_worker = MailQueueWorker(
+    SessionLocal,
+    lambda: SMTPConnection.from_settings(settings),
+    poll_interval=settings.MAIL_QUEUE_POLL_SECONDS,
+    max_attempts=settings.MAIL_MAX_ATTEMPTS,
+    backoff_seconds=settings.MAIL_RETRY_BACKOFF_SECONDS,
+)
@@ -1,9 +1,8 @@
-import threading
 import time
-from collections import defaultdict, deque
 from datetime import datetime, timedelta
 import json
 import asyncio
+from contextlib import asynccontextmanager
 
 from .exception_handlers import (CustomAPIException,
                                     custom_api_exception_handler,
@@ -11,81 +10,55 @@ from .exception_handlers import (CustomAPIException,
                                     http_exception_handler,
                                     sqlalchemy_exception_handler,
                                     validation_exception_handler)
+from .auth import get_websocket_user, resolve_request_auth
+from .automation_status import automation_status
+from .config import get_settings
+from .database import SessionLocal, engine
+from .download_events import download_event_log
+from .license_validation import load_revoked_licenses
 from .logger import logger
+from .mail_queue import mail_queue_worker
+from .rate_limit import build_rate_limiter
+from .releases import release_registry
 from .routers import auth, licenses, payments, usages, users, purchases
+from .websocket_manager import manager
 from fastapi import FastAPI, HTTPException, Request, status, WebSocket, WebSocketDisconnect
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 백그라운드 작업 시작/종료
+    settings = get_settings()
+    if settings.MAIL_QUEUE_ENABLED:
+        mail_queue_worker.start()
+    release_registry.start()
+    download_event_log.start()
+    if settings.WS_PUBSUB_BACKEND == "unix":
+        await manager.start_relay(settings.WS_PUBSUB_SOCKET_PATH)
+    with SessionLocal() as db:
+        load_revoked_licenses(db)
+    yield
+    await automation_status.stop()
+    await manager.stop_relay()
+    mail_queue_worker.stop()
+    release_registry.stop()
+    download_event_log.stop()
+    engine.dispose()
+
+
 app = FastAPI(
-    title="Naver Blog Admin API", description="네이버 블로그 관리 API", version="1.0.0"
+    title="Naver Blog Admin API",
+    description="네이버 블로그 관리 API",
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
-# WebSocket 연결 관리
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: list[WebSocket] = []
-        self.admin_connections: list[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket, is_admin: bool = False):
-        await websocket.accept()
-        if is_admin:
-            self.admin_connections.append(websocket)
-            logger.info(f"관리자 WebSocket 연결: {len(self.admin_connections)}개")
-        else:
-            self.active_connections.append(websocket)
-            logger.info(f"사용자 WebSocket 연결: {len(self.active_connections)}개")
-
-    def disconnect(self, websocket: WebSocket, is_admin: bool = False):
-        if is_admin and websocket in self.admin_connections:
-            self.admin_connections.remove(websocket)
-            logger.info(f"관리자 WebSocket 연결 해제: {len(self.admin_connections)}개")
-        elif websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            logger.info(f"사용자 WebSocket 연결 해제: {len(self.active_connections)}개")
-
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        try:
-            await websocket.send_text(message)
-        except Exception as e:
-            logger.error(f"WebSocket 메시지 전송 실패: {e}")
-
-    async def broadcast_to_admins(self, message: dict):
-        """관리자들에게 실시간 상태 브로드캐스트"""
-        if self.admin_connections:
-            message_str = json.dumps(message, ensure_ascii=False)
-            disconnected = []
-            for connection in self.admin_connections:
-                try:
-                    await connection.send_text(message_str)
-                except Exception as e:
-                    logger.error(f"관리자 WebSocket 브로드캐스트 실패: {e}")
-                    disconnected.append(connection)
-            
-            # 연결이 끊어진 클라이언트 제거
-            for connection in disconnected:
-                self.admin_connections.remove(connection)
-
-    async def broadcast_to_users(self, message: dict):
-        """사용자들에게 공지사항 브로드캐스트"""
-        if self.active_connections:
-            message_str = json.dumps(message, ensure_ascii=False)
-            disconnected = []
-            for connection in self.active_connections:
-                try:
-                    await connection.send_text(message_str)
-                except Exception as e:
-                    logger.error(f"사용자 WebSocket 브로드캐스트 실패: {e}")
-                    disconnected.append(connection)
-            
-            # 연결이 끊어진 클라이언트 제거
-            for connection in disconnected:
-                self.active_connections.remove(connection)
-
-manager = ConnectionManager()
 
 # 예외 핸들러 등록
 app.add_exception_handler(CustomAPIException, custom_api_exception_handler)
@@ -108,34 +81,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Rate Limit 미들웨어 (메모리 기반, IP별 분당 60회)
-RATE_LIMIT = 60
-RATE_LIMIT_WINDOW = 60  # seconds
-rate_limit_data = defaultdict(deque)
-rate_limit_lock = threading.Lock()
+# Rate Limit 미들웨어 (IP별·라우트별 예산, Settings.RATE_LIMIT_* 기반)
+rate_limiter = build_rate_limiter(get_settings())
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host
-        now = datetime.utcnow()
-        with rate_limit_lock:
-            dq = rate_limit_data[client_ip]
-            # 오래된 요청 제거
-            while dq and (now - dq[0]).total_seconds() > RATE_LIMIT_WINDOW:
-                dq.popleft()
-            if len(dq) >= RATE_LIMIT:
-                logger.warning(f"Rate limit exceeded: {client_ip}")
-                return JSONResponse(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    content={
-                        "success": False,
-                        "code": "rate_limit_exceeded",
-                        "message": "요청이 너무 많습니다. 잠시 후 다시 시도하세요.",
-                        "path": str(request.url),
-                    },
-                )
-            dq.append(now)
+        client_ip = request.client.host if request.client else "unknown"
+        result = await rate_limiter.ahit(client_ip, request.url.path)
+        if not result.allowed:
+            logger.warning(f"Rate limit exceeded: {client_ip}")
+            return JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={
+                    "success": False,
+                    "code": "rate_limit_exceeded",
+                    "message": "요청이 너무 많습니다. 잠시 후 다시 시도하세요.",
+                    "path": str(request.url),
+                },
+                headers={"Retry-After": str(result.retry_after)},
+            )
         return await call_next(request)
 
 
@@ -146,21 +111,9 @@ app.add_middleware(RateLimitMiddleware)
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     start_time = time.time()
-    user_id = None
-    try:
-        auth_header = request.headers.get("authorization")
-        if auth_header and auth_header.lower().startswith("bearer "):
-            from .config import get_settings
-            from jose import jwt
-
-            settings = get_settings()
-            token = auth_header.split()[1]
-            payload = jwt.decode(
-                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-            )
-            user_id = payload.get("sub")
-    except Exception:
-        user_id = None
+    # 요청당 한 번만 토큰 검증 (결과는 request.state에 저장되어 인증 의존성이 재사용)
+    claims = resolve_request_auth(request)
+    user_id = claims.get("sub") if claims else None
     response = await call_next(request)
     process_time = time.time() - start_time
     logger.info(
@@ -178,12 +131,14 @@ async def websocket_admin_endpoint(websocket: WebSocket):
     
     try:
         # 연결 성공 메시지 전송
-        await websocket.send_text(json.dumps({
+        await manager.send_json(websocket, {
             "type": "connection_established",
             "message": "관리자 WebSocket 연결이 성공했습니다.",
             "timestamp": datetime.now().isoformat(),
-            "admin_count": len(manager.admin_connections)
-        }))
+            "admin_count": manager.total_counts()[0]
+        })
+        # 현재 자동화 상태 전체 (이후에는 automation_status_batch로 바뀐 항목만 전달)
+        await manager.send_json(websocket, automation_status.snapshot())
     
         # 메시지 수신 대기
         while True:
@@ -192,19 +147,24 @@ async def websocket_admin_endpoint(websocket: WebSocket):
             
             # ping/pong 처리
             if message.get("type") == "ping":
-                await websocket.send_text(json.dumps({
+                await manager.send_json(websocket, {
                     "type": "pong", 
                     "timestamp": datetime.now().isoformat()
-                }))
+                })
                     
             # 통계 요청 처리
             elif message.get("type") == "stats_request":
-                await websocket.send_text(json.dumps({
+                admin_total, user_total = manager.total_counts()
+                await manager.send_json(websocket, {
                     "type": "stats_response",
-                    "admin_connections": len(manager.admin_connections),
-                    "user_connections": len(manager.active_connections),
+                    "admin_connections": admin_total,
+                    "user_connections": user_total,
                     "timestamp": datetime.now().isoformat()
-                }))
+                })
+
+            # 자동화 상태 재동기화 요청
+            elif message.get("type") == "automation_status_snapshot_request":
+                await manager.send_json(websocket, automation_status.snapshot())
             
     except WebSocketDisconnect:
         logger.info("관리자 WebSocket 정상 종료")
@@ -214,43 +174,53 @@ async def websocket_admin_endpoint(websocket: WebSocket):
         manager.disconnect(websocket, is_admin=True)
 
 
+def _authenticate_websocket(websocket: WebSocket):
+    with SessionLocal() as db:
+        return get_websocket_user(websocket, db)
+
+
 @app.websocket("/ws/user/{user_id}")
 async def websocket_user_endpoint(websocket: WebSocket, user_id: str):
-    """사용자용 실시간 알림 WebSocket"""
-    await manager.connect(websocket, is_admin=False)
+    """사용자용 실시간 알림 WebSocket (?token= 또는 Authorization: Bearer 액세스 토큰 필요)"""
+    user = await run_in_threadpool(_authenticate_websocket, websocket)
+    if user is None or str(user.id) != user_id:
+        # 1008: Policy Violation (토큰이 없거나 경로의 user_id가 토큰 사용자와 다름)
+        await websocket.close(code=1008)
+        return
+    await manager.connect(websocket, is_admin=False, user_id=user.id)
     
     try:
         while True:
             data = await websocket.receive_text()
             message = json.loads(data)
             
-            # 자동화 상태 업데이트를 관리자에게 브로드캐스트
+            # 자동화 상태는 최신 값만 보관하고 주기마다 묶어서 관리자에게 전송
             if message.get("type") == "automation_status":
-                await manager.broadcast_to_admins({
-                    "type": "user_activity",
-                    "user_id": user_id,
-                    "status": message.get("status"),
-                    "progress": message.get("progress", 0),
-                    "message": message.get("message", ""),
-                    "timestamp": datetime.now().isoformat()
-                })
+                automation_status.update(
+                    user_id,
+                    message.get("status"),
+                    message.get("progress", 0),
+                    message.get("message", ""),
+                )
             
             # ping/pong 처리
             elif message.get("type") == "ping":
-                await websocket.send_text(json.dumps({"type": "pong"}))
+                await manager.send_json(websocket, {"type": "pong"})
             
     except WebSocketDisconnect:
         logger.info(f"사용자 {user_id} WebSocket 정상 종료")
-        # 사용자 연결 해제를 관리자에게 알림
-        await manager.broadcast_to_admins({
-            "type": "user_disconnected",
-            "user_id": user_id,
-            "timestamp": datetime.now().isoformat()
-        })
     except Exception as e:
         logger.error(f"사용자 WebSocket 오류: {e}")
     finally:
         manager.disconnect(websocket, is_admin=False)
+        # 같은 사용자의 다른 연결이 남아 있으면 자동화 상태를 유지하고 연결 해제도 알리지 않음
+        if not manager.is_user_connected(user.id):
+            automation_status.remove(user_id)
+            await manager.broadcast_to_admins({
+                "type": "user_disconnected",
+                "user_id": user_id,
+                "timestamp": datetime.now().isoformat()
+            })
 
 
 # 라우터 등록
@@ -282,10 +252,14 @@ def health_check():
 # 실시간 통계 API 추가
 @app.get("/api/realtime/stats")
 def get_realtime_stats():
-    """실시간 연결 통계"""
+    """실시간 연결 통계 (여러 워커 실행 시 전체 워커 합계)"""
+    admin_total, user_total = manager.total_counts()
     return {
-        "active_users": len(manager.active_connections),
-        "admin_connections": len(manager.admin_connections),
+        "active_users": user_total,
+        "admin_connections": admin_total,
+        "workers": manager.relay.workers() if manager.relay else 1,
+        "automation_status": automation_status.stats(),
+        "download_events": download_event_log.stats(),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -293,15 +267,15 @@ def get_realtime_stats():
 # 관리자 공지사항 브로드캐스트 API
 @app.post("/api/admin/broadcast")
 async def broadcast_notice(notice: dict):
-    """관리자가 모든 사용자에게 공지사항 브로드캐스트"""
-    await manager.broadcast_to_users({
+    """관리자가 모든 사용자에게 공지사항 브로드캐스트 (연결별 발송 큐에 넣고 바로 응답)"""
+    recipients = await manager.broadcast_to_users({
         "type": "admin_notice",
         "title": notice.get("title", "공지사항"),
         "message": notice.get("message", ""),
         "level": notice.get("level", "info"),
         "timestamp": datetime.now().isoformat()
     })
-    return {"status": "success", "message": "공지사항이 브로드캐스트되었습니다."}
+    return {"status": "success", "message": "공지사항이 브로드캐스트되었습니다.", "recipients": recipients}
 
 
 # 전역 WebSocket 매니저를 다른 모듈에서 사용할 수 있도록 설정
@@ -311,7 +285,6 @@ app.state.websocket_manager = manager
 from .database import SessionLocal
 from .models import User
 from .auth import get_password_hash
-from .config import get_settings
 
 def create_admin_if_not_exists():
     db = SessionLocal()
@@ -329,8 +302,13 @@ def create_admin_if_not_exists():
             is_admin=True,
         )
         db.add(admin)
-        db.commit()
-        print("[ADMIN] 관리자 계정이 자동 생성되었습니다.")
+        try:
+            db.commit()
+            print("[ADMIN] 관리자 계정이 자동 생성되었습니다.")
+        except IntegrityError:
+            # 여러 워커가 동시에 기동하면 다른 워커가 먼저 생성했을 수 있음
+            db.rollback()
+            print("[ADMIN] 관리자 계정이 이미 존재합니다.")
     else:
         print("[ADMIN] 관리자 계정이 이미 존재합니다.")
     db.close()
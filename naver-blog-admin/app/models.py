@@ -1,7 +1,7 @@
 from datetime import datetime
 
-from sqlalchemy import (Boolean, Column, DateTime, Float, ForeignKey, Integer,
-                        String)
+from sqlalchemy import (Boolean, Column, DateTime, Float, ForeignKey, Index,
+                        Integer, String, Text, UniqueConstraint)
 from sqlalchemy.orm import relationship
 
 from .database import Base
@@ -20,12 +20,21 @@ class User(Base):
     expire_date = Column(DateTime, nullable=True)
     is_active = Column(Boolean, default=True)
     is_admin = Column(Boolean, default=False)  # 관리자 여부
+    refresh_token = Column(String, nullable=True, unique=True, index=True)  # /auth/refresh 조회 키
+    refresh_token_expire = Column(DateTime, nullable=True)
 
     # Relationships
     licenses = relationship("License", back_populates="user")
     payments = relationship("Payment", back_populates="user")
     usages = relationship("Usage", back_populates="user")
 
+    # 관리자 목록 키셋 페이지네이션 (id 내림차순) 필터별 인덱스
+    __table_args__ = (
+        Index("ix_users_plan_id", "plan", "id"),
+        Index("ix_users_is_admin_id", "is_admin", "id"),
+        Index("ix_users_is_active_id", "is_active", "id"),
+    )
+
 
 class License(Base):
     __tablename__ = "licenses"
@@ -41,6 +50,12 @@ class License(Base):
     # Relationship
     user = relationship("User", back_populates="licenses")
 
+    __table_args__ = (
+        Index("ix_licenses_user_id_id", "user_id", "id"),
+        Index("ix_licenses_status_id", "status", "id"),
+        Index("ix_licenses_plan_id", "plan", "id"),
+    )
+
 
 class Payment(Base):
     __tablename__ = "payments"
@@ -56,13 +71,19 @@ class Payment(Base):
     # Relationship
     user = relationship("User", back_populates="payments")
 
+    __table_args__ = (
+        Index("ix_payments_user_id_id", "user_id", "id"),
+        Index("ix_payments_status_id", "status", "id"),
+        Index("ix_payments_method_id", "method", "id"),
+    )
+
 
 class Usage(Base):
     __tablename__ = "usages"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    date = Column(DateTime, default=datetime.utcnow)
+    date = Column(DateTime, nullable=False, default=datetime.utcnow)
     post_count = Column(Integer, default=0)
     success_count = Column(Integer, default=0)
     fail_count = Column(Integer, default=0)
@@ -70,6 +91,12 @@ class Usage(Base):
     # Relationship
     user = relationship("User", back_populates="usages")
 
+    # (date, id) 내림차순 키셋 + 날짜 구간 필터
+    __table_args__ = (
+        Index("ix_usages_date_id", "date", "id"),
+        Index("ix_usages_user_id_date_id", "user_id", "date", "id"),
+    )
+
 
 class Purchase(Base):
     __tablename__ = "purchases"
@@ -92,17 +119,139 @@ class Purchase(Base):
     payment_date = Column(DateTime, default=datetime.utcnow)
     
     # 라이선스 정보
-    temporary_license = Column(String, nullable=True)     # 임시 라이선스
+    temporary_license = Column(String, nullable=True, unique=True, index=True)  # 임시 라이선스 (주문번호 기반)
     final_license = Column(String, nullable=True)         # 최종 인증키
-    hardware_id = Column(String, nullable=True)           # 하드웨어 ID
+    hardware_id = Column(String, nullable=True, index=True)  # 하드웨어 ID (한 PC에서 여러 구매 가능)
     activation_date = Column(DateTime, nullable=True)     # 활성화 날짜
     expire_date = Column(DateTime)                        # 만료일
     
     # 다운로드 통계
-    download_count = Column(Integer, default=0)          # 다운로드 횟수
+    download_count = Column(Integer, default=0)          # 다운로드 횟수 (download_events에서 주기적으로 반영)
     last_download_date = Column(DateTime, nullable=True) # 마지막 다운로드 날짜
     
     # 상태 관리
     status = Column(String, default="pending")           # pending, activated, expired
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # 관리자 목록 키셋 페이지네이션 (created_at, id 내림차순) + 필터별 인덱스
+    __table_args__ = (
+        Index("ix_purchases_created_at_id", "created_at", "id"),
+        Index("ix_purchases_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_purchases_version_created_at_id", "version", "created_at", "id"),
+        Index("ix_purchases_customer_email_created_at_id", "customer_email", "created_at", "id"),
+    )
+
+
+class DownloadEvent(Base):
+    """다운로드 기록 (추가만 함, DownloadEventLog가 묶어서 기록하고 주기적으로 purchases 통계에 반영)"""
+
+    __tablename__ = "download_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    purchase_id = Column(Integer, nullable=False)
+    kind = Column(String, nullable=False)                # full(처음부터 받기), resume(이어받기), patch
+    channel = Column(String, nullable=True)
+    bytes_sent = Column(Integer, default=0)
+    created_at = Column(DateTime, nullable=False, index=True)  # 다운로드 시각 (기록 시각 아님)
+
+    __table_args__ = (Index("ix_download_events_purchase_id_id", "purchase_id", "id"),)
+
+
+class DownloadStatsCheckpoint(Base):
+    """download_events를 purchases.download_count에 어디까지 반영했는지 (행 1개)"""
+
+    __tablename__ = "download_stats_checkpoints"
+
+    id = Column(Integer, primary_key=True)
+    last_event_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class LicenseRevocation(Base):
+    """취소된 라이선스 목록 (id가 클라이언트에 배포하는 취소 목록의 버전)"""
+
+    __tablename__ = "license_revocations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    order_id = Column(String, nullable=True, index=True)        # 주문 단위 취소 (재발급된 인증키 포함)
+    license_digest = Column(String, nullable=True, index=True)  # 최종 인증키 sha256 hex
+    reason = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ActivationIdempotencyKey(Base):
+    """활성화 요청 멱등성 키 (같은 키로 재시도하면 처음 발급한 최종 인증키를 그대로 반환)"""
+
+    __tablename__ = "activation_idempotency_keys"
+
+    id = Column(Integer, primary_key=True, index=True)
+    idempotency_key = Column(String, nullable=False, unique=True, index=True)
+    temporary_license = Column(String, nullable=False)
+    hardware_id = Column(String, nullable=False)
+    final_license = Column(String, nullable=False)
+    expire_date = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class OutboundEmail(Base):
+    """발송 대기 이메일 큐 (MailQueueWorker가 백그라운드에서 발송)"""
+
+    __tablename__ = "outbound_emails"
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_address = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    html_body = Column(Text, nullable=False)
+
+    # 상태 관리
+    status = Column(String, default="queued")            # queued, sending, sent, dead
+    attempts = Column(Integer, default=0)                 # 발송 시도 횟수
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)  # 다음 발송 시도 시각
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (Index("ix_outbound_emails_status_next_attempt", "status", "next_attempt_at"),)
+
+
+class MailCampaign(Base):
+    """구매자 대상 일괄 메일 발송 (만료 안내, 신규 버전 안내 등)"""
+
+    __tablename__ = "mail_campaigns"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    subject = Column(String, nullable=False)       # {customer_name} 등 구매 정보 필드 사용 가능
+    html_body = Column(Text, nullable=False)
+
+    # 대상 필터 (비어 있으면 전체 구매자)
+    version = Column(String, nullable=True)
+    purchase_status = Column(String, nullable=True)
+    expire_before = Column(DateTime, nullable=True)
+
+    # 진행 상태 (체크포인트)
+    status = Column(String, default="pending")           # pending, running, paused, completed
+    last_purchase_id = Column(Integer, default=0)         # 마지막으로 처리한 purchases.id
+    sent_count = Column(Integer, default=0)
+    failed_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class MailCampaignDelivery(Base):
+    """캠페인별 수신자 발송 기록 (같은 이메일로 중복 발송 방지)"""
+
+    __tablename__ = "mail_campaign_deliveries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    campaign_id = Column(Integer, ForeignKey("mail_campaigns.id"), nullable=False)
+    email = Column(String, nullable=False)
+    purchase_id = Column(Integer, nullable=False)
+    status = Column(String, default="sent")              # sent, failed
+    error = Column(Text, nullable=True)
+    sent_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("campaign_id", "email", name="uq_mail_campaign_deliveries_campaign_email"),
+    )
@@ -0,0 +1,182 @@
+"""
+목록 API 공통 키셋 페이지네이션/필터
+
+- OFFSET 대신 NOT NULL 정렬 키(마지막 컬럼은 고유한 id)의 마지막 값을 커서로 넘겨 다음 페이지를 조회
+  (정렬 키/필터마다 복합 인덱스가 있으므로 몇 번째 페이지든 비용이 같음)
+- 필터는 엔드포인트마다 허용 목록(Filter)으로 선언 (인덱스가 있는 컬럼만, 목록에 없는 파라미터는 400)
+- 전체 건수는 count_limit까지만 세고 넘으면 total_exact=False
+- stream=true면 커서로 청크씩 읽어 JSON 배열로 스트리밍 (메모리는 청크 크기만큼만 사용)
+"""
+
+import base64
+import inspect
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+# 전체 건수를 정확히 세는 상한
+COUNT_LIMIT = 10000
+# 스트리밍 시 한 번에 읽는 행 수
+STREAM_CHUNK = 500
+_RESERVED = ("limit", "cursor", "stream")
+
+
+@dataclass(frozen=True)
+class Filter:
+    """허용 필터: 쿼리 파라미터 -> 컬럼 조건 (eq | gte | lt)"""
+
+    column: Any
+    type: type = str
+    op: str = "eq"
+
+    def condition(self, value):
+        if self.op == "gte":
+            return self.column >= value
+        if self.op == "lt":
+            return self.column < value
+        return self.column == value
+
+
+@dataclass
+class PageRequest:
+    limit: int = DEFAULT_LIMIT
+    cursor: Optional[str] = None
+    filters: dict[str, Any] = field(default_factory=dict)
+    stream: bool = False
+
+
+class KeysetPaginator:
+    """
+    모델 하나의 목록 조회 (정렬 키 내림차순)
+    keys: 정렬 컬럼들 (NOT NULL, 마지막은 고유해야 함, 예: (created_at, id) 또는 (id,))
+    """
+
+    def __init__(self, model, keys: tuple, filters: dict[str, Filter], schema: type[BaseModel],
+                 max_limit: int = MAX_LIMIT, count_limit: int = COUNT_LIMIT, stream_chunk: int = STREAM_CHUNK):
+        # NULL인 정렬 키는 튜플 비교에서 빠져 첫 페이지 이후에 나오지 않음
+        nullable = [column.key for column in keys if column.nullable]
+        if nullable:
+            raise ValueError(f"정렬 키는 NOT NULL 컬럼이어야 합니다: {', '.join(nullable)}")
+        self.model = model
+        self.keys = keys
+        self.filters = filters
+        self.schema = schema
+        self.max_limit = max_limit
+        self.count_limit = count_limit
+        self.stream_chunk = stream_chunk
+        self.request = self._build_dependency()
+
+    def _build_dependency(self):
+        """허용 필터를 쿼리 파라미터로 선언한 FastAPI 의존성 (OpenAPI 문서에도 표시)"""
+        parameters = [
+            inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            inspect.Parameter("limit", inspect.Parameter.KEYWORD_ONLY, annotation=int,
+                              default=Query(DEFAULT_LIMIT, ge=1, le=self.max_limit)),
+            inspect.Parameter("cursor", inspect.Parameter.KEYWORD_ONLY, annotation=Optional[str],
+                              default=Query(None, description="이전 응답의 next_cursor")),
+            inspect.Parameter("stream", inspect.Parameter.KEYWORD_ONLY, annotation=bool,
+                              default=Query(False, description="전체 결과를 JSON 배열로 스트리밍")),
+        ]
+        parameters += [
+            inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=Optional[spec.type], default=Query(None))
+            for name, spec in self.filters.items()
+        ]
+        allowed = set(_RESERVED) | set(self.filters)
+
+        def dependency(request: Request, limit: int, cursor: Optional[str], stream: bool, **filters) -> PageRequest:
+            unknown = sorted(set(request.query_params) - allowed)
+            if unknown:
+                raise HTTPException(400, f"허용되지 않는 필터입니다: {', '.join(unknown)}")
+            return PageRequest(
+                limit=limit,
+                cursor=cursor,
+                filters={name: value for name, value in filters.items() if value is not None},
+                stream=stream,
+            )
+
+        dependency.__signature__ = inspect.Signature(parameters)
+        return dependency
+
+    def encode_cursor(self, row) -> str:
+        values = [getattr(row, column.key) for column in self.keys]
+        raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> tuple:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(raw)
+            if not isinstance(values, list) or len(values) != len(self.keys):
+                raise ValueError(cursor)
+            return tuple(
+                datetime.fromisoformat(value) if column.type.python_type is datetime else column.type.python_type(value)
+                for column, value in zip(self.keys, values)
+            )
+        except (ValueError, TypeError):
+            raise HTTPException(400, "잘못된 cursor입니다")
+
+    def _after(self, values: tuple):
+        if len(self.keys) == 1:
+            return self.keys[0] < values[0]
+        return tuple_(*self.keys) < tuple_(*values)
+
+    def _conditions(self, page_request: PageRequest, where: tuple) -> list:
+        return [*where, *(self.filters[name].condition(value) for name, value in page_request.filters.items())]
+
+    def _rows(self, db: Session, conditions: list, after: Optional[tuple], limit: int) -> list:
+        query = select(self.model).where(*conditions)
+        if after is not None:
+            query = query.where(self._after(after))
+        return db.scalars(query.order_by(*(column.desc() for column in self.keys)).limit(limit)).all()
+
+    def page(self, db: Session, page_request: PageRequest, *where):
+        """
+        한 페이지 조회 ({total, total_exact, size, next_cursor, items}).
+        stream이면 전체 결과를 스트리밍하는 응답 반환. where: 권한 등 호출한 쪽 추가 조건
+        """
+        conditions = self._conditions(page_request, where)
+        after = self.decode_cursor(page_request.cursor) if page_request.cursor else None
+        if page_request.stream:
+            return StreamingResponse(self._stream(db, conditions, after), media_type="application/json")
+
+        matched = db.scalar(
+            select(func.count()).select_from(
+                select(self.keys[-1]).where(*conditions).limit(self.count_limit + 1).subquery()
+            )
+        )
+        rows = self._rows(db, conditions, after, page_request.limit + 1)
+        has_more = len(rows) > page_request.limit
+        rows = rows[:page_request.limit]
+        return {
+            "total": min(matched, self.count_limit),
+            "total_exact": matched <= self.count_limit,
+            "size": len(rows),
+            "next_cursor": self.encode_cursor(rows[-1]) if has_more else None,
+            "items": rows,
+        }
+
+    def _stream(self, db: Session, conditions: list, after: Optional[tuple]):
+        yield b"["
+        first = True
+        while True:
+            rows = self._rows(db, conditions, after, self.stream_chunk)
+            if not rows:
+                break
+            body = ",".join(self.schema.model_validate(row).model_dump_json() for row in rows)
+            yield (body if first else "," + body).encode()
+            first = False
+            after = tuple(getattr(rows[-1], column.key) for column in self.keys)
+            # 세션에 읽은 객체가 쌓이지 않도록 청크마다 비움
+            db.expunge_all()
+            if len(rows) < self.stream_chunk:
+                break
+        yield b"]"
@@ -0,0 +1,233 @@
+"""
+클라이언트 프로그램 패치(델타) 업데이트
+
+- 빌드 zip을 항목(파일) 단위로 비교해 바뀌거나 추가된 항목만 담은 패치 zip 생성
+  (CRC/크기는 zip 목록에 있으므로 비교에 압축 해제가 필요 없음)
+- publish_build: 새 빌드를 채널 폴더에 등록하고 최근 빌드들에서 오는 패치를 생성 (릴리스 파이프라인)
+- find_update: 현재 빌드에서 최신 빌드까지 전송량이 가장 작은 패치 경로
+  (패치 합계가 전체 파일보다 크거나 경로가 없으면 전체 다운로드)
+- apply_patch: 클라이언트가 이전 빌드 + 패치로 새 빌드를 만들고 항목별 CRC 검증
+
+채널 폴더 구성 (releases.py 참고)
+- builds/<빌드>.zip            배포된 빌드 보관
+- patches/<이전>__<다음>.zip    패치 (patch.json + files/<항목>)
+
+실행: python -m app.patches publish <채널 폴더> <빌드> <패키지 zip> (naver-blog-admin 폴더에서)
+"""
+
+import argparse
+import heapq
+import json
+import os
+import re
+import shutil
+import zipfile
+import zlib
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .downloads import Artifact
+from .releases import BUILDS_DIR, PATCH_SEPARATOR, PATCHES_DIR, PROGRAM_FILES, VERSION_INFO_FILE, Release
+
+MANIFEST = "patch.json"
+# 새 빌드를 올릴 때 직접 패치를 만들어 둘 최근 빌드 수 (더 오래된 빌드는 패치를 이어서 적용)
+DIRECT_PATCHES = 5
+
+
+class PatchError(ValueError):
+    pass
+
+
+def build_key(build: str) -> tuple:
+    """빌드 번호 정렬 키 ("3.10.0" > "3.9.1")"""
+    return tuple(int(part) for part in re.findall(r"\d+", build)), build
+
+
+def patch_name(from_build: str, to_build: str) -> str:
+    return f"{from_build}{PATCH_SEPARATOR}{to_build}.zip"
+
+
+def _atomic_output(path: str) -> str:
+    # 레지스트리가 쓰는 중인 파일을 읽지 않도록 .tmp로 쓴 뒤 교체
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return f"{path}.tmp"
+
+
+def _copy_info(info: zipfile.ZipInfo, name: str) -> zipfile.ZipInfo:
+    copied = zipfile.ZipInfo(name, info.date_time)
+    copied.external_attr = info.external_attr
+    copied.compress_type = zipfile.ZIP_STORED if info.is_dir() else zipfile.ZIP_DEFLATED
+    return copied
+
+
+def build_patch(old_path: str, new_path: str, out_path: str, from_build: str, to_build: str) -> dict:
+    """old -> new 패치 생성 후 manifest 반환"""
+    tmp_path = _atomic_output(out_path)
+    with zipfile.ZipFile(old_path) as old, zipfile.ZipFile(new_path) as new, \
+            zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as patch:
+        old_entries = {info.filename: (info.CRC, info.file_size) for info in old.infolist()}
+        entries, changed = [], 0
+        for info in new.infolist():
+            entries.append({"name": info.filename, "crc": info.CRC, "size": info.file_size})
+            if old_entries.get(info.filename) != (info.CRC, info.file_size):
+                patch.writestr(_copy_info(info, f"files/{info.filename}"), new.read(info))
+                changed += 1
+        new_names = {entry["name"] for entry in entries}
+        manifest = {
+            "format": 1,
+            "from": from_build,
+            "to": to_build,
+            "changed": changed,
+            "removed": [name for name in old_entries if name not in new_names],
+            "entries": entries,
+        }
+        patch.writestr(MANIFEST, json.dumps(manifest, ensure_ascii=False))
+    os.replace(tmp_path, out_path)
+    return manifest
+
+
+def _discard(path: str):
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def apply_patch(old_path: str, patch_path: str, out_path: str) -> dict:
+    """이전 빌드에 패치를 적용해 새 빌드 생성 (항목 CRC/크기가 다르면 PatchError)"""
+    tmp_path = f"{out_path}.tmp"
+    try:
+        with zipfile.ZipFile(old_path) as old, zipfile.ZipFile(patch_path) as patch, \
+                zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as out:
+            manifest = json.loads(patch.read(MANIFEST))
+            patched = set(patch.namelist())
+            for entry in manifest["entries"]:
+                name = entry["name"]
+                source, source_name = (patch, f"files/{name}") if f"files/{name}" in patched else (old, name)
+                try:
+                    info = source.getinfo(source_name)
+                except KeyError:
+                    raise PatchError(f"이전 빌드에 없는 항목: {name}")
+                data = source.read(info)
+                if len(data) != entry["size"] or zlib.crc32(data) != entry["crc"]:
+                    raise PatchError(f"항목 검증 실패: {name}")
+                out.writestr(_copy_info(info, name), data)
+    except PatchError:
+        _discard(tmp_path)
+        raise
+    except (KeyError, ValueError, zipfile.BadZipFile) as e:
+        _discard(tmp_path)
+        raise PatchError(f"패치를 적용할 수 없습니다: {e}") from e
+    os.replace(tmp_path, out_path)
+    return manifest
+
+
+def publish_build(channel_dir: str, build: str, package_path: str, info: Optional[dict] = None,
+                  direct_patches: int = DIRECT_PATCHES) -> list[str]:
+    """
+    새 빌드 배포: builds/에 보관, 최근 빌드들 -> 새 빌드 패치 생성,
+    최신 패키지(naver-blog-automation-latest.zip)와 version_info.json 교체. 생성한 패치 경로 반환
+    """
+    builds_dir = os.path.join(channel_dir, BUILDS_DIR)
+    build_path = os.path.join(builds_dir, f"{build}.zip")
+    tmp_path = _atomic_output(build_path)
+    shutil.copyfile(package_path, tmp_path)
+    os.replace(tmp_path, build_path)
+
+    previous = sorted(
+        (name[:-4] for name in os.listdir(builds_dir) if name.endswith(".zip") and name[:-4] != build),
+        key=build_key,
+    )
+    patches = []
+    for from_build in previous[-direct_patches:] if direct_patches > 0 else []:
+        out_path = os.path.join(channel_dir, PATCHES_DIR, patch_name(from_build, build))
+        build_patch(os.path.join(builds_dir, f"{from_build}.zip"), build_path, out_path, from_build, build)
+        patches.append(out_path)
+
+    latest_path = os.path.join(channel_dir, PROGRAM_FILES[0])
+    tmp_path = _atomic_output(latest_path)
+    shutil.copyfile(build_path, tmp_path)
+    os.replace(tmp_path, latest_path)
+
+    info_path = os.path.join(channel_dir, VERSION_INFO_FILE)
+    version_info = {}
+    if os.path.exists(info_path):
+        with open(info_path, "r", encoding="utf-8") as f:
+            version_info = json.load(f)
+    version_info.update(info or {})
+    version_info["version"] = build
+    tmp_path = _atomic_output(info_path)
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(version_info, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, info_path)
+    return patches
+
+
+@dataclass(frozen=True)
+class UpdatePlan:
+    mode: str  # none | patch | full
+    current_build: str
+    latest_build: Optional[str]
+    patches: list[tuple[str, str, Artifact]] = field(default_factory=list)
+    full: Optional[Artifact] = None
+
+    @property
+    def patch_size(self) -> int:
+        return sum(artifact.size for _, _, artifact in self.patches)
+
+
+def find_update(release: Release, current_build: str) -> UpdatePlan:
+    """현재 빌드 -> 최신 빌드 최소 전송량 경로 (패치 크기 합 기준 최단 경로)"""
+    latest = release.latest_build
+    if latest is None or current_build == latest:
+        return UpdatePlan("none", current_build, latest)
+
+    graph: dict[str, list[tuple[str, Artifact]]] = {}
+    for (from_build, to_build), artifact in release.patches.items():
+        graph.setdefault(from_build, []).append((to_build, artifact))
+
+    # 다익스트라 (빌드 수가 적어 요청마다 계산해도 충분히 빠름)
+    best = {current_build: 0}
+    previous: dict[str, tuple[str, Artifact]] = {}
+    queue = [(0, current_build)]
+    while queue:
+        size, build = heapq.heappop(queue)
+        if build == latest:
+            break
+        if size > best.get(build, size):
+            continue
+        for to_build, artifact in graph.get(build, ()):
+            candidate = size + artifact.size
+            if candidate < best.get(to_build, candidate + 1):
+                best[to_build] = candidate
+                previous[to_build] = (build, artifact)
+                heapq.heappush(queue, (candidate, to_build))
+
+    full = release.default
+    if latest in previous and (full is None or best[latest] < full.size):
+        chain, build = [], latest
+        while build != current_build:
+            from_build, artifact = previous[build]
+            chain.append((from_build, build, artifact))
+            build = from_build
+        return UpdatePlan("patch", current_build, latest, list(reversed(chain)), full)
+    return UpdatePlan("full", current_build, latest, full=full)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="클라이언트 빌드 배포 및 패치 생성")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    publish = subparsers.add_parser("publish", help="새 빌드 등록 후 최근 빌드들에서 오는 패치 생성")
+    publish.add_argument("channel_dir", help="채널 폴더 (예: static/downloads, static/downloads/beta)")
+    publish.add_argument("build", help="빌드 번호 (예: 3.2.0)")
+    publish.add_argument("package", help="빌드 패키지 zip 경로")
+    publish.add_argument("--direct-patches", type=int, default=DIRECT_PATCHES)
+    args = parser.parse_args()
+
+    patches = publish_build(args.channel_dir, args.build, args.package, direct_patches=args.direct_patches)
+    full_size = os.path.getsize(args.package)
+    print(f"빌드 {args.build} 배포 완료 ({full_size:,} bytes)")
+    for path in patches:
+        print(f"  {os.path.basename(path)}: {os.path.getsize(path):,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Rate Limit 엔진
+
+- 백엔드(저장소)와 규칙(라우트별 예산)을 분리한 플러그형 구조
+- 메모리 백엔드: 키마다 고정 크기 카운터 2개(이전/현재 윈도우)만 유지하는 sliding window counter
+- 락은 키 해시로 샤딩하여 요청들이 하나의 전역 락에 직렬화되지 않도록 함
+- 일정 시간 요청이 없는 IP는 주기적으로 제거하여 메모리가 무한히 늘지 않도록 함
+- SQLite 백엔드: 같은 호스트의 여러 uvicorn 워커가 WAL 모드 테이블 하나로 카운터를 공유
+  (파일 I/O라 RateLimiter.ahit가 스레드풀에서 호출, 락 대기가 busy timeout을 넘으면 통과시킴)
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import NamedTuple, Optional, Sequence
+
+from starlette.concurrency import run_in_threadpool
+
+from .logger import logger
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """라우트 그룹별 요청 예산"""
+
+    name: str
+    limit: int
+    window: int = 60  # seconds
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int  # 초 단위, 허용된 경우 0
+
+
+class MemoryRateLimitBackend:
+    """프로세스 메모리 기반 sliding window counter 백엔드"""
+
+    blocking = False
+
+    def __init__(self, shards: int = 16):
+        self._shards = [_Shard() for _ in range(shards)]
+        self._shard_count = shards
+
+    def hit(self, key: str, rule: RateLimitRule, now: Optional[float] = None) -> RateLimitResult:
+        if now is None:
+            now = time.monotonic()
+        shard = self._shards[hash(key) % self._shard_count]
+        window = rule.window
+        with shard.lock:
+            if now - shard.last_sweep > window:
+                shard.sweep(now, window)
+
+            counters = shard.counters
+            counter = counters.get(key)
+            if counter is None:
+                counter = counters[key] = [now, 0, 0]
+            elif now - counter[0] >= window:
+                _roll(counter, now, window)
+
+            # 이전 윈도우 카운트를 경과 비율만큼 가중하여 최근 window초 요청 수 근사
+            estimated = counter[1] * (1.0 - (now - counter[0]) / window) + counter[2]
+            if estimated >= rule.limit:
+                retry_after = max(1, int(counter[0] + window - now))
+                return RateLimitResult(False, rule.limit, 0, retry_after)
+            counter[2] += 1
+        return RateLimitResult(True, rule.limit, max(0, rule.limit - int(estimated) - 1), 0)
+
+    def __len__(self) -> int:
+        return sum(len(shard.counters) for shard in self._shards)
+
+    def reset(self):
+        for shard in self._shards:
+            with shard.lock:
+                shard.counters.clear()
+
+
+class _Shard:
+    __slots__ = ("lock", "counters", "last_sweep")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> [window_start, previous_count, current_count]
+        self.counters: dict[str, list] = {}
+        self.last_sweep = 0.0
+
+    def sweep(self, now: float, window: int):
+        """두 윈도우 이상 요청이 없었던 키 제거 (카운터가 모두 0이 된 IP)"""
+        idle = [
+            key for key, counter in self.counters.items() if now - counter[0] >= 2 * window
+        ]
+        for key in idle:
+            del self.counters[key]
+        self.last_sweep = now
+
+
+def _roll(counter: list, now: float, window: int):
+    """현재 시각에 맞게 윈도우를 이동"""
+    elapsed_windows = int((now - counter[0]) // window)
+    if elapsed_windows == 1:
+        counter[0] += window
+        counter[1], counter[2] = counter[2], 0
+    elif elapsed_windows > 1:
+        counter[0] = now
+        counter[1] = counter[2] = 0
+
+
+class SQLiteRateLimitBackend:
+    """
+    SQLite(WAL) 파일을 공유 저장소로 쓰는 백엔드
+
+    워커 프로세스 수와 관계없이 예산이 하나로 유지되도록 카운터를 (키, 윈도우 번호) 행에 저장.
+    프로세스 간 시간 기준을 맞추기 위해 벽시계(time.time) 기준 정렬 윈도우를 사용하며,
+    읽기-판단-증가는 BEGIN IMMEDIATE 트랜잭션 안에서 원자적으로 수행.
+    다른 워커가 busy_timeout_ms 넘게 락을 잡고 있으면 요청을 막지 않고 허용 (fail open).
+    """
+
+    SWEEP_INTERVAL = 1000  # hit 호출 N회마다 오래된 윈도우 행 정리
+    blocking = True
+
+    def __init__(self, path: str, busy_timeout_ms: int = 50):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._hits = 0
+        self.failed_open = 0
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_counters ("
+                " key TEXT NOT NULL,"
+                " window_index INTEGER NOT NULL,"
+                " count INTEGER NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " PRIMARY KEY (key, window_index)"
+                ") WITHOUT ROWID"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+        conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def hit(self, key: str, rule: RateLimitRule, now: Optional[float] = None) -> RateLimitResult:
+        now = time.time() if now is None else now
+        window = rule.window
+        index = math.floor(now / window)
+        elapsed = now - index * window
+
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            # 저장소 락 대기로 모든 요청이 멈추지 않도록 제한 없이 통과
+            self.failed_open += 1
+            logger.warning(f"Rate limit 저장소 사용 불가, 요청 허용: {e}")
+            return RateLimitResult(True, rule.limit, rule.limit, 0)
+        try:
+            counts = dict(
+                conn.execute(
+                    "SELECT window_index, count FROM rate_limit_counters"
+                    " WHERE key = ? AND window_index IN (?, ?)",
+                    (key, index - 1, index),
+                ).fetchall()
+            )
+            estimated = counts.get(index - 1, 0) * (1.0 - elapsed / window) + counts.get(index, 0)
+            if estimated >= rule.limit:
+                conn.execute("COMMIT")
+                return RateLimitResult(False, rule.limit, 0, max(1, int(window - elapsed)))
+            # 다음 윈도우가 끝나면 추정에 쓰이지 않으므로 그 시점을 만료 시각으로 기록
+            conn.execute(
+                "INSERT INTO rate_limit_counters (key, window_index, count, expires_at)"
+                " VALUES (?, ?, 1, ?)"
+                " ON CONFLICT (key, window_index) DO UPDATE SET count = count + 1",
+                (key, index, (index + 2) * window),
+            )
+            self._hits += 1
+            if self._hits % self.SWEEP_INTERVAL == 0:
+                conn.execute("DELETE FROM rate_limit_counters WHERE expires_at <= ?", (now,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return RateLimitResult(True, rule.limit, max(0, rule.limit - int(estimated) - 1), 0)
+
+    def __len__(self) -> int:
+        return self._conn().execute(
+            "SELECT COUNT(DISTINCT key) FROM rate_limit_counters"
+        ).fetchone()[0]
+
+    def reset(self):
+        self._conn().execute("DELETE FROM rate_limit_counters")
+
+
+class RateLimiter:
+    """경로 prefix로 규칙을 고르고 (규칙, 클라이언트) 단위로 백엔드 카운터를 증가"""
+
+    def __init__(
+        self,
+        backend,
+        default_rule: RateLimitRule,
+        route_rules: Sequence[tuple[str, RateLimitRule]] = (),
+    ):
+        self.backend = backend
+        self.default_rule = default_rule
+        # 긴 prefix가 먼저 매칭되도록 정렬
+        self.route_rules = sorted(route_rules, key=lambda item: len(item[0]), reverse=True)
+
+    def rule_for(self, path: str) -> RateLimitRule:
+        for prefix, rule in self.route_rules:
+            if path.startswith(prefix):
+                return rule
+        return self.default_rule
+
+    def hit(self, client: str, path: str) -> RateLimitResult:
+        rule = self.rule_for(path)
+        return self.backend.hit(f"{rule.name}:{client}", rule)
+
+    async def ahit(self, client: str, path: str) -> RateLimitResult:
+        """비동기 미들웨어용 hit (블로킹 백엔드는 이벤트 루프를 막지 않도록 스레드풀에서 호출)"""
+        if self.backend.blocking:
+            return await run_in_threadpool(self.hit, client, path)
+        return self.hit(client, path)
+
+
+def build_rate_limiter(settings) -> RateLimiter:
+    """Settings 값으로 기본 RateLimiter 구성"""
+    default_rule = RateLimitRule("default", settings.RATE_LIMIT_PER_MINUTE)
+    validate_rule = RateLimitRule("validate", settings.RATE_LIMIT_VALIDATE_PER_MINUTE)
+    admin_rule = RateLimitRule("admin", settings.RATE_LIMIT_ADMIN_PER_MINUTE)
+    route_rules = [
+        ("/purchases/validate", validate_rule),
+        ("/api/admin", admin_rule),
+        ("/api/realtime", admin_rule),
+        ("/users/all", admin_rule),
+    ]
+    if settings.RATE_LIMIT_BACKEND == "sqlite":
+        backend = SQLiteRateLimitBackend(settings.RATE_LIMIT_STORE_PATH, settings.RATE_LIMIT_BUSY_TIMEOUT_MS)
+    else:
+        backend = MemoryRateLimitBackend()
+    return RateLimiter(backend, default_rule, route_rules)
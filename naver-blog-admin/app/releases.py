@@ -0,0 +1,236 @@
+"""
+릴리스 파일 레지스트리
+
+DOWNLOAD_DIR을 시작 시 한 번 스캔하고 RELEASE_POLL_SECONDS 주기로 수정 시각/크기만 비교해
+바뀐 파일만 다시 읽음 (해시도 바뀐 파일만 계산). 다운로드/다운로드 정보 API는 메모리에서만 응답
+
+디렉터리 구성
+- DOWNLOAD_DIR/            stable 채널 (기존 배치 그대로)
+- DOWNLOAD_DIR/<채널>/     beta 등 다른 채널 (stable/ 폴더가 있으면 최상위 대신 사용)
+각 채널 폴더
+- version_info.json                        버전/빌드 날짜/설명/요구 사항
+- naver-blog-automation-latest.zip         기본 패키지 (없으면 -unified.exe)
+- naver-blog-automation-v<버전>.zip|.exe   Purchase.version별 빌드 (예: -v2.3.zip)
+- builds/<빌드>.zip, patches/<이전>__<다음>.zip  배포 빌드 보관 / 패치 (patches.py)
+"""
+
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .config import get_settings
+from .downloads import Artifact, load_artifact
+from .logger import logger
+
+DEFAULT_CHANNEL = "stable"
+VERSION_INFO_FILE = "version_info.json"
+# 기본 패키지 후보 (앞에 있는 파일 우선)
+PROGRAM_FILES = (
+    "naver-blog-automation-latest.zip",  # 최신 패키지
+    "naver-blog-automation-unified.exe",  # 호환성용
+)
+# 채널 폴더 안의 빌드 보관/패치 폴더 (채널로 취급하지 않음)
+BUILDS_DIR = "builds"
+PATCHES_DIR = "patches"
+PATCH_SEPARATOR = "__"
+_BUILD_PATTERN = re.compile(r"^naver-blog-automation-v(?P<version>[\w.]+)\.(?:zip|exe)$")
+
+
+@dataclass(frozen=True)
+class Release:
+    channel: str
+    info: dict = field(default_factory=dict)
+    default: Optional[Artifact] = None
+    builds: dict[str, Artifact] = field(default_factory=dict)  # Purchase.version -> 빌드
+    history: dict[str, Artifact] = field(default_factory=dict)  # 빌드 번호 -> 보관된 빌드
+    patches: dict[tuple[str, str], Artifact] = field(default_factory=dict)  # (이전, 다음) -> 패치
+
+    def artifact(self, version: Optional[str] = None) -> Optional[Artifact]:
+        """구매 버전 전용 빌드, 없으면 기본 패키지"""
+        if version is not None and version in self.builds:
+            return self.builds[version]
+        return self.default
+
+    @property
+    def latest_build(self) -> Optional[str]:
+        return self.info.get("version")
+
+    @property
+    def program_info(self) -> dict:
+        return {
+            "latest_version": self.info.get("version", "1.0.0"),
+            "build_date": self.info.get("build_date"),
+            "description": self.info.get("description", "네이버 블로그 자동화 프로그램"),
+            "requirements": self.info.get("requirements", []),
+        }
+
+
+def _load_version_info(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            info = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"버전 정보 파일을 읽지 못했습니다: {path} ({e})")
+        return {}
+    return info if isinstance(info, dict) else {}
+
+
+class ReleaseRegistry:
+    def __init__(self, download_dir: str, poll_seconds: float = 5.0):
+        self.download_dir = download_dir
+        self.poll_seconds = poll_seconds
+        # 채널 -> Release (스캔마다 통째로 교체하므로 읽을 때 락 불필요)
+        self._releases: dict[str, Release] = {}
+        # 마지막 스캔 시 파일별 (크기, 수정 시각, inode)
+        self._signature: dict[str, tuple[int, int, int]] = {}
+        self._artifacts: dict[str, Artifact] = {}
+        self._loaded = False
+        self._scan_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.scans = 0
+        self.reloads = 0
+        self.hashes = 0
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self.scan()
+        if self.poll_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="release-registry", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.scan()
+            except Exception as e:
+                logger.error(f"릴리스 파일 스캔 실패: {e}")
+
+    def _channel_dirs(self, root: str) -> dict[str, str]:
+        # 최상위는 stable (stable/ 폴더가 있으면 아래에서 덮어씀)
+        channels = {DEFAULT_CHANNEL: root}
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir() and not entry.name.startswith(".") and entry.name not in (BUILDS_DIR, PATCHES_DIR):
+                    channels[entry.name] = entry.path
+        return channels
+
+    def _stat_files(self, channels: dict[str, str]) -> dict[str, os.stat_result]:
+        """채널 폴더의 관심 파일과 builds/, patches/의 zip stat (그 밖의 하위 폴더로는 들어가지 않음)"""
+        stats = {}
+        for directory in channels.values():
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name == VERSION_INFO_FILE or name in PROGRAM_FILES or _BUILD_PATTERN.match(name):
+                        if entry.is_file():
+                            stats[entry.path] = entry.stat()
+            for subdir in (BUILDS_DIR, PATCHES_DIR):
+                try:
+                    with os.scandir(os.path.join(directory, subdir)) as entries:
+                        for entry in entries:
+                            if entry.name.endswith(".zip") and entry.is_file():
+                                stats[entry.path] = entry.stat()
+                except FileNotFoundError:
+                    continue
+        return stats
+
+    def scan(self) -> bool:
+        """디렉터리를 다시 확인하고 바뀐 것이 있으면 메모리 목록 교체 (바뀌었으면 True)"""
+        with self._scan_lock:
+            self.scans += 1
+            root = os.path.abspath(self.download_dir)
+            try:
+                channels = self._channel_dirs(root)
+                stats = self._stat_files(channels)
+            except FileNotFoundError:
+                channels, stats = {}, {}
+            signature = {path: (st.st_size, st.st_mtime_ns, st.st_ino) for path, st in stats.items()}
+            if self._loaded and signature == self._signature:
+                return False
+
+            artifacts = {}
+            for path, stat_result in stats.items():
+                if os.path.basename(path) == VERSION_INFO_FILE:
+                    continue
+                previous = self._artifacts.get(path)
+                artifact = load_artifact(path, stat_result, previous)
+                if artifact is not previous:
+                    self.hashes += 1
+                artifacts[path] = artifact
+
+            releases = {}
+            for channel, directory in channels.items():
+                release = self._build_release(channel, directory, stats, artifacts)
+                if release.default is not None or release.builds or release.info or release.patches:
+                    releases[channel] = release
+
+            self._releases = releases
+            self._artifacts = artifacts
+            self._signature = signature
+            self._loaded = True
+            self.reloads += 1
+            logger.info(f"릴리스 목록 갱신: {', '.join(sorted(releases)) or '없음'} ({len(artifacts)}개 파일)")
+            return True
+
+    @staticmethod
+    def _build_release(channel: str, directory: str, stats: dict, artifacts: dict) -> Release:
+        info_path = os.path.join(directory, VERSION_INFO_FILE)
+        info = _load_version_info(info_path) if info_path in stats else {}
+        default = None
+        for name in PROGRAM_FILES:
+            default = artifacts.get(os.path.join(directory, name))
+            if default is not None:
+                break
+        builds, history, patches = {}, {}, {}
+        builds_dir = os.path.join(directory, BUILDS_DIR)
+        patches_dir = os.path.join(directory, PATCHES_DIR)
+        for path, artifact in artifacts.items():
+            parent, name = os.path.split(path)
+            if parent == directory:
+                match = _BUILD_PATTERN.match(name)
+                if match:
+                    builds[match.group("version")] = artifact
+            elif parent == builds_dir:
+                history[name[:-4]] = artifact
+            elif parent == patches_dir and PATCH_SEPARATOR in name:
+                from_build, to_build = name[:-4].split(PATCH_SEPARATOR, 1)
+                patches[(from_build, to_build)] = artifact
+        return Release(channel=channel, info=info, default=default, builds=builds, history=history, patches=patches)
+
+    def release(self, channel: str = DEFAULT_CHANNEL) -> Optional[Release]:
+        """채널의 릴리스 (아직 스캔 전이면 한 번 스캔)"""
+        if not self._loaded:
+            self.scan()
+        return self._releases.get(channel)
+
+    def channels(self) -> list[str]:
+        if not self._loaded:
+            self.scan()
+        return sorted(self._releases)
+
+    def stats(self) -> dict:
+        return {
+            "channels": sorted(self._releases),
+            "artifacts": len(self._artifacts),
+            "scans": self.scans,
+            "reloads": self.reloads,
+            "hashes": self.hashes,
+            "poll_seconds": self.poll_seconds,
+        }
+
+
+release_registry = ReleaseRegistry(get_settings().DOWNLOAD_DIR, poll_seconds=get_settings().RELEASE_POLL_SECONDS)
@@ -0,0 +1,160 @@
+"""
+라이선스 취소 목록
+
+- 취소 내역은 license_revocations 테이블에 추가만 함 (id = 목록 버전)
+- 클라이언트에는 주문번호/인증키 다이제스트를 담은 블룸 필터를 ETag와 함께 배포
+- 클라이언트는 since=버전으로 이후 추가분만 받아 로컬에서 확인하고,
+  필터에 걸린 경우에만 /purchases/validate로 서버 검증 (오탐 확인)
+"""
+
+import base64
+import hashlib
+import json
+import math
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from . import models
+from .license_validation import license_digest
+
+# 오탐률 0.1% 기준 (항목당 약 14.4비트)
+FALSE_POSITIVE_RATE = 0.001
+MIN_CAPACITY = 64
+# since 이후 추가분이 이보다 많으면 전체 필터를 내려줌
+MAX_DELTA_ENTRIES = 500
+
+
+def revocation_tokens(order_id: Optional[str] = None, digest: Optional[str] = None) -> list[str]:
+    """블룸 필터에 넣는 항목 (클라이언트도 같은 형식으로 확인)"""
+    tokens = []
+    if order_id:
+        tokens.append(f"order:{order_id}")
+    if digest:
+        tokens.append(f"digest:{digest}")
+    return tokens
+
+
+class BloomFilter:
+    """sha256 기반 double hashing 블룸 필터 (client_license_system과 같은 해시 규칙)"""
+
+    def __init__(self, bits: int, hashes: int, data: Optional[bytes] = None):
+        self.bits = bits
+        self.hashes = hashes
+        self.data = bytearray(data) if data is not None else bytearray((bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float = FALSE_POSITIVE_RATE) -> "BloomFilter":
+        capacity = max(capacity, MIN_CAPACITY)
+        bits = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        return cls(bits, hashes)
+
+    def _positions(self, item: str):
+        digest = hashlib.sha256(item.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.data[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.data[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+@dataclass(frozen=True)
+class RevocationSnapshot:
+    version: int
+    count: int
+    body: bytes  # 전체 필터 응답 JSON
+
+    @property
+    def etag(self) -> str:
+        return f'"rev-{self.version}"'
+
+
+def _row_tokens(rows: Iterable) -> list[str]:
+    tokens = []
+    for order_id, digest in rows:
+        tokens.extend(revocation_tokens(order_id, digest))
+    return tokens
+
+
+class RevocationList:
+    """최신 버전이 바뀔 때만 블룸 필터를 다시 만드는 취소 목록"""
+
+    def __init__(self):
+        self._snapshot = RevocationSnapshot(0, 0, self._build_body(0, []))
+
+    @staticmethod
+    def _build_body(version: int, tokens: list[str]) -> bytes:
+        bloom = BloomFilter.for_capacity(len(tokens))
+        for token in tokens:
+            bloom.add(token)
+        return json.dumps({
+            "version": version,
+            "full": True,
+            "count": len(tokens),
+            "bits": bloom.bits,
+            "hashes": bloom.hashes,
+            "filter": base64.b64encode(bytes(bloom.data)).decode(),
+        }).encode()
+
+    async def snapshot(self, db: AsyncSession) -> RevocationSnapshot:
+        version = (await db.execute(select(func.max(models.LicenseRevocation.id)))).scalar() or 0
+        if version != self._snapshot.version:
+            rows = (await db.execute(
+                select(models.LicenseRevocation.order_id, models.LicenseRevocation.license_digest)
+                .where(models.LicenseRevocation.id <= version)
+            )).all()
+            tokens = _row_tokens(rows)
+            self._snapshot = RevocationSnapshot(version, len(tokens), self._build_body(version, tokens))
+        return self._snapshot
+
+    async def delta(self, db: AsyncSession, since: int, snapshot: RevocationSnapshot) -> Optional[bytes]:
+        """since 이후 추가된 항목 (너무 많거나 버전이 맞지 않으면 None → 전체 필터)"""
+        if since < 0 or since > snapshot.version:
+            return None
+        rows = (await db.execute(
+            select(models.LicenseRevocation.order_id, models.LicenseRevocation.license_digest)
+            .where(
+                models.LicenseRevocation.id > since,
+                models.LicenseRevocation.id <= snapshot.version,
+            )
+            .limit(MAX_DELTA_ENTRIES + 1)
+        )).all()
+        if len(rows) > MAX_DELTA_ENTRIES:
+            return None
+        return json.dumps({
+            "version": snapshot.version,
+            "full": False,
+            "since": since,
+            "added": _row_tokens(rows),
+        }).encode()
+
+
+revocation_list = RevocationList()
+
+
+def revoke_order(db: Session, order_id: str, reason: Optional[str] = None) -> models.LicenseRevocation:
+    """주문의 라이선스 취소 (발급된 최종 인증키 다이제스트도 함께 기록)"""
+    purchase = db.query(models.Purchase).filter(models.Purchase.order_id == order_id).first()
+    if purchase is None:
+        raise ValueError(f"구매 정보를 찾을 수 없습니다: {order_id}")
+    revocation = models.LicenseRevocation(
+        order_id=order_id,
+        license_digest=license_digest(purchase.final_license).hex() if purchase.final_license else None,
+        reason=reason,
+    )
+    db.add(revocation)
+    # 상태 변경 이벤트로 이 프로세스의 검증 캐시에도 바로 반영됨
+    purchase.status = "revoked"
+    db.commit()
+    db.refresh(revocation)
+    return revocation
+
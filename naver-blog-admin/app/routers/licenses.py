@@ -2,17 +2,31 @@ from datetime import datetime, timedelta
 from typing import List
 import secrets
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Body
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
 from ..database import get_db
 from ..exception_handlers import CustomAPIException
+from ..identity_cache import UserSnapshot
+from ..pagination import Filter, KeysetPaginator, PageRequest
+from ..websocket_manager import manager
 from .users import get_current_user
 from pydantic import BaseModel, Field
 
 router = APIRouter(prefix="/licenses", tags=["licenses"])
 
+license_pages = KeysetPaginator(
+    models.License,
+    keys=(models.License.id,),
+    filters={
+        "user_id": Filter(models.License.user_id, int),
+        "status": Filter(models.License.status),
+        "plan": Filter(models.License.plan),
+    },
+    schema=schemas.LicenseOut,
+)
+
 
 def verify_license_key(token: str, version: str, hardware_id: str) -> str | None:
     """
@@ -50,16 +64,22 @@ def create_license(license: schemas.LicenseCreate, db: Session = Depends(get_db)
     return new_license
 
 
-@router.get("/", response_model=list[schemas.LicenseOut])
-def read_licenses(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return db.query(models.License).offset(skip).limit(limit).all()
+@router.get("/", response_model=schemas.PaginatedLicenses)
+def read_licenses(
+    page: PageRequest = Depends(license_pages.request),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user),
+):
+    """라이선스 목록 (관리자는 전체, 일반 사용자는 본인 것만)"""
+    scope = () if current_user.is_admin else (models.License.user_id == current_user.id,)
+    return license_pages.page(db, page, *scope)
 
 
 @router.get("/{license_id}", response_model=schemas.LicenseOut)
 def read_license(
     license_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
 ):
     license = db.query(models.License).filter(models.License.id == license_id).first()
     if license is None:
@@ -78,8 +98,9 @@ def read_license(
 @router.delete("/{license_id}")
 def delete_license(
     license_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
 ):
     license = db.query(models.License).filter(models.License.id == license_id).first()
     if license is None:
@@ -92,8 +113,15 @@ def delete_license(
         raise CustomAPIException(
             status_code=403, detail="권한이 없습니다.", code="forbidden"
         )
+    user_id = license.user_id
     db.delete(license)
     db.commit()
+    if user_id is not None:
+        background_tasks.add_task(manager.send_to_user, user_id, {
+            "type": "license_deleted",
+            "license_id": license_id,
+            "timestamp": datetime.now().isoformat(),
+        })
     return {"success": True}
 
 
@@ -101,8 +129,9 @@ def delete_license(
 def update_license(
     license_id: int,
     update: schemas.LicenseUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
 ):
     license = db.query(models.License).filter(models.License.id == license_id).first()
     if license is None:
@@ -122,6 +151,15 @@ def update_license(
         license.expire_at = update.expire_at
     db.commit()
     db.refresh(license)
+    # 접속 중인 소유자에게 상태/만료일 변경 알림 (응답 후 발송 큐에 넣음)
+    if license.user_id is not None:
+        background_tasks.add_task(manager.send_to_user, license.user_id, {
+            "type": "license_updated",
+            "license_id": license.id,
+            "status": license.status,
+            "expire_at": license.expire_at.isoformat() if license.expire_at else None,
+            "timestamp": datetime.now().isoformat(),
+        })
     return license
 
 
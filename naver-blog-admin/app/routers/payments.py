@@ -5,10 +5,23 @@ from ..database import get_db
 from ..exception_handlers import CustomAPIException
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from ..identity_cache import UserSnapshot
+from ..pagination import Filter, KeysetPaginator, PageRequest
 from .users import get_current_user
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
+payment_pages = KeysetPaginator(
+    models.Payment,
+    keys=(models.Payment.id,),
+    filters={
+        "user_id": Filter(models.Payment.user_id, int),
+        "status": Filter(models.Payment.status),
+        "method": Filter(models.Payment.method),
+    },
+    schema=schemas.PaymentOut,
+)
+
 
 @router.post("/", response_model=schemas.PaymentOut)
 def create_payment(payment: schemas.PaymentCreate, db: Session = Depends(get_db)):
@@ -26,16 +39,22 @@ def create_payment(payment: schemas.PaymentCreate, db: Session = Depends(get_db)
     return new_payment
 
 
-@router.get("/", response_model=list[schemas.PaymentOut])
-def read_payments(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return db.query(models.Payment).offset(skip).limit(limit).all()
+@router.get("/", response_model=schemas.PaginatedPayments)
+def read_payments(
+    page: PageRequest = Depends(payment_pages.request),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user),
+):
+    """결제 목록 (관리자는 전체, 일반 사용자는 본인 것만)"""
+    scope = () if current_user.is_admin else (models.Payment.user_id == current_user.id,)
+    return payment_pages.page(db, page, *scope)
 
 
 @router.get("/{payment_id}", response_model=schemas.PaymentOut)
 def read_payment(
     payment_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
 ):
     payment = db.query(models.Payment).filter(models.Payment.id == payment_id).first()
     if payment is None:
@@ -55,7 +74,7 @@ def read_payment(
 def delete_payment(
     payment_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
 ):
     payment = db.query(models.Payment).filter(models.Payment.id == payment_id).first()
     if payment is None:
@@ -1,25 +1,51 @@
-import jwt
-import secrets
-from datetime import datetime, timedelta
+import asyncio
+import json
+from datetime import datetime
 from typing import List, Optional
 import hashlib
-import base64
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Header, HTTPException, Request, Response, status
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import StreamingResponse
 import os
 
 from .. import models, schemas
-from ..database import get_db
+from ..database import get_async_db, get_db
 from .users import get_current_user
-from ..email_service import send_purchase_confirmation_email
+from ..email_service import enqueue_purchase_confirmation_email
 from ..config import get_settings
+from ..download_events import download_event_log, download_summary, purchase_download_stats
+from ..downloads import ArtifactResponse, DownloadPlan, plan_download
+from ..license_validation import REVOKED_STATUSES, license_signer, license_validator, sync_revocations
+from ..pagination import Filter, KeysetPaginator, PageRequest
+from ..patches import find_update
+from ..releases import DEFAULT_CHANNEL, Release, release_registry
+from ..revocation import revocation_list, revoke_order
+from ..websocket_manager import manager
 
 router = APIRouter(prefix="/purchases", tags=["purchases"])
 
-# JWT Secret (실제 환경에서는 환경변수로 관리)
-SECRET_KEY = "your-secret-key-here"
+# 관리자 구매 목록: 필터마다 (필터, created_at, id) 복합 인덱스가 있음
+purchase_pages = KeysetPaginator(
+    models.Purchase,
+    keys=(models.Purchase.created_at, models.Purchase.id),
+    filters={
+        "status": Filter(models.Purchase.status),
+        "version": Filter(models.Purchase.version),
+        "customer_email": Filter(models.Purchase.customer_email),
+        "created_from": Filter(models.Purchase.created_at, datetime, "gte"),
+        "created_to": Filter(models.Purchase.created_at, datetime, "lt"),
+    },
+    schema=schemas.PurchaseOut,
+)
+
+# 일괄 검증 최대 항목 수 / 이보다 많으면 이 단위로 나눠 검증하며 결과를 스트리밍
+BATCH_VALIDATE_MAX_ITEMS = 1000
+BATCH_VALIDATE_CHUNK = 200
+
 
 def generate_temporary_license(purchase_data: dict) -> str:
     """임시 라이선스 생성 - 짧은 형태로 개선"""
@@ -49,7 +75,8 @@ def generate_final_license(purchase_data: dict) -> str:
         "activated_at": datetime.utcnow().isoformat()
     }
     
-    return jwt.encode(final_license_data, SECRET_KEY, algorithm="HS256")
+    # LICENSE_SIGNING_ALGORITHM에 따라 HS256 또는 공개키(EdDSA/ES256) 서명
+    return license_signer.sign(final_license_data)
 
 @router.post("/", response_model=schemas.PurchaseOut)
 def create_purchase(
@@ -86,10 +113,8 @@ def create_purchase(
     )
     
     db.add(db_purchase)
-    db.commit()
-    db.refresh(db_purchase)
-    
-    # 이메일 발송 (비동기로 처리하여 API 응답 지연 방지)
+
+    # 이메일은 발송 큐에 적재만 하고 백그라운드 워커가 발송 (구매 응답 지연 방지)
     email_data = {
         "order_id": purchase.order_id,
         "customer_name": purchase.customer_name,
@@ -101,42 +126,82 @@ def create_purchase(
         "temporary_license": temp_license,
         "expire_date": purchase.expire_date.isoformat()
     }
-    
-    try:
-        send_purchase_confirmation_email(email_data)
-    except Exception as e:
-        # 이메일 발송 실패해도 구매는 정상 처리
-        print(f"이메일 발송 실패: {e}")
+    enqueue_purchase_confirmation_email(db, email_data)
+
+    db.commit()
+    db.refresh(db_purchase)
     
     return db_purchase
 
+ACTIVATION_SUCCESS_MESSAGE = "라이선스가 성공적으로 활성화되었습니다"
+
+async def _replay_activation(
+    db: AsyncSession, idempotency_key: str, request: schemas.ActivationRequest
+) -> Optional[schemas.ActivationResponse]:
+    """같은 Idempotency-Key로 이미 처리된 활성화가 있으면 그때 발급한 결과 반환"""
+    record = (await db.execute(
+        select(models.ActivationIdempotencyKey)
+        .where(models.ActivationIdempotencyKey.idempotency_key == idempotency_key)
+    )).scalars().first()
+    if record is None:
+        return None
+    if record.temporary_license != request.temporary_license or record.hardware_id != request.hardware_id:
+        raise HTTPException(422, "다른 활성화 요청에 사용된 Idempotency-Key입니다")
+    return schemas.ActivationResponse(
+        success=True,
+        license_key=record.final_license,
+        message=ACTIVATION_SUCCESS_MESSAGE,
+        expire_date=record.expire_date
+    )
+
+async def _activation_conflict(
+    db: AsyncSession, idempotency_key: Optional[str], request: schemas.ActivationRequest
+) -> schemas.ActivationResponse:
+    """다른 요청이 먼저 활성화한 경우 (같은 키의 재시도였다면 그 요청의 결과 반환)"""
+    await db.rollback()
+    if idempotency_key:
+        replay = await _replay_activation(db, idempotency_key, request)
+        if replay:
+            return replay
+    raise HTTPException(400, "이미 활성화된 라이선스입니다")
+
 @router.post("/activate", response_model=schemas.ActivationResponse)
-def activate_license(
+async def activate_license(
     request: schemas.ActivationRequest,
-    db: Session = Depends(get_db)
+    idempotency_key: Optional[str] = Header(None, max_length=128),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """임시 라이선스를 최종 인증키로 활성화"""
+    """
+    임시 라이선스를 최종 인증키로 활성화
+
+    pending 상태일 때만 바꾸는 조건부 UPDATE로 처리해 동시에 여러 요청이 와도 한 번만 활성화됨.
+    Idempotency-Key 헤더를 보내면 같은 키로 재시도할 때 처음 발급한 최종 인증키를 그대로 반환.
+    """
     
     try:
+        if idempotency_key:
+            replay = await _replay_activation(db, idempotency_key, request)
+            if replay:
+                return replay
+
         # 새로운 짧은 형태의 임시 라이선스 파싱 (예: V34-A3P4-A1B2C3D4)
         temp_license = request.temporary_license
         
         # 임시 라이선스가 데이터베이스에 있는지 직접 확인
-        purchase = db.query(models.Purchase).filter(
-            models.Purchase.temporary_license == temp_license
-        ).first()
+        purchase = (await db.execute(
+            select(models.Purchase).where(models.Purchase.temporary_license == temp_license)
+        )).scalars().first()
         
         if not purchase:
             raise HTTPException(404, "유효하지 않은 임시 라이선스입니다")
+
+        if purchase.status in REVOKED_STATUSES:
+            raise HTTPException(403, "취소되었거나 만료된 라이선스입니다")
             
         if purchase.status == "activated":
-            raise HTTPException(400, "이미 활성화된 라이선스입니다")
-        
-        # 하드웨어 ID 저장 및 최종 인증키 생성
-        purchase.hardware_id = request.hardware_id
-        purchase.activation_date = datetime.utcnow()
-        purchase.status = "activated"
+            return await _activation_conflict(db, idempotency_key, request)
         
+        # 최종 인증키 생성
         final_license = generate_final_license({
             "order_id": purchase.order_id,
             "hardware_id": request.hardware_id,
@@ -145,35 +210,127 @@ def activate_license(
             "post_count": purchase.post_count,
             "expire_date": purchase.expire_date
         })
-        
-        purchase.final_license = final_license
-        db.commit()
-        
-        return schemas.ActivationResponse(
-            success=True,
-            license_key=final_license,
-            message="라이선스가 성공적으로 활성화되었습니다",
-            expire_date=purchase.expire_date
+        expire_date = purchase.expire_date
+
+        # 하드웨어 ID와 최종 인증키 저장 (다른 요청이 먼저 활성화했으면 0건)
+        result = await db.execute(
+            update(models.Purchase)
+            .where(models.Purchase.id == purchase.id, models.Purchase.status == "pending")
+            .values(
+                hardware_id=request.hardware_id,
+                activation_date=datetime.utcnow(),
+                status="activated",
+                final_license=final_license,
+            )
+            .execution_options(synchronize_session=False)
         )
+        if result.rowcount == 1:
+            if idempotency_key:
+                db.add(models.ActivationIdempotencyKey(
+                    idempotency_key=idempotency_key,
+                    temporary_license=temp_license,
+                    hardware_id=request.hardware_id,
+                    final_license=final_license,
+                    expire_date=expire_date,
+                ))
+            try:
+                await db.commit()
+                return schemas.ActivationResponse(
+                    success=True,
+                    license_key=final_license,
+                    message=ACTIVATION_SUCCESS_MESSAGE,
+                    expire_date=expire_date
+                )
+            except IntegrityError:
+                # 같은 키로 동시에 들어온 재시도 요청이 먼저 커밋함
+                pass
+
+        return await _activation_conflict(db, idempotency_key, request)
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(500, f"활성화 중 오류가 발생했습니다: {str(e)}")
 
-@router.get("/", response_model=List[schemas.PurchaseOut])
+@router.get("/", response_model=schemas.PaginatedPurchases)
 def get_purchases(
-    skip: int = 0,
-    limit: int = 100,
+    page: PageRequest = Depends(purchase_pages.request),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """구매 목록 조회 (관리자 전용)"""
+    """
+    구매 목록 조회 (관리자 전용, 최신순)
+    OFFSET 대신 (created_at, id) 키셋 커서로 이어서 조회하므로 뒤 페이지도 첫 페이지와 같은 비용
+    """
     if not current_user.is_admin:
         raise HTTPException(403, "관리자 권한이 필요합니다")
-    
-    purchases = db.query(models.Purchase).offset(skip).limit(limit).all()
-    return purchases
+    return purchase_pages.page(db, page)
+
+@router.get("/revocations")
+async def get_revocations(
+    since: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """라이선스 취소 목록 (블룸 필터, since 지정 시 이후 추가분만 / ETag가 같으면 304)"""
+    snapshot = await revocation_list.snapshot(db)
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if if_none_match and snapshot.etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    body = None
+    if since is not None:
+        body = await revocation_list.delta(db, since, snapshot)
+    return Response(content=body or snapshot.body, media_type="application/json", headers=headers)
+
+@router.get("/license-public-key")
+def get_license_public_key(response: Response):
+    """최종 인증키 검증용 공개키 (소비자 프로그램 빌드 시 포함할 키 확인용 - 클라이언트는 이 응답으로 키를 바꾸지 않음)"""
+    info = license_signer.public_key_info()
+    if info is None:
+        raise HTTPException(404, "공개키 서명을 사용하지 않습니다")
+    response.headers["Cache-Control"] = "public, max-age=86400"
+    return info
+
+@router.post("/order/{order_id}/revoke")
+def revoke_license(
+    order_id: str,
+    background_tasks: BackgroundTasks,
+    reason: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """주문의 라이선스 취소 (관리자 전용, 접속 중인 구매자에게 license_revoked 알림)"""
+    if not current_user.is_admin:
+        raise HTTPException(403, "관리자 권한이 필요합니다")
+    try:
+        revocation = revoke_order(db, order_id, reason)
+    except ValueError:
+        raise HTTPException(404, "구매 정보를 찾을 수 없습니다")
+    user_id = (
+        db.query(models.User.id)
+        .join(models.Purchase, models.Purchase.customer_email == models.User.email)
+        .filter(models.Purchase.order_id == order_id)
+        .scalar()
+    )
+    if user_id is not None:
+        background_tasks.add_task(manager.send_to_user, user_id, {
+            "type": "license_revoked",
+            "order_id": order_id,
+            "reason": reason,
+            "timestamp": datetime.now().isoformat(),
+        })
+    return {"order_id": order_id, "version": revocation.id, "revoked_at": revocation.created_at}
+
+@router.get("/download-stats")
+def get_download_stats(days: int = 30, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+    """전체 다운로드 수와 최근 days일 일별 다운로드/이어받기/패치 건수 (관리자 전용)"""
+    if not current_user.is_admin:
+        raise HTTPException(403, "관리자 권한이 필요합니다")
+    if not 1 <= days <= 366:
+        raise HTTPException(400, "days는 1~366 사이여야 합니다")
+    return {**download_summary(db, days), "event_log": download_event_log.stats()}
+
 
 @router.get("/{purchase_id}", response_model=schemas.PurchaseOut)
 def get_purchase(
@@ -204,88 +361,175 @@ def get_purchase_by_order_id(
     return purchase
 
 @router.post("/validate", response_model=dict)
-def validate_license(
+async def validate_license(
     license_key: str,
     hardware_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """라이선스 검증 (소비자 프로그램에서 호출)"""
-    try:
-        # 라이선스 디코드
-        license_data = jwt.decode(license_key, SECRET_KEY, algorithms=["HS256"])
-        
-        # 하드웨어 ID 검증
-        if license_data.get("hardware_id") != hardware_id:
-            return {"valid": False, "reason": "하드웨어 ID가 일치하지 않습니다"}
-        
-        # 만료일 검증
-        expire_date = datetime.fromisoformat(license_data["expire_date"])
-        if datetime.utcnow() > expire_date:
-            return {"valid": False, "reason": "라이선스가 만료되었습니다"}
-        
-        return {
-            "valid": True,
-            "version": license_data["version"],
-            "account_count": license_data["account_count"],
-            "post_count": license_data["post_count"],
-            "expire_date": license_data["expire_date"]
-        }
-        
-    except jwt.InvalidTokenError:
-        return {"valid": False, "reason": "유효하지 않은 라이선스입니다"}
-    except Exception as e:
-        return {"valid": False, "reason": f"검증 중 오류: {str(e)}"}
+    """라이선스 검증 (소비자 프로그램에서 호출, 반복 검증은 검증 캐시에서 응답)"""
+    await sync_revocations(db)
+    return license_validator.validate(license_key, hardware_id)
+
+@router.post("/validate/batch", response_model=List[dict])
+async def validate_license_batch(
+    items: List[schemas.LicenseValidationItem] = Body(..., max_length=BATCH_VALIDATE_MAX_ITEMS),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """라이선스 일괄 검증 (여러 대를 운영하는 고객용, 요청 순서대로 결과 반환)"""
+    await sync_revocations(db)
+    pairs = [(item.license_key, item.hardware_id) for item in items]
+    if len(pairs) <= BATCH_VALIDATE_CHUNK:
+        return license_validator.validate_many(pairs)
+    return StreamingResponse(_stream_verdicts(pairs), media_type="application/json")
+
+async def _stream_verdicts(pairs: list):
+    """큰 배치는 청크 단위로 검증하며 JSON 배열을 이어서 전송"""
+    yield b"["
+    for start in range(0, len(pairs), BATCH_VALIDATE_CHUNK):
+        verdicts = license_validator.validate_many(pairs[start:start + BATCH_VALIDATE_CHUNK])
+        body = ",".join(json.dumps(verdict, ensure_ascii=False) for verdict in verdicts)
+        yield (body if start == 0 else "," + body).encode()
+        # 청크 사이에 다른 요청이 처리될 수 있도록 이벤트 루프에 양보
+        await asyncio.sleep(0)
+    yield b"]"
+
+@router.get("/validate/stats")
+def get_validation_stats(current_user = Depends(get_current_user)):
+    """라이선스 검증 캐시 통계 (관리자 전용)"""
+    if not current_user.is_admin:
+        raise HTTPException(403, "관리자 권한이 필요합니다")
+    return license_validator.stats()
+
+def _downloadable(temporary_license: str) -> tuple:
+    """다운로드/업데이트를 받을 수 있는 구매 조건"""
+    return (
+        models.Purchase.temporary_license == temporary_license,
+        or_(models.Purchase.status.is_(None), models.Purchase.status != "expired"),
+    )
+
+
+def _record_download(purchase_id: int, plan: DownloadPlan, kind: str, channel: str):
+    if plan.status_code not in (200, 206):
+        return
+    download_event_log.record(purchase_id, kind if plan.start == 0 else "resume", channel, plan.length)
+
 
 @router.get("/download/{temporary_license}")
-def download_program(temporary_license: str, db: Session = Depends(get_db)):
-    """임시 라이선스로 프로그램 다운로드"""
+def download_program(
+    temporary_license: str,
+    request: Request,
+    channel: str = DEFAULT_CHANNEL,
+    db: Session = Depends(get_db),
+):
+    """임시 라이선스로 프로그램 다운로드 (ETag/Range 지원, 끊긴 다운로드는 남은 바이트만 이어받기)"""
     try:
-        # 새로운 짧은 형태의 임시 라이선스로 구매 정보 확인
-        purchase = db.query(models.Purchase).filter(
-            models.Purchase.temporary_license == temporary_license
+        # 파일 메타데이터(크기/ETag)는 릴리스 레지스트리 메모리에서 조회
+        release = release_registry.release(channel)
+        if release is None:
+            raise HTTPException(404, "프로그램 파일을 찾을 수 없습니다")
+        # 다운로드 경로는 조회 한 번뿐이라 동기 Session (SQLite에서는 aiosqlite보다 지연 시간이 짧음)
+        purchase = db.execute(
+            select(models.Purchase.id, models.Purchase.version, models.Purchase.order_id)
+            .where(*_downloadable(temporary_license))
         ).first()
+        # 파일 전송 동안 커넥션을 잡고 있지 않도록 먼저 반납
+        db.close()
         
-        if not purchase or purchase.status == "expired":
+        if not purchase:
             raise HTTPException(404, "유효하지 않은 다운로드 링크입니다")
-        
-        # 다운로드 파일 선택 (최신 패키지 우선)
-        download_files = [
-            "static/downloads/naver-blog-automation-latest.zip",  # 최신 패키지
-            "static/downloads/naver-blog-automation-unified.exe"  # 호환성용
-        ]
-        
-        program_file = None
-        for file_path in download_files:
-            if os.path.exists(file_path):
-                program_file = file_path
-                break
-        
-        if not program_file:
+        artifact = release.artifact(purchase.version)
+        if artifact is None:
             raise HTTPException(404, "프로그램 파일을 찾을 수 없습니다")
-        
-        # 다운로드 통계 업데이트
-        purchase.download_count = (purchase.download_count or 0) + 1
-        purchase.last_download_date = datetime.utcnow()
-        db.commit()
+        plan = plan_download(artifact, request.headers)
+
+        # 다운로드 통계는 이벤트 로그 버퍼에만 추가 (DB 기록/카운터 반영은 백그라운드, download_events.py)
+        # 처음부터 받는 요청만 다운로드 1회로 집계 (이어받기는 resume, 304/416은 기록 안 함)
+        _record_download(purchase.id, plan, "full", channel)
         
         # 파일 확장자에 따른 적절한 파일명 생성
-        file_ext = os.path.splitext(program_file)[1]
+        file_ext = os.path.splitext(artifact.path)[1]
         filename = f"네이버블로그자동화_v{purchase.version}_{purchase.order_id}{file_ext}"
         
-        return FileResponse(
-            path=program_file,
-            filename=filename,
-            media_type="application/zip" if file_ext == ".zip" else "application/octet-stream"
-        )
+        return ArtifactResponse(artifact, plan, filename)
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(500, f"다운로드 중 오류가 발생했습니다: {str(e)}")
 
+@router.get("/update/{temporary_license}")
+def check_update(
+    temporary_license: str,
+    current_build: str,
+    channel: str = DEFAULT_CHANNEL,
+    db: Session = Depends(get_db),
+):
+    """
+    클라이언트 업데이트 확인: 현재 빌드에서 최신 빌드까지 전송량이 가장 작은 패치 목록
+    (패치가 없거나 합계가 전체 파일보다 크면 mode=full, 이미 최신이면 mode=none)
+    """
+    purchase = db.execute(
+        select(models.Purchase.order_id).where(*_downloadable(temporary_license))
+    ).first()
+    db.close()
+    if not purchase:
+        raise HTTPException(404, "유효하지 않은 다운로드 링크입니다")
+    release = release_registry.release(channel)
+    if release is None or release.latest_build is None:
+        raise HTTPException(404, "릴리스 정보를 찾을 수 없습니다")
+
+    plan = find_update(release, current_build)
+    base_url = f"{get_settings().BASE_URL}/purchases"
+    query = f"?channel={channel}" if channel != DEFAULT_CHANNEL else ""
+    return {
+        "mode": plan.mode,
+        "current_build": plan.current_build,
+        "latest_build": plan.latest_build,
+        "patches": [
+            {
+                "from": from_build,
+                "to": to_build,
+                "size": artifact.size,
+                "sha256": artifact.sha256,
+                "url": f"{base_url}/update/{temporary_license}/patch/{from_build}/{to_build}{query}",
+            }
+            for from_build, to_build, artifact in plan.patches
+        ],
+        "patch_size": plan.patch_size,
+        "full_size": plan.full.size if plan.full else None,
+        "full_sha256": plan.full.sha256 if plan.full else None,
+        "full_url": f"{base_url}/download/{temporary_license}{query}",
+    }
+
+
+@router.get("/update/{temporary_license}/patch/{from_build}/{to_build}")
+def download_patch(
+    temporary_license: str,
+    from_build: str,
+    to_build: str,
+    request: Request,
+    channel: str = DEFAULT_CHANNEL,
+    db: Session = Depends(get_db),
+):
+    """패치 파일 다운로드 (ETag/Range 지원)"""
+    purchase = db.execute(
+        select(models.Purchase.id).where(*_downloadable(temporary_license))
+    ).first()
+    db.close()
+    if not purchase:
+        raise HTTPException(404, "유효하지 않은 다운로드 링크입니다")
+    release = release_registry.release(channel)
+    artifact = release.patches.get((from_build, to_build)) if release else None
+    if artifact is None:
+        raise HTTPException(404, "패치 파일을 찾을 수 없습니다")
+    plan = plan_download(artifact, request.headers)
+    _record_download(purchase.id, plan, "patch", channel)
+    return ArtifactResponse(artifact, plan, f"patch_{from_build}_{to_build}.zip")
+
+
 @router.get("/download-info/{order_id}")
-def get_download_info(order_id: str, db: Session = Depends(get_db)):
-    """구매자의 다운로드 정보 조회"""
+def get_download_info(order_id: str, channel: str = DEFAULT_CHANNEL, db: Session = Depends(get_db)):
+    """구매자의 다운로드 정보 조회 (버전 정보/파일 크기/체크섬은 릴리스 레지스트리 메모리에서)"""
     purchase = db.query(models.Purchase).filter(
         models.Purchase.order_id == order_id
     ).first()
@@ -294,29 +538,29 @@ def get_download_info(order_id: str, db: Session = Depends(get_db)):
         raise HTTPException(404, "구매 정보를 찾을 수 없습니다")
     
     settings = get_settings()
+    download_count, last_download_date = purchase_download_stats(db, purchase)
     download_url = f"{settings.BASE_URL}/purchases/download/{purchase.temporary_license}"
-    
-    # 버전 정보 파일 읽기
-    version_info = {}
-    version_file_path = "static/downloads/version_info.json"
-    if os.path.exists(version_file_path):
-        import json
-        with open(version_file_path, 'r', encoding='utf-8') as f:
-            version_info = json.load(f)
+    if channel != DEFAULT_CHANNEL:
+        download_url += f"?channel={channel}"
+
+    release = release_registry.release(channel)
+    if release is None:
+        release = Release(channel=channel)
+    artifact = release.artifact(purchase.version)
     
     return {
         "order_id": order_id,
         "customer_name": purchase.customer_name,
         "version": purchase.version,
         "download_url": download_url,
-        "download_count": purchase.download_count or 0,
-        "last_download_date": purchase.last_download_date,
-        "program_info": {
-            "latest_version": version_info.get("version", "1.0.0"),
-            "build_date": version_info.get("build_date"),
-            "description": version_info.get("description", "네이버 블로그 자동화 프로그램"),
-            "requirements": version_info.get("requirements", [])
-        },
+        "download_count": download_count,
+        "last_download_date": last_download_date,
+        "channel": channel,
+        "program_info": release.program_info,
+        "file": {
+            "size": artifact.size,
+            "sha256": artifact.sha256,
+        } if artifact else None,
         "features": get_version_features(purchase.version),
         "usage_limits": {
             "accounts": purchase.account_count,
@@ -5,10 +5,23 @@ from ..database import get_db
 from ..exception_handlers import CustomAPIException
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from ..identity_cache import UserSnapshot
+from ..pagination import Filter, KeysetPaginator, PageRequest
 from .users import get_current_user
 
 router = APIRouter(prefix="/usages", tags=["usages"])
 
+usage_pages = KeysetPaginator(
+    models.Usage,
+    keys=(models.Usage.date, models.Usage.id),
+    filters={
+        "user_id": Filter(models.Usage.user_id, int),
+        "date_from": Filter(models.Usage.date, datetime, "gte"),
+        "date_to": Filter(models.Usage.date, datetime, "lt"),
+    },
+    schema=schemas.UsageOut,
+)
+
 
 @router.post("/", response_model=schemas.UsageOut)
 def create_usage(usage: schemas.UsageCreate, db: Session = Depends(get_db)):
@@ -25,16 +38,22 @@ def create_usage(usage: schemas.UsageCreate, db: Session = Depends(get_db)):
     return new_usage
 
 
-@router.get("/", response_model=list[schemas.UsageOut])
-def read_usages(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return db.query(models.Usage).offset(skip).limit(limit).all()
+@router.get("/", response_model=schemas.PaginatedUsages)
+def read_usages(
+    page: PageRequest = Depends(usage_pages.request),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(get_current_user),
+):
+    """사용량 목록 (최신 날짜순, 관리자는 전체, 일반 사용자는 본인 것만)"""
+    scope = () if current_user.is_admin else (models.Usage.user_id == current_user.id,)
+    return usage_pages.page(db, page, *scope)
 
 
 @router.get("/{usage_id}", response_model=schemas.UsageOut)
 def read_usage(
     usage_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
 ):
     usage = db.query(models.Usage).filter(models.Usage.id == usage_id).first()
     if usage is None:
@@ -54,7 +73,7 @@ def read_usage(
 def delete_usage(
     usage_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
 ):
     usage = db.query(models.Usage).filter(models.Usage.id == usage_id).first()
     if usage is None:
@@ -1,43 +1,54 @@
 from .. import models, schemas
-from ..auth import get_password_hash
-from ..config import get_settings
-from ..database import get_db
+from ..auth import get_password_hash, get_token_claims
+from ..database import get_db, get_pool_stats
 from ..exception_handlers import CustomAPIException
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from ..identity_cache import UserSnapshot, get_user_snapshot, identity_cache
+from ..pagination import Filter, KeysetPaginator, PageRequest
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from typing import Optional
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+user_pages = KeysetPaginator(
+    models.User,
+    keys=(models.User.id,),
+    filters={
+        "email": Filter(models.User.email),
+        "plan": Filter(models.User.plan),
+        "is_admin": Filter(models.User.is_admin, bool),
+        "is_active": Filter(models.User.is_active, bool),
+    },
+    schema=schemas.UserOut,
+)
+
 
 def get_current_user(
+    request: Request,
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="/auth/token")),
     db: Session = Depends(get_db),
 ):
-    settings = get_settings()
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
+    # 로깅 미들웨어에서 이미 검증한 토큰이면 재검증하지 않음
+    payload = get_token_claims(request, token)
+    if payload is None:
         raise credentials_exception
-    user = db.query(models.User).filter(models.User.email == email).first()
+    email: str = payload.get("sub")
+    if email is None:
+        raise credentials_exception
+    # 사용자 스냅샷 캐시 (수정/삭제 시 자동 무효화)
+    user = get_user_snapshot(db, email)
     if user is None:
         raise credentials_exception
     return user
 
 
-def admin_required(current_user: models.User = Depends(get_current_user)):
+def admin_required(current_user: UserSnapshot = Depends(get_current_user)):
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
     return current_user
@@ -65,11 +76,26 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
     return db_user
 
 
-@router.get("/all", response_model=list[schemas.UserOut])
+@router.get("/all", response_model=schemas.PaginatedUsers)
 def read_all_users(
-    db: Session = Depends(get_db), current_user: models.User = Depends(admin_required)
+    page: PageRequest = Depends(user_pages.request),
+    db: Session = Depends(get_db),
+    current_user: UserSnapshot = Depends(admin_required),
 ):
-    return db.query(models.User).all()
+    """사용자 목록 (관리자 전용, 최신 가입순 키셋 페이지네이션)"""
+    return user_pages.page(db, page)
+
+
+@router.get("/identity-cache/stats")
+def read_identity_cache_stats(current_user: UserSnapshot = Depends(admin_required)):
+    """인증 사용자 캐시 적중/미스 통계 (관리자 전용)"""
+    return identity_cache.stats()
+
+
+@router.get("/db-pool/stats")
+def read_db_pool_stats(current_user: UserSnapshot = Depends(admin_required)):
+    """DB 커넥션 풀 체크아웃/대기 통계 (관리자 전용)"""
+    return get_pool_stats()
 
 
 @router.get("/{user_id}", response_model=schemas.UserOut)
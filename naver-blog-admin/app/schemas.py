@@ -94,13 +94,30 @@ class UsageOut(UsageBase):
         from_attributes = True
 
 
-class PaginatedUsers(BaseModel):
-    total: int
-    page: int
+# 키셋 페이지네이션 목록 응답 (app/pagination.py)
+class KeysetPage(BaseModel):
+    total: int              # 필터에 맞는 행 수 (total_exact가 False면 이 이상)
+    total_exact: bool
     size: int
+    next_cursor: Optional[str] = None  # 다음 페이지 요청 시 cursor로 전달 (마지막 페이지면 None)
+
+
+class PaginatedUsers(KeysetPage):
     items: List[UserOut]
 
 
+class PaginatedLicenses(KeysetPage):
+    items: List[LicenseOut]
+
+
+class PaginatedPayments(KeysetPage):
+    items: List[PaymentOut]
+
+
+class PaginatedUsages(KeysetPage):
+    items: List[UsageOut]
+
+
 # Purchase (새로운 통합 시스템)
 class PurchaseBase(BaseModel):
     order_id: str
@@ -142,6 +159,9 @@ class PurchaseOut(PurchaseBase):
     class Config:
         from_attributes = True
 
+class PaginatedPurchases(KeysetPage):
+    items: List[PurchaseOut]
+
 # 임시 라이선스 활성화 요청
 class ActivationRequest(BaseModel):
     temporary_license: str
@@ -153,3 +173,8 @@ class ActivationResponse(BaseModel):
     license_key: Optional[str] = None
     message: str
     expire_date: Optional[datetime] = None
+
+# 라이선스 일괄 검증 항목 (/purchases/validate/batch)
+class LicenseValidationItem(BaseModel):
+    license_key: str
+    hardware_id: str
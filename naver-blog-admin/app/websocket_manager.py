@@ -0,0 +1,278 @@
+"""
+WebSocket 연결 관리 / 브로드캐스트
+
+- 연결마다 크기 제한이 있는 발송 큐와 전용 발송 태스크를 둠
+  (느린 클라이언트 하나가 전체 브로드캐스트를 막지 않음)
+- 브로드캐스트 메시지는 한 번만 직렬화하고 각 큐에 넣기만 함
+- 큐가 가득 차면 가장 오래된 메시지를 버리고(최신 상태 우선), 발송이 WS_SEND_TIMEOUT_SECONDS
+  이상 막힌 연결은 감시 태스크가 끊음 (발송마다 타이머를 만들지 않음)
+- 연결은 id 기준 dict에 보관하고 샤드 단위로 나눠 넣으며 샤드 사이에 이벤트 루프에 양보
+- 인증된 사용자 연결은 사용자 id별로도 색인 (한 사용자가 여러 연결 가능, send_to_user는 O(1) 조회)
+- 여러 워커 실행 시 WebSocketRelay로 브로드캐스트/사용자별 메시지를 다른 워커에 전달하고 연결 수를 합산
+"""
+
+import asyncio
+import itertools
+import json
+from typing import Optional
+
+from fastapi import WebSocket
+
+from .config import get_settings
+from .logger import logger
+from .websocket_relay import WebSocketRelay
+
+# 브로드캐스트 시 한 번에 큐에 넣는 연결 묶음 수 (샤드 사이에 다른 작업이 실행될 수 있음)
+BROADCAST_SHARDS = 16
+# 특정 사용자 대상 메시지의 중계 그룹 접두사 ("user:<id>")
+USER_GROUP_PREFIX = "user:"
+
+
+class Subscriber:
+    """WebSocket 연결 하나 (발송 큐 + 발송 태스크)"""
+
+    __slots__ = ("id", "websocket", "is_admin", "user_id", "queue", "task", "dropped", "sending_since")
+
+    def __init__(self, id: int, websocket: WebSocket, is_admin: bool, queue_size: int,
+                 user_id: Optional[int] = None):
+        self.id = id
+        self.websocket = websocket
+        self.is_admin = is_admin
+        self.user_id = user_id  # 토큰으로 확인한 사용자 id (인증되지 않은 연결은 None)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.task: Optional[asyncio.Task] = None
+        self.dropped = 0
+        self.sending_since: Optional[float] = None  # 현재 발송 시작 시각 (loop.time())
+
+    def offer(self, message: str) -> bool:
+        """발송 큐에 추가 (가득 차면 가장 오래된 메시지를 버리고 False 반환)"""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.queue.get_nowait()
+            self.queue.put_nowait(message)
+            self.dropped += 1
+            return False
+
+
+class ConnectionManager:
+    def __init__(self, queue_size: Optional[int] = None, send_timeout: Optional[float] = None,
+                 shards: int = BROADCAST_SHARDS):
+        settings = get_settings()
+        self.queue_size = queue_size or settings.WS_SEND_QUEUE_SIZE
+        self.send_timeout = send_timeout or settings.WS_SEND_TIMEOUT_SECONDS
+        self._ids = itertools.count(1)
+        # 샤드별 {연결 id: Subscriber}
+        self._admin_shards: list[dict[int, Subscriber]] = [{} for _ in range(shards)]
+        self._user_shards: list[dict[int, Subscriber]] = [{} for _ in range(shards)]
+        # id(websocket) -> Subscriber (연결 해제/개별 발송 시 O(1) 조회)
+        self._by_socket: dict[int, Subscriber] = {}
+        # 사용자 id -> {연결 id: Subscriber} (한 사용자의 여러 연결)
+        self._by_user: dict[int, dict[int, Subscriber]] = {}
+        self._reaper: Optional[asyncio.Task] = None
+        self.relay: Optional[WebSocketRelay] = None
+        self.sent = 0
+        self.dropped = 0
+        self.slow_disconnects = 0
+
+    @property
+    def admin_count(self) -> int:
+        return sum(len(shard) for shard in self._admin_shards)
+
+    @property
+    def user_count(self) -> int:
+        return sum(len(shard) for shard in self._user_shards)
+
+    @property
+    def connected_users(self) -> int:
+        """연결이 하나 이상 있는 인증된 사용자 수 (이 워커 기준)"""
+        return len(self._by_user)
+
+    async def connect(self, websocket: WebSocket, is_admin: bool = False,
+                      user_id: Optional[int] = None) -> Subscriber:
+        await websocket.accept()
+        subscriber = self.register(websocket, is_admin, user_id)
+        if is_admin:
+            logger.info(f"관리자 WebSocket 연결: {self.admin_count}개")
+        else:
+            logger.info(f"사용자 WebSocket 연결: {self.user_count}개")
+        return subscriber
+
+    def register(self, websocket: WebSocket, is_admin: bool = False,
+                 user_id: Optional[int] = None) -> Subscriber:
+        """accept된 연결 등록 후 발송 태스크 시작"""
+        subscriber = Subscriber(next(self._ids), websocket, is_admin, self.queue_size, user_id)
+        shards = self._admin_shards if is_admin else self._user_shards
+        shards[subscriber.id % len(shards)][subscriber.id] = subscriber
+        self._by_socket[id(websocket)] = subscriber
+        if user_id is not None:
+            self._by_user.setdefault(user_id, {})[subscriber.id] = subscriber
+        subscriber.task = asyncio.create_task(self._drain(subscriber))
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_slow_subscribers())
+        return subscriber
+
+    def disconnect(self, websocket: WebSocket, is_admin: bool = False) -> Optional[Subscriber]:
+        subscriber = self._by_socket.pop(id(websocket), None)
+        if subscriber is None:
+            return None
+        shards = self._admin_shards if subscriber.is_admin else self._user_shards
+        shards[subscriber.id % len(shards)].pop(subscriber.id, None)
+        if subscriber.user_id is not None:
+            sockets = self._by_user.get(subscriber.user_id)
+            if sockets is not None:
+                sockets.pop(subscriber.id, None)
+                if not sockets:
+                    del self._by_user[subscriber.user_id]
+        if subscriber.task is not None and subscriber.task is not asyncio.current_task():
+            subscriber.task.cancel()
+        if subscriber.is_admin:
+            logger.info(f"관리자 WebSocket 연결 해제: {self.admin_count}개")
+        else:
+            logger.info(f"사용자 WebSocket 연결 해제: {self.user_count}개")
+        return subscriber
+
+    async def _drain(self, subscriber: Subscriber):
+        """발송 큐를 비우는 연결별 태스크"""
+        websocket = subscriber.websocket
+        queue = subscriber.queue
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                message = await queue.get()
+                subscriber.sending_since = loop.time()
+                await websocket.send_text(message)
+                subscriber.sending_since = None
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"WebSocket 메시지 전송 실패: {e}")
+            self.disconnect(websocket)
+            await self._close(websocket)
+
+    async def _reap_slow_subscribers(self):
+        """발송이 send_timeout 이상 막힌 연결 종료 (연결이 모두 끊기면 종료)"""
+        loop = asyncio.get_running_loop()
+        while self._by_socket:
+            await asyncio.sleep(self.send_timeout / 2)
+            deadline = loop.time() - self.send_timeout
+            slow = [
+                subscriber for subscriber in self._by_socket.values()
+                if subscriber.sending_since is not None and subscriber.sending_since < deadline
+            ]
+            for subscriber in slow:
+                self.slow_disconnects += 1
+                logger.warning(f"WebSocket 발송 지연으로 연결 종료 (id={subscriber.id})")
+                self.disconnect(subscriber.websocket)
+                asyncio.create_task(self._close(subscriber.websocket))
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            # 1013: Try Again Later
+            await asyncio.wait_for(websocket.close(code=1013), self.send_timeout)
+        except Exception:
+            pass
+
+    def _offer(self, subscriber: Subscriber, message: str):
+        if not subscriber.offer(message):
+            self.dropped += 1
+
+    async def send_personal_message(self, message: str, websocket: WebSocket):
+        subscriber = self._by_socket.get(id(websocket))
+        if subscriber is None:
+            logger.error("WebSocket 메시지 전송 실패: 등록되지 않은 연결")
+            return
+        self._offer(subscriber, message)
+
+    async def send_json(self, websocket: WebSocket, message: dict):
+        await self.send_personal_message(json.dumps(message, ensure_ascii=False), websocket)
+
+    async def _broadcast_local(self, shards: list[dict[int, Subscriber]], message_str: str) -> int:
+        count = 0
+        for shard in shards:
+            if not shard:
+                continue
+            for subscriber in list(shard.values()):
+                self._offer(subscriber, message_str)
+            count += len(shard)
+            await asyncio.sleep(0)
+        return count
+
+    async def _broadcast(self, group: str, message: dict) -> int:
+        # 직렬화는 메시지당 한 번 (다른 워커에도 같은 문자열을 전달)
+        message_str = json.dumps(message, ensure_ascii=False)
+        if self.relay is not None:
+            self.relay.publish(group, message_str)
+        return await self.deliver(group, message_str)
+
+    async def deliver(self, group: str, message_str: str) -> int:
+        """이 워커에 연결된 관리자(admins)/사용자(users)/특정 사용자(user:<id>)에게만 전달"""
+        if group.startswith(USER_GROUP_PREFIX):
+            return self._deliver_to_user(int(group[len(USER_GROUP_PREFIX):]), message_str)
+        shards = self._admin_shards if group == "admins" else self._user_shards
+        return await self._broadcast_local(shards, message_str)
+
+    def _deliver_to_user(self, user_id: int, message_str: str) -> int:
+        sockets = self._by_user.get(user_id)
+        if not sockets:
+            return 0
+        for subscriber in list(sockets.values()):
+            self._offer(subscriber, message_str)
+        return len(sockets)
+
+    def is_user_connected(self, user_id: int) -> bool:
+        """이 워커에 해당 사용자의 연결이 있는지"""
+        return user_id in self._by_user
+
+    async def send_to_user(self, user_id: int, message: dict) -> int:
+        """
+        특정 사용자의 모든 연결에 메시지 전송 (라이선스 회수/변경 알림 등)
+        이 워커에서 받은 연결 수 반환 (다른 워커의 연결에는 중계로 전달)
+        """
+        return await self._broadcast(f"{USER_GROUP_PREFIX}{user_id}", message)
+
+    async def broadcast_to_admins(self, message: dict) -> int:
+        """관리자들에게 실시간 상태 브로드캐스트"""
+        return await self._broadcast("admins", message)
+
+    async def broadcast_to_users(self, message: dict) -> int:
+        """사용자들에게 공지사항 브로드캐스트"""
+        return await self._broadcast("users", message)
+
+    async def start_relay(self, socket_path: str, stats_interval: float = 1.0) -> WebSocketRelay:
+        """여러 워커 간 브로드캐스트 중계 시작"""
+        self.relay = WebSocketRelay(self, socket_path, stats_interval)
+        await self.relay.start()
+        return self.relay
+
+    async def stop_relay(self):
+        if self.relay is not None:
+            await self.relay.stop()
+            self.relay = None
+
+    def total_counts(self) -> tuple[int, int]:
+        """전체 워커의 (관리자 연결 수, 사용자 연결 수)"""
+        if self.relay is not None:
+            return self.relay.counts()
+        return self.admin_count, self.user_count
+
+    def stats(self) -> dict:
+        admins, users = self.total_counts()
+        stats = {
+            "admin_connections": admins,
+            "user_connections": users,
+            "local_admin_connections": self.admin_count,
+            "local_user_connections": self.user_count,
+            "local_authenticated_users": self.connected_users,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "slow_disconnects": self.slow_disconnects,
+        }
+        if self.relay is not None:
+            stats["relay"] = self.relay.stats()
+        return stats
+
+
+manager = ConnectionManager()
@@ -0,0 +1,239 @@
+"""
+워커 간 WebSocket 브로드캐스트 중계 (같은 호스트의 uvicorn --workers N)
+
+- 워커 하나가 Unix 도메인 소켓 브로커를 열고(파일 락으로 선출) 모든 워커가 클라이언트로 접속
+- 브로드캐스트(user_activity, admin_notice, user_disconnected 등)와 사용자별 메시지(user:<id>)는
+  보낸 워커를 제외한 모든 워커에 전달
+- 각 워커는 자기 연결 수를 주기적으로 알리고, 다른 워커의 최근 값과 합산해 전체 연결 수를 계산
+- 브로커 워커가 종료되면 남은 워커 중 하나가 락을 얻어 브로커를 다시 염
+
+프레임: JSON 헤더 한 줄 (broadcast는 다음 줄에 이미 직렬화된 메시지 본문)
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import time
+import uuid
+from typing import Optional
+
+from .logger import logger
+
+# 헤더 한 줄 + 본문 한 줄 최대 크기
+MAX_FRAME_BYTES = 1024 * 1024
+# 브로커로 보내지 못하고 쌓인 데이터가 이보다 크면 새 브로드캐스트는 버림
+MAX_WRITE_BUFFER = 4 * 1024 * 1024
+
+
+class _Broker:
+    """모든 워커 연결에 프레임을 전달하는 Unix 소켓 서버"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.peers: dict[asyncio.StreamWriter, Optional[str]] = {}
+
+    async def start(self):
+        # 이전 브로커가 남긴 소켓 파일 정리 (락을 얻었으므로 사용 중인 브로커는 없음)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.server = await asyncio.start_unix_server(self._serve, path=self.path, limit=MAX_FRAME_BYTES)
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            for writer in list(self.peers):
+                writer.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    def _forward(self, sender: asyncio.StreamWriter, data: bytes):
+        for writer in self.peers:
+            if writer is not sender and writer.transport.get_write_buffer_size() < MAX_WRITE_BUFFER:
+                writer.write(data)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.peers[writer] = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                header = json.loads(line)
+                self.peers[writer] = header.get("origin")
+                if header.get("kind") == "broadcast":
+                    line += await reader.readline()
+                self._forward(writer, line)
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            origin = self.peers.pop(writer, None)
+            writer.close()
+            if origin:
+                self._forward(writer, json.dumps({"kind": "leave", "origin": origin}).encode() + b"\n")
+
+
+class WebSocketRelay:
+    """ConnectionManager의 브로드캐스트를 다른 워커에 전달하고 받은 브로드캐스트를 로컬 연결에 전달"""
+
+    def __init__(self, manager, socket_path: str, stats_interval: float = 1.0):
+        self.manager = manager
+        self.socket_path = socket_path
+        self.stats_interval = stats_interval
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        # origin -> (관리자 연결 수, 사용자 연결 수, 받은 시각)
+        self.peers: dict[str, tuple[int, int, float]] = {}
+        self.published = 0
+        self.received = 0
+        self.skipped = 0
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._broker: Optional[_Broker] = None
+        self._lock_file = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_broker(self) -> bool:
+        return self._broker is not None
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._release_broker()
+
+    async def wait_connected(self, timeout: float = 5.0):
+        deadline = time.monotonic() + timeout
+        while not self.connected:
+            if time.monotonic() > deadline:
+                raise TimeoutError("브로커에 연결하지 못했습니다")
+            await asyncio.sleep(0.01)
+
+    def publish(self, group: str, message_str: str):
+        """이미 직렬화된 브로드캐스트 메시지를 다른 워커에 전달 (연결 전이면 로컬에만 전달됨)"""
+        self._send({"kind": "broadcast", "group": group}, message_str)
+
+    def _send(self, header: dict, body: Optional[str] = None) -> bool:
+        writer = self._writer
+        if writer is None or writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            self.skipped += 1
+            return False
+        header["origin"] = self.origin
+        data = json.dumps(header).encode() + b"\n"
+        if body is not None:
+            data += body.encode() + b"\n"
+        writer.write(data)
+        self.published += 1
+        return True
+
+    def counts(self) -> tuple[int, int]:
+        """전체 워커 (관리자 연결 수, 사용자 연결 수) - 최근 3주기 안에 알려온 워커만 합산"""
+        admins, users = self.manager.admin_count, self.manager.user_count
+        fresh = time.monotonic() - self.stats_interval * 3
+        for peer_admins, peer_users, seen in self.peers.values():
+            if seen >= fresh:
+                admins += peer_admins
+                users += peer_users
+        return admins, users
+
+    def workers(self) -> int:
+        fresh = time.monotonic() - self.stats_interval * 3
+        return 1 + sum(1 for _, _, seen in self.peers.values() if seen >= fresh)
+
+    async def _run(self):
+        """브로커 선출/접속을 반복 (브로커가 사라지면 다시 선출)"""
+        backoff = 0.05
+        while True:
+            await self._try_become_broker()
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=MAX_FRAME_BYTES)
+            except OSError:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 1.0)
+                continue
+
+            backoff = 0.05
+            self._writer = writer
+            stats_task = asyncio.create_task(self._publish_stats())
+            try:
+                await self._receive(reader)
+            finally:
+                stats_task.cancel()
+                self._writer = None
+                self.peers.clear()
+                writer.close()
+            logger.warning("WebSocket 중계 브로커 연결이 끊어져 다시 연결합니다")
+
+    async def _try_become_broker(self):
+        if self._broker is not None:
+            return
+        lock_file = open(f"{self.socket_path}.lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return
+        broker = _Broker(self.socket_path)
+        try:
+            await broker.start()
+        except OSError as e:
+            lock_file.close()
+            logger.error(f"WebSocket 중계 브로커 시작 실패: {e}")
+            return
+        self._lock_file = lock_file
+        self._broker = broker
+        logger.info(f"WebSocket 중계 브로커 시작: {self.socket_path} (pid={os.getpid()})")
+
+    async def _release_broker(self):
+        if self._broker is not None:
+            await self._broker.stop()
+            self._broker = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    async def _publish_stats(self):
+        while True:
+            self._send({"kind": "stats", "admins": self.manager.admin_count, "users": self.manager.user_count})
+            await asyncio.sleep(self.stats_interval)
+
+    async def _receive(self, reader: asyncio.StreamReader):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                header = json.loads(line)
+                kind = header.get("kind")
+                if kind == "broadcast":
+                    body = (await reader.readline()).rstrip(b"\n").decode()
+                    self.received += 1
+                    await self.manager.deliver(header["group"], body)
+                elif kind == "stats":
+                    self.peers[header["origin"]] = (header["admins"], header["users"], time.monotonic())
+                elif kind == "leave":
+                    self.peers.pop(header["origin"], None)
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return
+
+    def stats(self) -> dict:
+        return {
+            "origin": self.origin,
+            "broker": self.is_broker,
+            "connected": self.connected,
+            "workers": self.workers(),
+            "published": self.published,
+            "received": self.received,
+            "skipped": self.skipped,
+        }
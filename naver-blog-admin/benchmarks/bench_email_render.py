@@ -0,0 +1,82 @@
+"""
+구매 완료 이메일 렌더링 벤치마크
+
+기존 방식(메일마다 거대한 f-string 평가 + 기능 목록 html += 누적)과
+사전 컴파일 템플릿 + 버전별 조각 캐시 방식의 메일당 렌더링 시간/메모리 비교
+실행: python -m benchmarks.bench_email_render (naver-blog-admin 폴더에서)
+"""
+
+import time
+import tracemalloc
+
+from app.email_templates import (
+    FEATURE_ITEM,
+    FEATURES_FOOTER,
+    FEATURES_HEADER,
+    PURCHASE_CONFIRMATION_HTML,
+    VERSION_FEATURES,
+    render_purchase_confirmation_html,
+)
+
+EMAILS = 20_000
+FIELDS = sorted(PURCHASE_CONFIRMATION_HTML.fields)
+
+# 기존 send_purchase_confirmation_email과 같은 f-string을 그대로 평가하는 함수
+legacy_shell = eval(
+    f"lambda {', '.join(FIELDS)}: f'''{PURCHASE_CONFIRMATION_HTML.source}'''"
+)
+legacy_item = eval(f"lambda icon, title, description: f'''{FEATURE_ITEM.source}'''")
+
+
+def legacy_features_html(version):
+    html = FEATURES_HEADER
+    for icon, title, description in VERSION_FEATURES.get(version, VERSION_FEATURES["1.1"]):
+        html += legacy_item(icon, title, description)
+    html += FEATURES_FOOTER
+    return html
+
+
+def customer(i):
+    return {
+        "download_url": f"http://localhost:8000/purchases/download/V44-A3P4-{i:08X}",
+        "version": ("1.1", "2.3", "4.4")[i % 3],
+        "customer_name": f"고객{i}",
+        "order_id": f"ORDER-{i}",
+        "account_count": 3,
+        "post_count": 4,
+        "months": 12,
+        "expire_date": "2027-01-01",
+        "temporary_license": f"V44-A3P4-{i:08X}",
+    }
+
+
+def legacy_render(fields):
+    return legacy_shell(features_html=legacy_features_html(fields["version"]), **fields)
+
+
+def compiled_render(fields):
+    return render_purchase_confirmation_html(**fields)
+
+
+def bench(label, render):
+    customers = [customer(i) for i in range(EMAILS)]
+    start = time.perf_counter()
+    for fields in customers:
+        render(fields)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    render(customers[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<9} {elapsed / EMAILS * 1e6:8.1f} us/email  {peak:8d} bytes peak/email")
+
+
+def main():
+    bench("legacy", legacy_render)
+    bench("compiled", compiled_render)
+
+
+if __name__ == "__main__":
+    main()
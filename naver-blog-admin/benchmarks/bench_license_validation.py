@@ -0,0 +1,104 @@
+"""
+라이선스 검증 벤치마크
+
+기존 방식(요청마다 HMAC 검증 + fromisoformat)과 LicenseValidator 캐시 적중 시,
+캐시가 비어 있을 때 validate_many 일괄 검증의 워커 하나 초당 검증 수 비교
++ 소비자 프로그램이 공개키(EdDSA/ES256)로 로컬 서명 검증할 때의 초당 검증 수
+실행: python -m benchmarks.bench_license_validation (naver-blog-admin 폴더에서)
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import jwt
+
+from app.license_validation import SECRET_KEY, LicenseSigner, LicenseValidator, generate_private_key_pem
+from app.routers.purchases import generate_final_license
+
+VALIDATIONS = 100_000
+LICENSES = 1_000
+
+
+def legacy_validate(license_key, hardware_id):
+    try:
+        license_data = jwt.decode(license_key, SECRET_KEY, algorithms=["HS256"])
+        if license_data.get("hardware_id") != hardware_id:
+            return {"valid": False, "reason": "하드웨어 ID가 일치하지 않습니다"}
+        expire_date = datetime.fromisoformat(license_data["expire_date"])
+        if datetime.utcnow() > expire_date:
+            return {"valid": False, "reason": "라이선스가 만료되었습니다"}
+        return {
+            "valid": True,
+            "version": license_data["version"],
+            "account_count": license_data["account_count"],
+            "post_count": license_data["post_count"],
+            "expire_date": license_data["expire_date"],
+        }
+    except jwt.InvalidTokenError:
+        return {"valid": False, "reason": "유효하지 않은 라이선스입니다"}
+
+
+def bench(label, validate, requests):
+    start = time.perf_counter()
+    for license_key, hardware_id in requests:
+        validate(license_key, hardware_id)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<22} {len(requests) / elapsed:>10,.0f} validations/s"
+        f"  ({elapsed / len(requests) * 1e6:.2f} us/validation)"
+    )
+
+
+def main():
+    expire_date = datetime.utcnow() + timedelta(days=30)
+    licenses = [
+        (
+            generate_final_license({
+                "order_id": f"ORDER-{i}",
+                "hardware_id": f"HWID-{i}",
+                "version": "2.3",
+                "account_count": 2,
+                "post_count": 3,
+                "expire_date": expire_date,
+            }),
+            f"HWID-{i}",
+        )
+        for i in range(LICENSES)
+    ]
+    requests = [licenses[i % LICENSES] for i in range(VALIDATIONS)]
+
+    print(f"{VALIDATIONS:,} validations over {LICENSES:,} licenses")
+    bench("legacy (decode each)", legacy_validate, requests)
+    validator = LicenseValidator()
+    bench("LicenseValidator", validator.validate, requests)
+    print(validator.stats())
+
+    # 캐시 없이 1000개씩 일괄 검증 (모든 항목이 새로 검증됨)
+    start = time.perf_counter()
+    for _ in range(VALIDATIONS // LICENSES):
+        LicenseValidator().validate_many(licenses)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{'validate_many (cold)':<22} {VALIDATIONS / elapsed:>10,.0f} validations/s"
+        f"  ({elapsed / VALIDATIONS * 1e6:.2f} us/validation)"
+    )
+
+    # 소비자 프로그램 로컬 검증 (서버 요청 없이 공개키로 서명 검증)
+    payload = jwt.decode(licenses[0][0], SECRET_KEY, algorithms=["HS256"])
+    for algorithm in ("EdDSA", "ES256"):
+        signer = LicenseSigner(algorithm, private_key_pem=generate_private_key_pem(algorithm))
+        token = signer.sign(payload)
+        public_key = signer.public_key_pem()
+        count = VALIDATIONS // 10
+        start = time.perf_counter()
+        for _ in range(count):
+            jwt.decode(token, public_key, algorithms=[algorithm])
+        elapsed = time.perf_counter() - start
+        print(
+            f"{'client ' + algorithm + ' verify':<22} {count / elapsed:>10,.0f} validations/s"
+            f"  ({elapsed / count * 1e6:.2f} us/validation)"
+        )
+
+
+if __name__ == "__main__":
+    main()
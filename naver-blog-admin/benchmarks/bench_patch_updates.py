@@ -0,0 +1,60 @@
+"""
+패치 업데이트 전송량 벤치마크
+
+합성 빌드 8개(압축되지 않는 바이너리 약 20MB, 빌드마다 일부 항목만 변경)를 publish_build로 배포한 뒤
+이전 빌드 사용자가 최신 빌드로 올릴 때 전체 다운로드 대비 패치 경로의 전송량과 적용 시간 비교
+실행: python -m benchmarks.bench_patch_updates (naver-blog-admin 폴더에서)
+"""
+
+import os
+import random
+import tempfile
+import time
+import zipfile
+
+from app.patches import apply_patch, find_update, publish_build
+from app.releases import ReleaseRegistry
+
+BUILDS = 8
+MODULES = 20
+MODULE_SIZE = 1_000_000
+
+
+def package(path: str, build: int):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as out:
+        for module in range(MODULES):
+            # 빌드마다 모듈 2개만 바뀜 (모듈 리비전 = 마지막으로 바뀐 빌드)
+            revision = max((b for b in range(1, build + 1) if module in (2 * b % MODULES, (2 * b + 1) % MODULES)),
+                           default=0)
+            out.writestr(f"app/module{module:02}.pyd", random.Random(module * 1000 + revision).randbytes(MODULE_SIZE))
+        out.writestr("version.txt", f"1.{build}.0")
+
+
+def main():
+    workdir = tempfile.mkdtemp()
+    channel_dir = os.path.join(workdir, "downloads")
+    for build in range(BUILDS):
+        path = os.path.join(workdir, f"build-{build}.zip")
+        package(path, build)
+        publish_build(channel_dir, f"1.{build}.0", path)
+
+    registry = ReleaseRegistry(channel_dir, poll_seconds=0)
+    release = registry.release("stable")
+    full = release.default.size
+    print(f"latest 1.{BUILDS - 1}.0, full package {full / 1e6:.1f} MB")
+    for build in range(BUILDS - 1):
+        current = f"1.{build}.0"
+        plan = find_update(release, current)
+        start = time.perf_counter()
+        path = release.history[current].path
+        for _, to_build, artifact in plan.patches:
+            out = os.path.join(workdir, f"client-{current}-{to_build}.zip")
+            apply_patch(path, artifact.path, out)
+            path = out
+        elapsed = time.perf_counter() - start
+        print(f"from {current:<6} {plan.mode:<5} {len(plan.patches)} patch(es) "
+              f"{plan.patch_size / 1e6:6.2f} MB ({plan.patch_size / full:5.1%} of full)  apply {elapsed * 1000:6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+구매 목록 페이지네이션 벤치마크 (OFFSET vs 키셋 커서)
+
+구매 20만 건에서 페이지 크기 50으로 1, 100, 1000, 3000번째 페이지를 조회하는 시간 비교
+(키셋은 직전 페이지 마지막 항목의 커서로 조회, endpoint는 상한 있는 전체 건수 집계와 직렬화 포함)
+실행: python -m benchmarks.bench_purchase_pagination (naver-blog-admin 폴더에서)
+"""
+
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base, create_db_engine, get_db
+from app.routers import purchases
+from app.routers.users import get_current_user
+
+PURCHASES = 200_000
+PAGE_SIZE = 50
+PAGES = (1, 100, 1000, 3000)
+REPEAT = 20
+
+
+def seed(engine):
+    start = datetime(2024, 1, 1)
+    rows = [
+        {
+            "order_id": f"ORDER-{i:07}",
+            "customer_name": f"고객{i}",
+            "customer_email": f"buyer{i % 5000}@example.com",
+            "version": ("1.1", "2.3", "5.10")[i % 3],
+            "account_count": 1, "post_count": 1, "months": 1, "amount": 100000,
+            "status": ("pending", "activated", "expired")[i % 3],
+            "expire_date": start + timedelta(days=30),
+            "created_at": start + timedelta(minutes=i),
+        }
+        for i in range(PURCHASES)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(models.Purchase), rows)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    seed(engine)
+    SessionLocal = sessionmaker(bind=engine)
+
+    def override_get_db():
+        with SessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(purchases.router)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(is_admin=True)
+    client = TestClient(app)
+
+    # 각 페이지 직전까지의 커서 (벤치마크 준비용으로 한 번만 계산)
+    cursors, cursor, page = {}, None, 1
+    while page <= max(PAGES):
+        cursors[page] = cursor
+        cursor = client.get("/purchases/", params={"limit": PAGE_SIZE, **({"cursor": cursor} if cursor else {})}
+                            ).json()["next_cursor"]
+        page += 1
+
+    print(f"{PURCHASES:,} purchases, page size {PAGE_SIZE}")
+    for page in PAGES:
+        def offset_page():
+            with SessionLocal() as db:
+                db.scalars(
+                    select(models.Purchase)
+                    .order_by(models.Purchase.created_at.desc(), models.Purchase.id.desc())
+                    .offset((page - 1) * PAGE_SIZE).limit(PAGE_SIZE)
+                ).all()
+
+        def keyset_query():
+            query = select(models.Purchase)
+            if cursors[page]:
+                query = query.where(
+                    tuple_(models.Purchase.created_at, models.Purchase.id) < purchases.purchase_pages.decode_cursor(cursors[page])
+                )
+            with SessionLocal() as db:
+                db.scalars(
+                    query.order_by(models.Purchase.created_at.desc(), models.Purchase.id.desc()).limit(PAGE_SIZE)
+                ).all()
+
+        def keyset_page():
+            params = {"limit": PAGE_SIZE}
+            if cursors[page]:
+                params["cursor"] = cursors[page]
+            assert client.get("/purchases/", params=params).status_code == 200
+
+        print(f"page {page:>5}: offset {timed(offset_page):6.2f} ms   keyset {timed(keyset_query):6.2f} ms   "
+              f"endpoint (count + JSON) {timed(keyset_page):6.2f} ms")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+구매 핫 경로 부하 테스트 (포팅 전 동기 핸들러 vs 현재 라우터)
+
+동시 요청 수를 스레드풀 한도(기본 40)보다 크게 걸었을 때
+/purchases/download, /purchases/validate 의 p50/p99 지연 시간과 처리량 비교
+실행: python -m benchmarks.bench_purchase_routes (naver-blog-admin 폴더에서)
+"""
+
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import jwt
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import models
+from app.database import Base, create_async_db_engine, create_db_engine, get_async_db, get_db
+from app.license_validation import SECRET_KEY
+from app.routers import purchases
+
+PURCHASES = 500
+REQUESTS = 2_000
+CONCURRENCY = 200
+
+
+def legacy_app(SessionLocal) -> FastAPI:
+    """포팅 전과 같은 동기 def 핸들러 (요청마다 스레드풀 슬롯 사용)"""
+    router = APIRouter(prefix="/purchases")
+
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @router.post("/validate")
+    def validate_license(license_key: str, hardware_id: str, db: Session = Depends(get_db)):
+        license_data = jwt.decode(license_key, SECRET_KEY, algorithms=["HS256"])
+        return {"valid": license_data.get("hardware_id") == hardware_id}
+
+    @router.get("/download/{temporary_license}")
+    def download_program(temporary_license: str, db: Session = Depends(get_db)):
+        purchase = db.query(models.Purchase).filter(
+            models.Purchase.temporary_license == temporary_license
+        ).first()
+        if not purchase or purchase.status == "expired":
+            raise HTTPException(404, "유효하지 않은 다운로드 링크입니다")
+        purchase.download_count = (purchase.download_count or 0) + 1
+        purchase.last_download_date = datetime.utcnow()
+        db.commit()
+        return FileResponse("static/downloads/naver-blog-automation-latest.zip")
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def current_app(SessionLocal, AsyncSessionLocal) -> FastAPI:
+    """현재 라우터 (activate/validate: async 핸들러, download: 동기 Session으로 조회 1회 + 이벤트 로그)"""
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(purchases.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+
+def seed(engine) -> list[str]:
+    Base.metadata.create_all(bind=engine)
+    licenses = [f"V11-A1P1-{i:08X}" for i in range(PURCHASES)]
+    with sessionmaker(bind=engine)() as db:
+        for i, license_key in enumerate(licenses):
+            db.add(models.Purchase(
+                order_id=f"ORDER-{i}",
+                customer_email=f"buyer{i}@example.com",
+                version="1.1",
+                temporary_license=license_key,
+                expire_date=datetime.utcnow() + timedelta(days=30),
+                status="pending",
+            ))
+        db.commit()
+    return licenses
+
+
+async def load(app: FastAPI, requests: list, async_engine) -> list[float]:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def call(method, url, params):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.request(method, url, params=params)
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*(call(*request) for request in requests))
+        latencies.append(time.perf_counter() - start)
+    # 비동기 커넥션은 이벤트 루프에 묶이므로 다음 asyncio.run 전에 정리
+    await async_engine.dispose()
+    return latencies
+
+
+def report(label: str, latencies: list[float]):
+    total = latencies.pop()
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"{label:<28} p50 {p50:8.1f} ms  p99 {p99:8.1f} ms  {len(latencies) / total:8.0f} req/s")
+
+
+def main():
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    os.makedirs("static/downloads")
+    with open("static/downloads/naver-blog-automation-latest.zip", "wb") as f:
+        f.write(b"PK\x05\x06" + b"\0" * 18)
+
+    url = f"sqlite:///{workdir}/bench.db"
+    engine = create_db_engine(url)
+    licenses = seed(engine)
+    async_engine = create_async_db_engine(url)
+
+    apps = {
+        "sync Session (legacy)": legacy_app(sessionmaker(bind=engine)),
+        "current": current_app(sessionmaker(bind=engine), async_sessionmaker(async_engine, expire_on_commit=False)),
+    }
+    license_key = purchases.generate_final_license({
+        "order_id": "ORDER-0",
+        "hardware_id": "HWID-1",
+        "version": "1.1",
+        "account_count": 1,
+        "post_count": 1,
+        "expire_date": datetime.utcnow() + timedelta(days=30),
+    })
+    scenarios = {
+        "download": [
+            ("GET", f"/purchases/download/{licenses[i % PURCHASES]}", None) for i in range(REQUESTS)
+        ],
+        "validate": [
+            ("POST", "/purchases/validate", {"license_key": license_key, "hardware_id": "HWID-1"})
+        ] * REQUESTS,
+    }
+
+    print(f"{REQUESTS} requests, concurrency {CONCURRENCY}")
+    for scenario, requests in scenarios.items():
+        for label, app in apps.items():
+            report(f"{scenario} / {label}", asyncio.run(load(app, requests, async_engine)))
+
+
+if __name__ == "__main__":
+    main()
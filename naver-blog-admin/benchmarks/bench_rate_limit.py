@@ -0,0 +1,72 @@
+"""
+Rate Limit 엔진 마이크로 벤치마크
+
+기존 deque + 전역 락 방식과 새 sliding window counter 엔진의
+요청당 비용과 IP당 메모리 사용량 비교
+실행: python -m benchmarks.bench_rate_limit (naver-blog-admin 폴더에서)
+"""
+
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from datetime import datetime
+
+from app.rate_limit import MemoryRateLimitBackend, RateLimiter, RateLimitRule
+
+REQUESTS = 200_000
+CLIENTS = 5_000
+LIMIT = 60
+
+
+def legacy_limiter():
+    data, lock = defaultdict(deque), threading.Lock()
+
+    def hit(client_ip):
+        now = datetime.utcnow()
+        with lock:
+            dq = data[client_ip]
+            while dq and (now - dq[0]).total_seconds() > 60:
+                dq.popleft()
+            if len(dq) >= LIMIT:
+                return False
+            dq.append(now)
+            return True
+
+    return hit
+
+
+def engine_limiter():
+    limiter = RateLimiter(MemoryRateLimitBackend(), RateLimitRule("default", LIMIT))
+    return lambda client_ip: limiter.hit(client_ip, "/purchases/validate").allowed
+
+
+def bench(label, factory):
+    ips = [f"10.0.{i // 256}.{i % 256}" for i in range(CLIENTS)]
+
+    hit = factory()
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        hit(ips[i % CLIENTS])
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    hit = factory()
+    for i in range(CLIENTS * 30):
+        hit(ips[i % CLIENTS])
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{label:<8} {elapsed / REQUESTS * 1e9:8.0f} ns/request"
+        f"  {memory / CLIENTS:8.0f} bytes/IP (30 req/IP)"
+    )
+
+
+def main():
+    bench("legacy", legacy_limiter)
+    bench("engine", engine_limiter)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+WebSocket 공지 브로드캐스트 벤치마크
+
+사용자 소켓 10,000개에 /api/admin/broadcast 공지 하나가 모두 도착하기까지 걸리는 시간 비교
+- 기존 방식: 연결 목록을 돌며 send_text를 순서대로 await
+- ConnectionManager: 한 번 직렬화 후 연결별 발송 큐에 넣고 발송 태스크가 각자 전송
+느린 클라이언트(발송 50ms)가 섞여 있을 때 나머지 연결이 받는 시간도 함께 측정
+실행: python -m benchmarks.bench_websocket_broadcast (naver-blog-admin 폴더에서)
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+from app.logger import logger
+from app.websocket_manager import ConnectionManager
+
+SOCKETS = 10_000
+SLOW_SOCKETS = 20
+SLOW_SEND_SECONDS = 0.05
+
+NOTICE = {
+    "type": "admin_notice",
+    "title": "서버 점검 안내",
+    "message": "오늘 밤 2시부터 10분간 서버 점검이 있습니다.",
+    "level": "info",
+}
+
+
+class FakeWebSocket:
+    """전송 시 이벤트 루프에 한 번 양보하는 소켓 (느린 소켓은 일정 시간 대기)"""
+
+    def __init__(self, tracker, delay: float = 0):
+        self.tracker = tracker
+        self.delay = delay
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        await asyncio.sleep(self.delay)
+        self.tracker.received(self.delay > 0)
+
+    async def close(self, code=1000):
+        pass
+
+
+class Tracker:
+    def __init__(self, fast: int):
+        self.fast = fast
+        self.count = 0
+        self.done = asyncio.Event()
+        self.start = time.perf_counter()
+        self.elapsed = None
+
+    def received(self, slow: bool):
+        if slow:
+            return
+        self.count += 1
+        if self.count == self.fast:
+            self.elapsed = time.perf_counter() - self.start
+            self.done.set()
+
+
+def sockets(tracker, slow: int):
+    step = SOCKETS // slow if slow else 0
+    return [FakeWebSocket(tracker, SLOW_SEND_SECONDS if step and i % step == 0 else 0) for i in range(SOCKETS)]
+
+
+async def legacy(slow: int) -> float:
+    tracker = Tracker(SOCKETS - slow)
+    connections = sockets(tracker, slow)
+    tracker.start = time.perf_counter()
+    message_str = json.dumps(NOTICE, ensure_ascii=False)
+    for connection in connections:
+        await connection.send_text(message_str)
+    await tracker.done.wait()
+    return tracker.elapsed
+
+
+async def queued(slow: int) -> float:
+    tracker = Tracker(SOCKETS - slow)
+    manager = ConnectionManager(queue_size=16, send_timeout=5)
+    for websocket in sockets(tracker, slow):
+        await manager.connect(websocket)
+    await asyncio.sleep(0)
+    tracker.start = time.perf_counter()
+    await manager.broadcast_to_users(NOTICE)
+    await tracker.done.wait()
+    return tracker.elapsed
+
+
+def main():
+    # 연결/해제 로그 10,000줄 출력 제외
+    logger.setLevel(logging.WARNING)
+    print(f"{SOCKETS:,} user sockets, 1 notice")
+    for slow in (0, SLOW_SOCKETS):
+        label = f"{slow} slow sockets" if slow else "all fast"
+        for name, run in (("legacy sequential", legacy), ("ConnectionManager", queued)):
+            elapsed = asyncio.run(run(slow))
+            print(f"{name:<20} {label:<16} all fast sockets received in {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
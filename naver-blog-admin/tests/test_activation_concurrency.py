@@ -0,0 +1,144 @@
+import asyncio
+import os
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import jwt
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+pytest.importorskip("aiosqlite")
+httpx = pytest.importorskip("httpx")
+
+from app import client_license_system, models
+from app.client_license_system import LicenseManager
+from app.database import Base, create_async_db_engine, get_async_db
+from app.routers import purchases
+
+LICENSE = "V23-A2P3-ABCDEF12"
+PARALLEL = 300
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(models.Purchase(
+            order_id="ORDER-1",
+            customer_email="buyer@example.com",
+            version="2.3",
+            account_count=2,
+            post_count=3,
+            months=1,
+            temporary_license=LICENSE,
+            expire_date=datetime.utcnow() + timedelta(days=30),
+            status="pending",
+        ))
+        db.commit()
+    engine.dispose()
+    return url
+
+
+def _app(async_engine) -> FastAPI:
+    AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(purchases.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app
+
+
+def _fire(db_url, requests) -> list:
+    """(json, headers) 목록을 한꺼번에 /purchases/activate로 전송"""
+
+    async def run():
+        # 운영과 같은 WAL + busy_timeout + 커넥션 풀 설정
+        async_engine = create_async_db_engine(db_url)
+        transport = httpx.ASGITransport(app=_app(async_engine))
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(*(
+                    client.post("/purchases/activate", json=body, headers=headers)
+                    for body, headers in requests
+                ))
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(run())
+
+
+def _rows(db_url, model):
+    engine = create_engine(db_url)
+    with sessionmaker(bind=engine)() as db:
+        rows = db.query(model).all()
+    engine.dispose()
+    return rows
+
+
+def test_parallel_activations_succeed_once(db_url):
+    responses = _fire(db_url, [
+        ({"temporary_license": LICENSE, "hardware_id": f"HWID-{i}"}, {}) for i in range(PARALLEL)
+    ])
+    assert Counter(response.status_code for response in responses) == {200: 1, 400: PARALLEL - 1}
+
+    winner = next(response for response in responses if response.status_code == 200).json()
+    purchase, = _rows(db_url, models.Purchase)
+    assert purchase.status == "activated"
+    assert purchase.final_license == winner["license_key"]
+    license_data = jwt.decode(winner["license_key"], options={"verify_signature": False})
+    assert license_data["hardware_id"] == purchase.hardware_id
+
+
+def test_retries_with_same_idempotency_key_return_same_license(db_url):
+    body = {"temporary_license": LICENSE, "hardware_id": "HWID-1"}
+    responses = _fire(db_url, [(body, {"Idempotency-Key": "retry-1"})] * PARALLEL)
+    assert {response.status_code for response in responses} == {200}
+    assert len({response.json()["license_key"] for response in responses}) == 1
+
+    purchase, = _rows(db_url, models.Purchase)
+    record, = _rows(db_url, models.ActivationIdempotencyKey)
+    assert record.final_license == purchase.final_license == responses[0].json()["license_key"]
+
+    # 다른 키로는 다시 활성화할 수 없고, 같은 키를 다른 기기에서 쓰면 거부
+    again, = _fire(db_url, [(body, {"Idempotency-Key": "retry-2"})])
+    assert again.status_code == 400
+    other, = _fire(db_url, [({**body, "hardware_id": "HWID-2"}, {"Idempotency-Key": "retry-1"})])
+    assert other.status_code == 422
+
+
+def test_client_retries_lost_activation_response(db_url, tmp_path, monkeypatch):
+    async_engine = create_async_db_engine(db_url)
+    keys = []
+    with TestClient(_app(async_engine)) as client:
+
+        def post(url, **kwargs):
+            keys.append(kwargs["headers"]["Idempotency-Key"])
+            response = client.post(url.replace("http://localhost:8000", ""), **kwargs)
+            if len(keys) == 1:
+                # 서버는 처리했지만 응답이 유실된 경우
+                raise client_license_system.requests.ConnectionError("connection reset")
+            return response
+
+        monkeypatch.setattr(client_license_system.requests, "post", post)
+        monkeypatch.setattr(LicenseManager, "_save_license_to_file", lambda self, license_key: None)
+        manager = LicenseManager()
+        result = asyncio.run(manager.activate_license(LICENSE))
+
+    assert result["success"] is True
+    assert len(keys) == 2 and keys[0] == keys[1]
+    purchase, = _rows(db_url, models.Purchase)
+    assert manager.stored_license == purchase.final_license
+    assert purchase.hardware_id == manager.hardware_id
@@ -83,7 +83,7 @@ def test_admin_only_endpoint(admin_token, user_token):
     # 관리자는 /users/all 접근 가능
     res2 = client.get("/users/all", headers={"Authorization": f"Bearer {admin_token}"})
     assert res2.status_code == 200
-    assert isinstance(res2.json(), list)
+    assert isinstance(res2.json()["items"], list)
 
 
 def test_01_signup():
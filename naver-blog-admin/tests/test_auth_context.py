@@ -0,0 +1,85 @@
+import os
+import sys
+from datetime import timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+from jose import JWTError
+from starlette.requests import HTTPConnection, Request
+
+from app import auth
+from app.identity_cache import UserSnapshot, identity_cache
+
+
+def _request(token=None):
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return Request({"type": "http", "headers": headers})
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    auth._verified_tokens.clear()
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    calls = []
+    original = auth.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+    return calls
+
+
+def test_repeat_tokens_skip_verification(decode_calls):
+    token = auth.create_access_token({"sub": "user@example.com"}, timedelta(minutes=5))
+    for _ in range(3):
+        assert auth.decode_access_token(token)["sub"] == "user@example.com"
+    assert len(decode_calls) == 1
+
+
+def test_expired_cache_entry_is_reverified(decode_calls):
+    token = auth.create_access_token({"sub": "user@example.com"}, timedelta(seconds=-1))
+    with pytest.raises(JWTError):
+        auth.decode_access_token(token)
+    assert not auth._verified_tokens
+
+
+def test_request_state_is_shared_with_dependencies(decode_calls):
+    token = auth.create_access_token({"sub": "user@example.com"}, timedelta(minutes=5))
+    request = _request(token)
+    assert auth.resolve_request_auth(request)["sub"] == "user@example.com"
+    auth._verified_tokens.clear()
+    assert auth.get_token_claims(request, token)["sub"] == "user@example.com"
+    assert len(decode_calls) == 1
+
+
+def test_invalid_token_resolves_to_none():
+    request = _request("not-a-jwt")
+    assert auth.resolve_request_auth(request) is None
+    assert auth.get_token_claims(request, "not-a-jwt") is None
+    assert auth.resolve_request_auth(_request()) is None
+
+
+def _websocket(query=b"", token=None):
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return HTTPConnection({"type": "websocket", "headers": headers, "query_string": query})
+
+
+def test_websocket_token_resolves_to_cached_user():
+    identity_cache.put(UserSnapshot(id=7, email="ws@example.com", is_admin=False, is_active=True))
+    identity_cache.put(UserSnapshot(id=8, email="off@example.com", is_admin=False, is_active=False))
+    token = auth.create_access_token({"sub": "ws@example.com"}, timedelta(minutes=5))
+    inactive = auth.create_access_token({"sub": "off@example.com"}, timedelta(minutes=5))
+    try:
+        assert auth.get_websocket_user(_websocket(f"token={token}".encode()), db=None).id == 7
+        assert auth.get_websocket_user(_websocket(token=token), db=None).id == 7
+        assert auth.get_websocket_user(_websocket(f"token={inactive}".encode()), db=None) is None
+        assert auth.get_websocket_user(_websocket(b"token=not-a-jwt"), db=None) is None
+        assert auth.get_websocket_user(_websocket(), db=None) is None
+    finally:
+        identity_cache.clear()
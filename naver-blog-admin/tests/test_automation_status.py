@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.automation_status import AutomationStatusAggregator
+from app.websocket_manager import ConnectionManager
+
+TICK = 0.05
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.received = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        self.received.append(json.loads(message))
+
+    async def close(self, code=1000):
+        pass
+
+
+async def _admin():
+    manager = ConnectionManager(queue_size=64, send_timeout=1)
+    admin = FakeWebSocket()
+    await manager.connect(admin, is_admin=True)
+    return manager, admin
+
+
+def test_updates_are_coalesced_per_tick():
+    async def run():
+        manager, admin = await _admin()
+        aggregator = AutomationStatusAggregator(manager, tick_seconds=TICK)
+        for user in range(100):
+            for progress in range(10):
+                aggregator.update(f"user-{user}", "running", progress * 10, "포스팅 중")
+
+        await asyncio.sleep(TICK * 3)
+        assert len(admin.received) == 1
+        batch = admin.received[0]
+        assert batch["type"] == "automation_status_batch"
+        assert batch["removed"] == []
+        assert len(batch["updates"]) == 100
+        assert {entry["progress"] for entry in batch["updates"]} == {90}
+        assert aggregator.stats()["received"] == 1000
+
+        # 바뀐 사용자만 다음 배치에 포함, 값이 그대로면 보내지 않음
+        aggregator.update("user-1", "running", 90, "포스팅 중")
+        aggregator.update("user-2", "completed", 100, "완료")
+        aggregator.remove("user-3")
+        aggregator.remove("unknown")
+        await asyncio.sleep(TICK * 3)
+        assert len(admin.received) == 2
+        batch = admin.received[1]
+        assert [entry["user_id"] for entry in batch["updates"]] == ["user-2"]
+        assert batch["removed"] == ["user-3"]
+        assert aggregator._task.done()
+        await aggregator.stop()
+
+    asyncio.run(run())
+
+
+def test_snapshot_contains_latest_state_per_user():
+    async def run():
+        manager = ConnectionManager(queue_size=64, send_timeout=1)
+        aggregator = AutomationStatusAggregator(manager, tick_seconds=TICK)
+        aggregator.update("u1", "starting", 0, "")
+        aggregator.update("u1", "running", 40, "2/5")
+        aggregator.update("u2", "failed", 10, "로그인 실패")
+        aggregator.remove("u2")
+
+        # 관리자가 없으면 배치를 보내지 않고, 연결한 관리자는 스냅샷으로 받음
+        assert await aggregator.flush() == 0
+        snapshot = aggregator.snapshot()
+        assert snapshot["type"] == "automation_status_snapshot"
+        assert [(entry["user_id"], entry["status"], entry["progress"]) for entry in snapshot["users"]] == [
+            ("u1", "running", 40)
+        ]
+        await aggregator.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,198 @@
+import os
+import socket
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models
+from app.bulk_mail import BulkMailer, create_campaign
+from app.database import Base
+from app.mail_queue import SMTPConnection
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.sessions = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope.rcpt_tos[0])
+        return "250 OK"
+
+
+class FlakyConnection(SMTPConnection):
+    """N번째 발송부터 실패하는 연결 (프로세스 중단/서버 장애 재현용)"""
+
+    def __init__(self, *args, fail_after, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail_after = fail_after
+        self.sent = 0
+
+    def send(self, to_address, subject, html_body):
+        if self.sent >= self.fail_after:
+            raise ConnectionError("smtp unavailable")
+        super().send(to_address, subject, html_body)
+        self.sent += 1
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _add_purchases(session_factory, emails, version="1.1"):
+    db = session_factory()
+    for i, email in enumerate(emails):
+        db.add(models.Purchase(
+            order_id=f"ORDER-{version}-{i}",
+            customer_name=f"구매자{i}",
+            customer_email=email,
+            version=version,
+            account_count=1,
+            post_count=1,
+            months=1,
+            amount=10000,
+            temporary_license=f"TEMP-{version}-{i}",
+            expire_date=datetime.utcnow() + timedelta(days=7),
+        ))
+    db.commit()
+    db.close()
+
+
+def _campaign(session_factory, **filters):
+    db = session_factory()
+    campaign = create_campaign(
+        db,
+        "만료 안내",
+        "{customer_name}님, 라이선스 만료 안내",
+        "<p>{customer_name}님의 {version} 라이선스가 {expire_date}에 만료됩니다.</p>",
+        **filters,
+    )
+    db.close()
+    return campaign.id
+
+
+def _mailer(session_factory, connection_factory, **kwargs):
+    kwargs.setdefault("rate_per_second", 0)
+    return BulkMailer(session_factory, connection_factory, **kwargs)
+
+
+def test_campaign_is_sent_over_one_session(smtp_server, session_factory):
+    controller, handler = smtp_server
+    _add_purchases(session_factory, [f"buyer{i}@example.com" for i in range(12)])
+    campaign_id = _campaign(session_factory)
+
+    result = _mailer(
+        session_factory,
+        lambda: SMTPConnection("127.0.0.1", controller.port, "noreply@example.com"),
+        chunk_size=5,
+    ).run(campaign_id)
+
+    assert result.status == "completed"
+    assert result.sent_count == 12
+    assert sorted(handler.messages) == sorted(f"buyer{i}@example.com" for i in range(12))
+    assert handler.sessions == 1
+
+
+def test_session_is_rotated_after_message_limit(smtp_server, session_factory):
+    controller, handler = smtp_server
+    _add_purchases(session_factory, [f"buyer{i}@example.com" for i in range(10)])
+    campaign_id = _campaign(session_factory)
+
+    _mailer(
+        session_factory,
+        lambda: SMTPConnection("127.0.0.1", controller.port, "noreply@example.com"),
+        messages_per_session=4,
+    ).run(campaign_id)
+
+    assert len(handler.messages) == 10
+    assert handler.sessions == 3
+
+
+def test_duplicate_emails_and_filters(smtp_server, session_factory):
+    controller, handler = smtp_server
+    _add_purchases(session_factory, ["a@example.com", "b@example.com", "a@example.com"])
+    _add_purchases(session_factory, ["c@example.com"], version="2.3")
+    campaign_id = _campaign(session_factory, version="1.1")
+
+    result = _mailer(
+        session_factory,
+        lambda: SMTPConnection("127.0.0.1", controller.port, "noreply@example.com"),
+        chunk_size=2,
+    ).run(campaign_id)
+
+    assert sorted(handler.messages) == ["a@example.com", "b@example.com"]
+    assert result.sent_count == 2
+
+
+def test_interrupted_campaign_resumes_without_resending(smtp_server, session_factory):
+    controller, handler = smtp_server
+    emails = [f"buyer{i}@example.com" for i in range(8)]
+    _add_purchases(session_factory, emails)
+    campaign_id = _campaign(session_factory)
+
+    first = _mailer(
+        session_factory,
+        lambda: FlakyConnection(
+            "127.0.0.1", controller.port, "noreply@example.com", fail_after=3
+        ),
+        chunk_size=3,
+        max_consecutive_failures=2,
+    ).run(campaign_id)
+    assert first.status == "paused"
+    assert first.sent_count == 3
+    assert len(handler.messages) == 3
+
+    second = _mailer(
+        session_factory,
+        lambda: SMTPConnection("127.0.0.1", controller.port, "noreply@example.com"),
+        chunk_size=3,
+    ).run(campaign_id)
+    assert second.status == "completed"
+    assert second.sent_count == 8
+    assert second.failed_count == 0
+    assert sorted(handler.messages) == sorted(emails)
+
+    db = session_factory()
+    statuses = {d.email: d.status for d in db.query(models.MailCampaignDelivery)}
+    db.close()
+    assert statuses == {email: "sent" for email in emails}
+
+
+def test_unknown_template_field_is_rejected(session_factory):
+    db = session_factory()
+    with pytest.raises(ValueError):
+        create_campaign(db, "오류", "{customer_name}", "<p>{password}</p>")
+    db.close()
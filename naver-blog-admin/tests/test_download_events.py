@@ -0,0 +1,144 @@
+import os
+import sys
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base, get_db
+from app.download_events import DownloadEventLog, download_summary, purchase_download_stats
+from app.routers import purchases
+from app.routers.users import get_current_user
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        db.add_all([
+            models.Purchase(order_id="ORDER-1", temporary_license="L1", download_count=5),
+            models.Purchase(order_id="ORDER-2", temporary_license="L2"),
+        ])
+        db.commit()
+    yield factory
+    engine.dispose()
+
+
+def _purchases(session_factory) -> dict:
+    with session_factory() as db:
+        return {p.order_id: (p.download_count, p.last_download_date) for p in db.query(models.Purchase)}
+
+
+def test_flush_writes_batches_and_keeps_events_on_failure(session_factory):
+    log = DownloadEventLog(session_factory, batch_size=3)
+    for _ in range(7):
+        log.record(1, "full", "stable", 100)
+    assert log.flush() == 7
+    with session_factory() as db:
+        assert db.query(models.DownloadEvent).count() == 7
+
+    def broken():
+        raise RuntimeError("db down")
+
+    log.session_factory = broken
+    log.record(2, "full")
+    with pytest.raises(RuntimeError):
+        log.flush()
+    assert log.stats()["pending"] == 1
+    log.session_factory = session_factory
+    assert log.flush() == 1
+
+    bounded = DownloadEventLog(session_factory, max_pending=2)
+    for purchase_id in (1, 2, 1):
+        bounded.record(purchase_id, "full")
+    assert bounded.stats()["dropped"] == 1
+
+
+def test_materialize_adds_counted_events_once(session_factory):
+    log = DownloadEventLog(session_factory)
+    first = datetime(2026, 10, 1, 9)
+    log.record(1, "full", at=first)
+    log.record(1, "resume", at=first + timedelta(minutes=1))
+    log.record(1, "full", at=first + timedelta(minutes=2))
+    log.record(2, "patch", at=first)
+    log.flush()
+
+    # 반영 전에도 구매별 횟수는 정확
+    with session_factory() as db:
+        purchase = db.query(models.Purchase).filter_by(order_id="ORDER-1").one()
+        assert purchase_download_stats(db, purchase) == (7, first + timedelta(minutes=2))
+
+    # 다른 워커가 같은 구간을 이미 반영했으면 아무것도 하지 않음
+    other = DownloadEventLog(session_factory)
+    assert log.materialize(upper_event_id=0) == 0
+    assert other.materialize() == 4
+    assert log.materialize() == 0
+    assert _purchases(session_factory) == {"ORDER-1": (7, first + timedelta(minutes=2)), "ORDER-2": (0, None)}
+
+    log.record(1, "full", at=first - timedelta(days=1))
+    log.flush()
+    assert log.materialize() == 1
+    # 마지막 다운로드 날짜는 뒤로 가지 않음
+    assert _purchases(session_factory)["ORDER-1"] == (8, first + timedelta(minutes=2))
+    with session_factory() as db:
+        purchase = db.query(models.Purchase).filter_by(order_id="ORDER-1").one()
+        assert purchase_download_stats(db, purchase) == (8, first + timedelta(minutes=2))
+
+
+def test_summary_histogram(session_factory):
+    log = DownloadEventLog(session_factory)
+    log.record(1, "full", bytes_sent=1000, at=datetime(2026, 10, 17, 23, 59))
+    log.record(2, "full", bytes_sent=1000, at=datetime(2026, 10, 18, 0, 1))
+    log.record(2, "resume", bytes_sent=400, at=datetime(2026, 10, 18, 0, 2))
+    log.record(2, "full", bytes_sent=1000, at=datetime(2026, 9, 1))
+    log.flush()
+    log.materialize(upper_event_id=2)
+
+    with session_factory() as db:
+        summary = download_summary(db, days=3, today=date(2026, 10, 18))
+    # 기존 카운터 5 + full 이벤트 3 (반영 여부와 무관)
+    assert summary["total_downloads"] == 8
+    assert summary["days"] == [
+        {"date": "2026-10-16", "full": 0, "resume": 0, "patch": 0, "bytes": 0},
+        {"date": "2026-10-17", "full": 1, "resume": 0, "patch": 0, "bytes": 1000},
+        {"date": "2026-10-18", "full": 1, "resume": 1, "patch": 0, "bytes": 1400},
+    ]
+
+
+def test_stop_flushes_pending_events(session_factory):
+    log = DownloadEventLog(session_factory, flush_seconds=60, materialize_seconds=0)
+    log.start()
+    log.record(1, "full")
+    log.stop()
+    with session_factory() as db:
+        assert db.query(models.DownloadEvent).count() == 1
+
+
+def test_download_stats_route_is_not_shadowed_by_purchase_id(session_factory):
+    def override_get_db():
+        with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(purchases.router)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, is_admin=True)
+    with TestClient(app) as client:
+        response = client.get("/purchases/download-stats", params={"days": 7})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body["total_downloads"] == 5
+        assert len(body["days"]) == 7
+        assert "event_log" in body
+
+        app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=2, is_admin=False)
+        assert client.get("/purchases/download-stats").status_code == 403
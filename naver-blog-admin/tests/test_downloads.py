@@ -0,0 +1,162 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.datastructures import Headers
+
+from app import models
+from app.database import Base, get_db
+from app.download_events import DownloadEventLog
+from app.downloads import ArtifactResponse, load_artifact, plan_download
+from app.releases import release_registry
+from app.routers import purchases
+
+LICENSE = "V23-A2P3-ABCDEF12"
+CONTENT = bytes(range(256)) * 4096  # 1 MiB
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    download_dir = tmp_path / "downloads"
+    download_dir.mkdir()
+    (download_dir / "naver-blog-automation-latest.zip").write_bytes(CONTENT)
+    monkeypatch.setattr(release_registry, "download_dir", str(download_dir))
+    release_registry.scan()
+
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(models.Purchase(
+            order_id="ORDER-1",
+            customer_email="buyer@example.com",
+            version="2.3",
+            temporary_license=LICENSE,
+            expire_date=datetime.utcnow() + timedelta(days=30),
+            status="pending",
+        ))
+        db.commit()
+
+    app = FastAPI()
+    app.include_router(purchases.router)
+
+    def override_get_db():
+        with sessionmaker(bind=engine)() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    event_log = DownloadEventLog(sessionmaker(bind=engine))
+    monkeypatch.setattr(purchases, "download_event_log", event_log)
+    with TestClient(app) as test_client:
+        def download_count():
+            event_log.flush()
+            event_log.materialize()
+            with sessionmaker(bind=engine)() as db:
+                return db.query(models.Purchase).one().download_count
+
+        test_client.download_count = download_count
+        yield test_client
+    engine.dispose()
+
+
+def test_full_download_and_conditional_request(client):
+    hashes = release_registry.stats()["hashes"]
+    response = client.get(f"/purchases/download/{LICENSE}")
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-length"] == str(len(CONTENT))
+    assert "filename*=utf-8''" in response.headers["content-disposition"]
+    etag = response.headers["etag"]
+
+    not_modified = client.get(f"/purchases/download/{LICENSE}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert client.download_count() == 1
+
+    # 요청마다 파일을 해시하지 않음
+    assert release_registry.stats()["hashes"] == hashes
+    assert client.get("/purchases/download/UNKNOWN").status_code == 404
+
+
+def test_resumed_download_sends_only_missing_bytes(client):
+    etag = client.get(f"/purchases/download/{LICENSE}").headers["etag"]
+
+    resumed = client.get(f"/purchases/download/{LICENSE}", headers={"Range": "bytes=1000-", "If-Range": etag})
+    assert resumed.status_code == 206
+    assert resumed.content == CONTENT[1000:]
+    assert resumed.headers["content-range"] == f"bytes 1000-{len(CONTENT) - 1}/{len(CONTENT)}"
+
+    middle = client.get(f"/purchases/download/{LICENSE}", headers={"Range": "bytes=10-19"})
+    assert middle.content == CONTENT[10:20]
+    suffix = client.get(f"/purchases/download/{LICENSE}", headers={"Range": "bytes=-5"})
+    assert suffix.content == CONTENT[-5:]
+
+    # 이어받기는 다운로드 횟수에 포함하지 않음
+    assert client.download_count() == 1
+
+    unsatisfiable = client.get(f"/purchases/download/{LICENSE}", headers={"Range": f"bytes={len(CONTENT)}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_replaced_file_is_sent_in_full(client):
+    etag = client.get(f"/purchases/download/{LICENSE}").headers["etag"]
+
+    path = os.path.join(release_registry.download_dir, "naver-blog-automation-latest.zip")
+    os.replace(_write(path + ".new", b"new release"), path)
+    assert release_registry.scan()
+
+    response = client.get(f"/purchases/download/{LICENSE}", headers={"Range": "bytes=1000-", "If-Range": etag})
+    assert response.status_code == 200
+    assert response.content == b"new release"
+    assert response.headers["etag"] != etag
+
+
+def test_version_build_and_channel(client):
+    download_dir = release_registry.download_dir
+    _write(os.path.join(download_dir, "naver-blog-automation-v2.3.zip"), b"build for 2.3")
+    os.makedirs(os.path.join(download_dir, "beta"))
+    _write(os.path.join(download_dir, "beta", "naver-blog-automation-latest.zip"), b"beta build")
+    release_registry.scan()
+
+    assert client.get(f"/purchases/download/{LICENSE}").content == b"build for 2.3"
+    assert client.get(f"/purchases/download/{LICENSE}?channel=beta").content == b"beta build"
+    assert client.get(f"/purchases/download/{LICENSE}?channel=nightly").status_code == 404
+
+    info = client.get("/purchases/download-info/ORDER-1?channel=beta").json()
+    assert info["download_url"].endswith(f"/purchases/download/{LICENSE}?channel=beta")
+    assert info["file"]["size"] == len(b"beta build")
+    assert info["program_info"]["latest_version"] == "1.0.0"
+
+
+def _write(path, content):
+    with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+
+def test_zero_copy_send_when_server_supports_it(tmp_path):
+    path = _write(str(tmp_path / "app.zip"), CONTENT)
+    artifact = load_artifact(path, os.stat(path))
+    plan = plan_download(artifact, Headers({"range": "bytes=100-"}))
+    messages = []
+
+    async def send(message):
+        if message["type"] == "http.response.zerocopysend":
+            message = {**message, "file": message["file"].fileno() > 0}
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "extensions": {"http.response.zerocopysend": {}}}
+    asyncio.run(ArtifactResponse(artifact, plan)(scope, None, send))
+    assert messages[0]["status"] == 206
+    assert messages[1] == {"type": "http.response.zerocopysend", "file": True, "offset": 100,
+                           "count": len(CONTENT) - 100}
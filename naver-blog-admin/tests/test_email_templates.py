@@ -0,0 +1,52 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.email_templates import (
+    PURCHASE_CONFIRMATION_HTML,
+    VERSION_FEATURES,
+    _render_features_html,
+    get_version_features_html,
+    render_purchase_confirmation_html,
+)
+
+FIELDS = {
+    "download_url": "http://localhost:8000/purchases/download/V23-A2P3-ABCD1234",
+    "version": "2.3",
+    "customer_name": "<b>홍길동</b>",
+    "order_id": "ORDER-1",
+    "account_count": 2,
+    "post_count": 3,
+    "months": 1,
+    "expire_date": "2027-01-01",
+    "temporary_license": "V23-A2P3-ABCD1234",
+}
+
+
+def test_customer_fields_are_substituted_and_escaped():
+    html = render_purchase_confirmation_html(**FIELDS)
+    assert "&lt;b&gt;홍길동&lt;/b&gt;" in html
+    assert "<b>홍길동</b>" not in html
+    assert FIELDS["download_url"] in html
+    # CSS 중괄호 이스케이프가 올바르게 복원됨
+    assert "box-sizing: border-box;" in html and "{{" not in html
+
+
+def test_feature_fragment_is_rendered_once_per_version():
+    hits = _render_features_html.cache_info().hits
+    render_purchase_confirmation_html(**FIELDS)
+    render_purchase_confirmation_html(**dict(FIELDS, version="4.4"))
+    assert _render_features_html.cache_info().hits == hits + 2
+    assert get_version_features_html("9.9") == get_version_features_html("1.1")
+
+
+def test_unknown_versions_do_not_grow_the_cache():
+    for i in range(100):
+        render_purchase_confirmation_html(**dict(FIELDS, version=f"unknown-{i}"))
+    assert _render_features_html.cache_info().currsize <= len(VERSION_FEATURES)
+
+
+def test_template_is_compiled_into_few_parts():
+    assert PURCHASE_CONFIRMATION_HTML.fields == set(FIELDS) | {"features_html"}
+    assert len(PURCHASE_CONFIRMATION_HTML.parts) < 30
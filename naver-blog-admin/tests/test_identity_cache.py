@@ -0,0 +1,48 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base
+from app.identity_cache import get_user_snapshot, identity_cache
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add(models.User(name="사용자", email="user@example.com", hashed_password="x"))
+    session.commit()
+    identity_cache.clear()
+    identity_cache.hits = identity_cache.misses = 0
+    yield session
+    session.close()
+
+
+def test_second_lookup_is_served_from_cache(db, monkeypatch):
+    first = get_user_snapshot(db, "user@example.com")
+    monkeypatch.setattr(db, "query", lambda *a: pytest.fail("DB queried on cache hit"))
+    assert get_user_snapshot(db, "user@example.com") == first
+    assert identity_cache.stats()["hits"] == 1
+    assert identity_cache.stats()["misses"] == 1
+
+
+def test_deactivation_invalidates_snapshot(db):
+    assert get_user_snapshot(db, "user@example.com").is_active
+    user = db.query(models.User).filter_by(email="user@example.com").one()
+    user.is_active = False
+    db.commit()
+    assert identity_cache.stats()["size"] == 0
+    assert not get_user_snapshot(db, "user@example.com").is_active
+
+
+def test_snapshot_expires_after_ttl(db, monkeypatch):
+    monkeypatch.setattr(identity_cache, "ttl", -1)
+    get_user_snapshot(db, "user@example.com")
+    assert identity_cache.get("user@example.com") is None
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import jwt
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import client_license_system
+from app.client_license_system import LicenseManager
+from app.config import Settings
+from app.license_validation import LicenseSigner, LicenseValidator, _secret_key_from_settings, generate_private_key_pem
+from app.routers import purchases
+
+
+def _payload(hardware_id="HWID-1", days=30):
+    return {
+        "order_id": "ORDER-1",
+        "hardware_id": hardware_id,
+        "version": "4.4",
+        "account_count": 5,
+        "post_count": 10,
+        "expire_date": (datetime.utcnow() + timedelta(days=days)).isoformat(),
+    }
+
+
+@pytest.fixture(params=["EdDSA", "ES256"])
+def signer(request):
+    return LicenseSigner(request.param, private_key_pem=generate_private_key_pem(request.param))
+
+
+@pytest.fixture
+def manager(signer, tmp_path, monkeypatch):
+    """서버에 요청하면 실패하는 소비자 프로그램 (모든 검증이 로컬에서 끝나야 함)"""
+    server_calls = []
+
+    def offline(url, **kwargs):
+        server_calls.append(url)
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(client_license_system.requests, "get", offline)
+    monkeypatch.setattr(client_license_system.requests, "post", offline)
+    monkeypatch.setattr(LicenseManager, "REVOCATION_CACHE_FILE", str(tmp_path / "revocations.json"))
+    manager = LicenseManager(public_key_info=signer.public_key_info())
+    manager.hardware_id = "HWID-1"
+    manager._revocations_checked_at = float("inf")
+    manager.server_calls = server_calls
+    return manager
+
+
+def test_signer_requires_configured_private_key(tmp_path):
+    settings = Settings(LICENSE_SIGNING_ALGORITHM="EdDSA", LICENSE_PRIVATE_KEY="", LICENSE_PRIVATE_KEY_PATH="")
+    with pytest.raises(ValueError):
+        LicenseSigner.from_settings(settings)
+    missing = settings.model_copy(update={"LICENSE_PRIVATE_KEY_PATH": str(tmp_path / "missing.pem")})
+    with pytest.raises(ValueError):
+        LicenseSigner.from_settings(missing)
+    # 서버가 키 파일을 만들지 않음
+    assert not (tmp_path / "missing.pem").exists()
+
+    pem = generate_private_key_pem("EdDSA")
+    first = LicenseSigner.from_settings(settings.model_copy(update={"LICENSE_PRIVATE_KEY": pem.decode().replace("\n", "\\n")}))
+    second = LicenseSigner.from_settings(settings.model_copy(update={"LICENSE_PRIVATE_KEY": pem.decode()}))
+    assert first.kid == second.kid
+
+
+def test_license_secret_key_is_required_outside_development():
+    development = Settings(ENVIRONMENT="development", LICENSE_SECRET_KEY="")
+    assert _secret_key_from_settings(development)
+    assert _secret_key_from_settings(development.model_copy(update={"LICENSE_SECRET_KEY": "dev-key"})) == "dev-key"
+
+    production = development.model_copy(update={"ENVIRONMENT": "production"})
+    for unset in ("", "your-license-secret-key"):
+        with pytest.raises(ValueError):
+            _secret_key_from_settings(production.model_copy(update={"LICENSE_SECRET_KEY": unset}))
+    assert _secret_key_from_settings(production.model_copy(update={"LICENSE_SECRET_KEY": "prod-key"})) == "prod-key"
+
+
+def test_validator_accepts_public_key_and_legacy_licenses(signer):
+    validator = LicenseValidator(signer=signer)
+    signed = signer.sign(_payload())
+    assert jwt.get_unverified_header(signed)["kid"] == signer.kid
+    assert validator.validate(signed, "HWID-1")["valid"] is True
+    # 이미 발급된 HS256 인증키도 계속 유효
+    legacy = LicenseSigner().sign(_payload())
+    assert validator.validate(legacy, "HWID-1")["valid"] is True
+
+    forged = LicenseSigner(signer.algorithm, private_key_pem=generate_private_key_pem(signer.algorithm))
+    assert validator.validate(forged.sign(_payload()), "HWID-1")["valid"] is False
+    # 공개키를 모르는 검증기는 공개키 서명 인증키를 거부
+    assert LicenseValidator().validate(signed, "HWID-1")["valid"] is False
+
+
+def test_validate_many_mixes_algorithms(signer):
+    items = [
+        (signer.sign(_payload()), "HWID-1"),
+        (LicenseSigner().sign(_payload()), "HWID-1"),
+        (signer.sign(_payload(hardware_id="HWID-2")), "HWID-1"),
+    ]
+    results = LicenseValidator(signer=signer).validate_many(items)
+    assert [result["valid"] for result in results] == [True, True, False]
+
+
+def test_public_key_endpoint(signer, monkeypatch):
+    app = FastAPI()
+    app.include_router(purchases.router)
+    with TestClient(app) as client:
+        assert client.get("/purchases/license-public-key").status_code == 404
+
+        monkeypatch.setattr(purchases, "license_signer", signer)
+        response = client.get("/purchases/license-public-key")
+        assert response.status_code == 200
+        assert response.json() == signer.public_key_info()
+        assert "max-age" in response.headers["cache-control"]
+
+
+def test_client_verifies_signature_without_server(signer, manager):
+    manager.stored_license = signer.sign(_payload())
+    result = asyncio.run(manager.validate_license_cached())
+    assert result["valid"] is True
+    assert result["version"] == "4.4"
+    assert manager.can_use_feature("ai_content")
+
+    offline = manager._offline_validation()
+    assert offline["valid"] is True
+    assert offline["offline_mode"] is True
+    assert "limited_features" not in offline
+    assert manager.server_calls == []
+
+
+def test_client_rejects_tampered_license(signer, manager):
+    header, payload, signature = signer.sign(_payload()).split(".")
+    tampered = jwt.utils.base64url_encode(json.dumps(_payload(days=3650)).encode()).decode()
+    manager.stored_license = ".".join([header, tampered, signature])
+
+    assert asyncio.run(manager.validate_license_cached())["valid"] is False
+    assert manager._offline_validation()["valid"] is False
+    assert manager.server_calls == []
+
+
+def test_client_never_trusts_unverified_hs256(signer, manager):
+    forged = jwt.encode(_payload(days=3650), "attacker-chosen-secret-key-0123456789", algorithm="HS256")
+    manager.stored_license = forged
+
+    # 공개키가 있으면 더 약한 서명 방식은 거부
+    assert asyncio.run(manager.validate_license_cached())["valid"] is False
+    assert manager._offline_validation()["valid"] is False
+    assert not manager.can_use_feature("ai_content")
+
+    # 공개키가 없으면 서버 검증으로 넘기고, 서버에 연결할 수 없으면 기본 기능만 허용
+    manager.public_key_info = None
+    result = asyncio.run(manager.validate_license_cached())
+    assert result["limited_features"] is True
+    assert manager.server_calls
+    assert not manager.can_use_feature("ai_content")
+
+
+def test_client_does_not_replace_pinned_public_key(signer, manager, monkeypatch):
+    old = LicenseSigner(signer.algorithm, private_key_pem=generate_private_key_pem(signer.algorithm))
+    pinned = old.public_key_info()
+    manager.public_key_info = pinned
+    # 다른 키(교체된 키 또는 공격자 키)로 서명된 인증키
+    manager.stored_license = signer.sign(_payload())
+
+    result = asyncio.run(manager.validate_license_cached())
+    # 로컬에서 검증하지 못하므로 서버 검증으로 넘어가고, 서버에 연결할 수 없으면 기본 기능만 허용
+    assert result["limited_features"] is True
+    assert manager.server_calls == ["http://localhost:8000/purchases/validate"]
+    assert manager.public_key_info == pinned
+    assert not manager.can_use_feature("ai_content")
@@ -0,0 +1,154 @@
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import license_validation, models
+from app.database import Base
+from app.license_validation import LicenseValidator, license_validator, load_revoked_licenses
+from app.routers.purchases import generate_final_license
+
+
+def _license(hardware_id="HWID-1", days=30):
+    return generate_final_license({
+        "order_id": "ORDER-1",
+        "hardware_id": hardware_id,
+        "version": "2.3",
+        "account_count": 2,
+        "post_count": 3,
+        "expire_date": datetime.utcnow() + timedelta(days=days),
+    })
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    calls = []
+    original = license_validation.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(license_validation.jwt, "decode", counting_decode)
+    return calls
+
+
+@pytest.fixture(autouse=True)
+def clear_validator():
+    license_validator.clear()
+    yield
+    license_validator.clear()
+
+
+def test_repeat_validation_is_served_from_cache(decode_calls):
+    validator = LicenseValidator()
+    key = _license()
+    first = validator.validate(key, "HWID-1")
+    assert first["valid"] is True
+    assert first["version"] == "2.3"
+    for _ in range(5):
+        assert validator.validate(key, "HWID-1") == first
+    assert len(decode_calls) == 1
+    assert validator.stats()["hits"] == 5
+
+
+def test_hardware_id_is_part_of_cache_key():
+    validator = LicenseValidator()
+    key = _license()
+    assert validator.validate(key, "HWID-1")["valid"] is True
+    assert validator.validate(key, "HWID-2") == {
+        "valid": False, "reason": "하드웨어 ID가 일치하지 않습니다"
+    }
+
+
+def test_valid_verdict_is_reused_only_until_expire_date(decode_calls):
+    validator = LicenseValidator()
+    key = _license(days=1)
+    assert validator.validate(key, "HWID-1")["valid"] is True
+    expired = validator.validate(key, "HWID-1", now=time.time() + 2 * 86400)
+    assert expired == {"valid": False, "reason": "라이선스가 만료되었습니다"}
+    assert len(decode_calls) == 2
+
+
+def test_invalid_signature_and_lru_bound():
+    validator = LicenseValidator(maxsize=2)
+    assert validator.validate("not-a-jwt", "HWID-1")["reason"] == "유효하지 않은 라이선스입니다"
+    for i in range(5):
+        validator.validate(_license(hardware_id=f"HWID-{i}"), f"HWID-{i}")
+    assert validator.stats()["size"] == 2
+
+
+def test_revoked_license_fails_even_when_cached():
+    validator = LicenseValidator()
+    key = _license()
+    assert validator.validate(key, "HWID-1")["valid"] is True
+    validator.revoke(key)
+    assert validator.validate(key, "HWID-1") == {"valid": False, "reason": "취소된 라이선스입니다"}
+    validator.restore(key)
+    assert validator.validate(key, "HWID-1")["valid"] is True
+
+
+def test_purchase_status_change_revokes_license():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    key = _license()
+    purchase = models.Purchase(order_id="ORDER-1", final_license=key, status="activated")
+    db.add(purchase)
+    db.commit()
+
+    assert license_validator.validate(key, "HWID-1")["valid"] is True
+    purchase.status = "revoked"
+    db.commit()
+    assert license_validator.validate(key, "HWID-1")["valid"] is False
+
+    license_validator.clear()
+    load_revoked_licenses(db)
+    assert license_validator.validate(key, "HWID-1")["reason"] == "취소된 라이선스입니다"
+
+    purchase.status = "activated"
+    db.commit()
+    assert license_validator.validate(key, "HWID-1")["valid"] is True
+    db.close()
+
+
+def test_validate_many_matches_single_validation(decode_calls):
+    validator = LicenseValidator()
+    good, other = _license(), _license(hardware_id="HWID-2")
+    tampered = good[:-4] + ("AAAA" if not good.endswith("AAAA") else "BBBB")
+    items = [
+        (good, "HWID-1"),
+        (other, "HWID-2"),
+        (good, "HWID-1"),
+        (good, "HWID-9"),
+        (tampered, "HWID-1"),
+        ("not-a-jwt", "HWID-1"),
+    ]
+    results = validator.validate_many(items)
+    # 같은 (인증키, 하드웨어 ID)는 한 번만 jwt.decode
+    assert len(decode_calls) == 5
+    assert validator.stats() | {"hit_rate": None} == {
+        "hits": 0, "misses": 6, "hit_rate": None, "size": 5, "revoked": 0,
+        "revoked_orders": 0, "revocation_version": 0,
+    }
+    assert results == [LicenseValidator().validate(*item) for item in items]
+
+    validator.revoke(other)
+    assert validator.validate_many([(other, "HWID-2")]) == [
+        {"valid": False, "reason": "취소된 라이선스입니다"}
+    ]
+
+
+def test_batch_decoder_rejects_other_algorithms():
+    validator = LicenseValidator()
+    none_token = license_validation.jwt.encode(
+        {"hardware_id": "HWID-1", "expire_date": "2999-01-01T00:00:00"}, None, algorithm="none"
+    )
+    assert validator.validate_many([(none_token, "HWID-1")])[0]["valid"] is False
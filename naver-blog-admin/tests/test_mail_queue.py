@@ -0,0 +1,130 @@
+import os
+import socket
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models
+from app.database import Base
+from app.mail_queue import MailQueueWorker, SMTPConnection, enqueue_email
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.sessions = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope.rcpt_tos[0])
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _enqueue(session_factory, count):
+    db = session_factory()
+    for i in range(count):
+        enqueue_email(db, f"buyer{i}@example.com", "구매 완료", "<p>감사합니다</p>")
+    db.commit()
+    db.close()
+
+
+def _worker(session_factory, port, **kwargs):
+    return MailQueueWorker(
+        session_factory,
+        lambda: SMTPConnection("127.0.0.1", port, "noreply@example.com"),
+        **kwargs,
+    )
+
+
+def test_queued_mail_is_sent_over_one_session(smtp_server, session_factory):
+    controller, handler = smtp_server
+    _enqueue(session_factory, 5)
+
+    assert _worker(session_factory, controller.port).run_once() == 5
+
+    assert sorted(handler.messages) == sorted(f"buyer{i}@example.com" for i in range(5))
+    assert handler.sessions == 1
+    db = session_factory()
+    assert {e.status for e in db.query(models.OutboundEmail)} == {"sent"}
+
+
+def test_failed_mail_backs_off_then_dead_letters(session_factory):
+    _enqueue(session_factory, 1)
+    worker = _worker(session_factory, _free_port(), max_attempts=2, backoff_seconds=60)
+
+    assert worker.run_once() == 1
+    db = session_factory()
+    email = db.query(models.OutboundEmail).one()
+    assert email.status == "queued" and email.attempts == 1
+    assert email.next_attempt_at > datetime.utcnow() + timedelta(seconds=30)
+    # 백오프 중에는 다시 시도하지 않음
+    assert worker.run_once() == 0
+
+    email.next_attempt_at = datetime.utcnow()
+    db.commit()
+    assert worker.run_once() == 1
+    db.expire_all()
+    email = db.query(models.OutboundEmail).one()
+    assert email.status == "dead" and email.attempts == 2 and email.last_error
+
+
+def test_running_worker_requeues_mail_left_sending_by_crashed_worker(smtp_server, session_factory):
+    controller, handler = smtp_server
+    _enqueue(session_factory, 1)
+    db = session_factory()
+    # 다른 워커가 선점한 직후 종료됨 (재시작 시점에는 아직 오래되지 않아 start()에서는 재적재되지 않음)
+    email = db.query(models.OutboundEmail).one()
+    email.status = "sending"
+    email.next_attempt_at = datetime.utcnow()
+    db.commit()
+
+    worker = _worker(
+        session_factory, controller.port, poll_interval=0.05, stale_after_seconds=0.3, requeue_interval=0.05
+    )
+    worker.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not handler.messages and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        worker.stop()
+    assert handler.messages == ["buyer0@example.com"]
+    db.expire_all()
+    assert db.query(models.OutboundEmail).one().status == "sent"
@@ -0,0 +1,136 @@
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base, get_db
+from app.pagination import KeysetPaginator
+from app.routers import licenses, payments, usages, users
+from app.routers.users import get_current_user
+
+START = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        for i in range(1, 31):
+            db.add(models.User(id=i, name=f"user{i}", email=f"user{i}@example.com", hashed_password="x",
+                               plan="pro" if i % 3 == 0 else "basic", is_admin=i == 1))
+        for i in range(60):
+            user_id = i % 2 + 1
+            db.add(models.License(user_id=user_id, key=f"KEY-{i}", status="active" if i % 4 else "expired"))
+            db.add(models.Payment(user_id=user_id, amount=1000, status="paid", method="card" if i % 2 else "bank"))
+            # 같은 날짜가 여러 건이어도 id로 순서가 정해짐
+            db.add(models.Usage(user_id=user_id, date=START + timedelta(days=i // 3), post_count=i))
+        db.commit()
+    yield factory
+    engine.dispose()
+
+
+def _client(session_factory, is_admin=True, user_id=1):
+    def override_get_db():
+        with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    for module in (users, licenses, payments, usages):
+        app.include_router(module.router)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=user_id, is_admin=is_admin)
+    return TestClient(app)
+
+
+def _walk(client, path, **params):
+    items, cursor = [], None
+    while True:
+        page = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert page.status_code == 200, page.text
+        page = page.json()
+        items += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items, page
+
+
+@pytest.mark.parametrize("path,expected", [
+    ("/users/all", 30),
+    ("/licenses/", 60),
+    ("/payments/", 60),
+    ("/usages/", 60),
+])
+def test_every_list_pages_without_offset(session_factory, path, expected):
+    with _client(session_factory) as client:
+        items, last = _walk(client, path, limit=7)
+        assert len(items) == expected
+        assert len({item["id"] for item in items}) == expected
+        assert last["total"] == expected and last["total_exact"] is True
+        assert client.get(path, params={"limit": 1000}).status_code == 422
+        assert client.get(path, params={"cursor": "garbage"}).status_code == 400
+        # 허용 목록에 없는 필터는 무시하지 않고 거부
+        assert client.get(path, params={"hashed_password": "x"}).status_code == 400
+
+
+def test_whitelisted_filters(session_factory):
+    with _client(session_factory) as client:
+        items, _ = _walk(client, "/users/all", plan="pro", limit=4)
+        assert [item["id"] for item in items] == [30, 27, 24, 21, 18, 15, 12, 9, 6, 3]
+        admins, _ = _walk(client, "/users/all", is_admin="true")
+        assert [item["id"] for item in admins] == [1]
+
+        expired, _ = _walk(client, "/licenses/", status="expired", user_id=1, limit=2)
+        assert expired and all(item["status"] == "expired" and item["user_id"] == 1 for item in expired)
+
+        banked, _ = _walk(client, "/payments/", method="bank")
+        assert len(banked) == 30
+
+        recent, _ = _walk(client, "/usages/", date_from=(START + timedelta(days=18)).isoformat(), limit=2)
+        assert [item["post_count"] for item in recent] == [59, 58, 57, 56, 55, 54]
+
+
+def test_non_admin_sees_only_own_rows(session_factory):
+    with _client(session_factory, is_admin=False, user_id=2) as client:
+        items, _ = _walk(client, "/licenses/", limit=9)
+        assert len(items) == 30 and {item["user_id"] for item in items} == {2}
+        # 다른 사용자로 필터해도 본인 범위를 벗어나지 않음
+        assert client.get("/usages/", params={"user_id": 1}).json()["items"] == []
+        assert client.get("/users/all").status_code == 403
+
+
+def test_stream_returns_every_row_in_chunks(session_factory, monkeypatch):
+    monkeypatch.setattr(usages.usage_pages, "stream_chunk", 8)
+    monkeypatch.setattr(payments.payment_pages, "stream_chunk", 10)
+    with _client(session_factory) as client:
+        streamed = client.get("/usages/", params={"stream": "true"})
+        assert streamed.headers["content-type"] == "application/json"
+        rows = json.loads(streamed.content)
+        paged, _ = _walk(client, "/usages/", limit=11)
+        assert rows == paged
+
+        filtered = json.loads(client.get("/payments/", params={"stream": "true", "method": "card"}).content)
+        assert len(filtered) == 30
+        assert json.loads(client.get("/payments/", params={"stream": "true", "method": "none"}).content) == []
+
+
+def test_sort_keys_are_not_null(session_factory):
+    # NULL 정렬 키 행은 커서 비교에서 빠지므로 컬럼/페이지네이터 양쪽에서 막음
+    with session_factory() as db:
+        with pytest.raises(IntegrityError):
+            db.execute(update(models.Usage).where(models.Usage.id == 1).values(date=None))
+    with pytest.raises(ValueError):
+        KeysetPaginator(models.Purchase, keys=(models.Purchase.activation_date, models.Purchase.id),
+                        filters={}, schema=usages.schemas.UsageOut)
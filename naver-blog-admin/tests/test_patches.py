@@ -0,0 +1,135 @@
+import os
+import random
+import sys
+import zipfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base, get_db
+from app.patches import PatchError, apply_patch, find_update, publish_build
+from app.releases import ReleaseRegistry, release_registry
+from app.routers import purchases
+
+LICENSE = "V23-A2P3-ABCDEF12"
+
+
+def _random(seed: int, size: int) -> bytes:
+    return random.Random(seed).randbytes(size)
+
+
+# 빌드별 항목 (압축되지 않는 큰 바이너리 + 작은 설정 파일)
+BUILDS = {
+    "1.0.0": {"app/main.exe": _random(1, 2_000_000), "app/lib/core.dll": _random(2, 1_000_000),
+              "config/default.json": b'{"delay": 3}', "readme.txt": b"v1.0.0"},
+    "1.1.0": {"app/main.exe": _random(1, 2_000_000), "app/lib/core.dll": _random(2, 1_000_000),
+              "config/default.json": b'{"delay": 5}', "readme.txt": b"v1.1.0", "app/lib/new.dll": b"x" * 1000},
+    "1.2.0": {"app/main.exe": _random(1, 2_000_000), "app/lib/core.dll": _random(3, 1_000_000),
+              "config/default.json": b'{"delay": 5}', "readme.txt": b"v1.2.0"},
+}
+
+
+def _package(path, entries: dict):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+        for name, data in entries.items():
+            package.writestr(name, data)
+    return str(path)
+
+
+def _entries(path) -> dict:
+    with zipfile.ZipFile(path) as package:
+        return {name: package.read(name) for name in package.namelist()}
+
+
+def _publish(channel_dir, tmp_path, direct_patches=5):
+    for build, entries in BUILDS.items():
+        publish_build(str(channel_dir), build, _package(tmp_path / f"pkg-{build}.zip", entries),
+                      direct_patches=direct_patches)
+    registry = ReleaseRegistry(str(channel_dir), poll_seconds=0)
+    registry.scan()
+    return registry.release("stable")
+
+
+def test_publish_generates_small_patches_and_smallest_chain(tmp_path):
+    release = _publish(tmp_path / "downloads", tmp_path)
+    assert release.latest_build == "1.2.0"
+    assert set(release.history) == set(BUILDS)
+    assert set(release.patches) == {("1.0.0", "1.1.0"), ("1.0.0", "1.2.0"), ("1.1.0", "1.2.0")}
+    assert release.patches[("1.0.0", "1.1.0")].size < 5_000
+
+    plan = find_update(release, "1.0.0")
+    assert plan.mode == "patch"
+    # 1.0.0 -> 1.2.0 직접 패치가 두 단계 합계보다 작음
+    assert [(from_build, to_build) for from_build, to_build, _ in plan.patches] == [("1.0.0", "1.2.0")]
+    assert plan.patch_size < release.default.size / 2
+
+    assert find_update(release, "1.2.0").mode == "none"
+    assert find_update(release, "0.9.0").mode == "full"
+
+
+def test_patch_chain_reproduces_latest_build(tmp_path):
+    release = _publish(tmp_path / "downloads", tmp_path, direct_patches=1)
+    plan = find_update(release, "1.0.0")
+    assert [(from_build, to_build) for from_build, to_build, _ in plan.patches] == [
+        ("1.0.0", "1.1.0"), ("1.1.0", "1.2.0")
+    ]
+
+    current = _package(tmp_path / "client.zip", BUILDS["1.0.0"])
+    for _, to_build, artifact in plan.patches:
+        updated = str(tmp_path / f"client-{to_build}.zip")
+        apply_patch(current, artifact.path, updated)
+        current = updated
+    assert _entries(current) == BUILDS["1.2.0"]
+
+    # 이전 빌드가 손상됐으면 적용하지 않음
+    broken = dict(BUILDS["1.0.0"], **{"app/main.exe": b"corrupted"})
+    with pytest.raises(PatchError):
+        apply_patch(_package(tmp_path / "broken.zip", broken), plan.patches[0][2].path, str(tmp_path / "out.zip"))
+    assert not os.path.exists(tmp_path / "out.zip")
+
+
+def test_update_endpoint_returns_patch_urls(tmp_path, monkeypatch):
+    download_dir = tmp_path / "downloads"
+    _publish(download_dir, tmp_path)
+    monkeypatch.setattr(release_registry, "download_dir", str(download_dir))
+    release_registry.scan()
+
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(models.Purchase(order_id="ORDER-1", version="2.3", temporary_license=LICENSE,
+                               expire_date=datetime.utcnow() + timedelta(days=30), status="activated"))
+        db.commit()
+    def override_get_db():
+        with sessionmaker(bind=engine)() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(purchases.router)
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as client:
+        update = client.get(f"/purchases/update/{LICENSE}", params={"current_build": "1.1.0"}).json()
+        assert update["mode"] == "patch"
+        assert update["latest_build"] == "1.2.0"
+        patch, = update["patches"]
+        assert patch["size"] < update["full_size"]
+
+        response = client.get(patch["url"].removeprefix(purchases.get_settings().BASE_URL))
+        assert response.status_code == 200
+        assert len(response.content) == patch["size"]
+        resumed = client.get(patch["url"].removeprefix(purchases.get_settings().BASE_URL),
+                             headers={"Range": "bytes=100-"})
+        assert resumed.content == response.content[100:]
+
+        assert client.get(f"/purchases/update/{LICENSE}", params={"current_build": "1.2.0"}).json()["mode"] == "none"
+        assert client.get("/purchases/update/UNKNOWN", params={"current_build": "1.0.0"}).status_code == 404
+        assert client.get(f"/purchases/update/{LICENSE}/patch/0.1.0/1.2.0").status_code == 404
+    engine.dispose()
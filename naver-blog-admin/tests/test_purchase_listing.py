@@ -0,0 +1,100 @@
+import os
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base, get_db
+from app.routers import purchases
+from app.routers.users import get_current_user
+
+START = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        for i in range(25):
+            db.add(models.Purchase(
+                order_id=f"ORDER-{i:02}",
+                customer_name=f"고객{i}",
+                customer_email="vip@example.com" if i % 5 == 0 else f"buyer{i}@example.com",
+                version="2.3" if i % 2 else "1.1",
+                account_count=1, post_count=1, months=1, amount=100000,
+                expire_date=START + timedelta(days=30),
+                status="activated" if i % 3 == 0 else "pending",
+                # 같은 시각에 만들어진 구매도 id로 순서가 정해짐
+                created_at=START + timedelta(hours=i // 2),
+            ))
+        db.commit()
+
+    def override_get_db():
+        with sessionmaker(bind=engine)() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(purchases.router)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(is_admin=True)
+    with TestClient(app) as test_client:
+        yield test_client
+    engine.dispose()
+
+
+def _all_pages(client, **params):
+    orders, cursor = [], None
+    while True:
+        page = client.get("/purchases/", params={**params, **({"cursor": cursor} if cursor else {})}).json()
+        orders += [item["order_id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return orders, page
+
+
+def test_keyset_pages_cover_every_purchase_once_newest_first(client):
+    first = client.get("/purchases/", params={"limit": 10}).json()
+    assert first["total"] == 25 and first["total_exact"] is True
+    assert first["size"] == 10
+    assert first["items"][0]["order_id"] == "ORDER-24"
+
+    orders, last = _all_pages(client, limit=10)
+    assert orders == [f"ORDER-{i:02}" for i in reversed(range(25))]
+    assert last["size"] == 5
+
+    assert client.get("/purchases/", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/purchases/", params={"limit": 1000}).status_code == 422
+
+
+def test_filters_combine_with_cursor(client):
+    orders, page = _all_pages(client, limit=2, status="activated", version="1.1")
+    expected = [f"ORDER-{i:02}" for i in reversed(range(25)) if i % 3 == 0 and i % 2 == 0]
+    assert orders == expected
+    assert page["total"] == len(expected)
+
+    orders, _ = _all_pages(client, customer_email="vip@example.com")
+    assert orders == ["ORDER-20", "ORDER-15", "ORDER-10", "ORDER-05", "ORDER-00"]
+
+    orders, _ = _all_pages(client, created_from=(START + timedelta(hours=2)).isoformat(),
+                           created_to=(START + timedelta(hours=4)).isoformat())
+    assert orders == ["ORDER-07", "ORDER-06", "ORDER-05", "ORDER-04"]
+
+
+def test_total_is_capped_estimate(client, monkeypatch):
+    monkeypatch.setattr(purchases.purchase_pages, "count_limit", 10)
+    page = client.get("/purchases/", params={"limit": 5}).json()
+    assert page["total"] == 10 and page["total_exact"] is False
+
+
+def test_non_admin_is_rejected(client):
+    client.app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(is_admin=False)
+    assert client.get("/purchases/").status_code == 403
@@ -0,0 +1,192 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+pytest.importorskip("aiosqlite")
+
+from app import models
+from app.database import Base, async_database_url, get_async_db, get_db
+from app.download_events import DownloadEventLog
+from app.releases import release_registry
+from app.routers import purchases
+
+LICENSE = "V11-A1P1-ABCDEF12"
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    downloads = tmp_path / "static" / "downloads"
+    downloads.mkdir(parents=True)
+    (downloads / "naver-blog-automation-latest.zip").write_bytes(b"PK\x05\x06" + b"\0" * 18)
+    release_registry.scan()
+
+    path = tmp_path / "app.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(models.Purchase(
+            order_id="ORDER-1",
+            customer_email="buyer@example.com",
+            version="1.1",
+            account_count=1,
+            post_count=1,
+            months=1,
+            temporary_license=LICENSE,
+            expire_date=datetime.utcnow() + timedelta(days=30),
+            status="pending",
+        ))
+        db.commit()
+    engine.dispose()
+    return path
+
+
+@pytest.fixture
+def client(db_path):
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    engine = create_engine(f"sqlite:///{db_path}")
+
+    def override_get_db():
+        with sessionmaker(bind=engine)() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(purchases.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as client:
+        yield client
+    engine.dispose()
+
+
+def _purchase(db_path):
+    engine = create_engine(f"sqlite:///{db_path}")
+    with sessionmaker(bind=engine)() as db:
+        purchase = db.query(models.Purchase).filter_by(temporary_license=LICENSE).one()
+    engine.dispose()
+    return purchase
+
+
+def test_hot_routes_are_async():
+    for endpoint in (purchases.activate_license, purchases.validate_license):
+        assert asyncio.iscoroutinefunction(endpoint)
+    # 다운로드는 조회 한 번뿐이라 동기 Session (SQLite에서 aiosqlite보다 지연 시간이 짧음)
+    assert not asyncio.iscoroutinefunction(purchases.download_program)
+
+
+def test_activate_then_validate(client, db_path):
+    response = client.post(
+        "/purchases/activate", json={"temporary_license": LICENSE, "hardware_id": "HWID-1"}
+    )
+    assert response.status_code == 200
+    license_key = response.json()["license_key"]
+    assert _purchase(db_path).status == "activated"
+
+    again = client.post(
+        "/purchases/activate", json={"temporary_license": LICENSE, "hardware_id": "HWID-1"}
+    )
+    assert again.status_code == 400
+
+    valid = client.post(
+        "/purchases/validate", params={"license_key": license_key, "hardware_id": "HWID-1"}
+    )
+    assert valid.json()["valid"] is True
+    wrong = client.post(
+        "/purchases/validate", params={"license_key": license_key, "hardware_id": "HWID-2"}
+    )
+    assert wrong.json()["valid"] is False
+
+
+def test_unknown_license_is_404(client):
+    response = client.post(
+        "/purchases/activate", json={"temporary_license": "V11-A1P1-00000000", "hardware_id": "HWID-1"}
+    )
+    assert response.status_code == 404
+    assert client.get("/purchases/download/V11-A1P1-00000000").status_code == 404
+
+
+def test_download_updates_statistics(client, db_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{db_path}")
+    event_log = DownloadEventLog(sessionmaker(bind=engine))
+    monkeypatch.setattr(purchases, "download_event_log", event_log)
+    for _ in range(2):
+        response = client.get(f"/purchases/download/{LICENSE}")
+        assert response.status_code == 200
+        assert response.content.startswith(b"PK")
+    # 다운로드 경로는 DB에 쓰지 않음
+    assert _purchase(db_path).download_count == 0
+    assert event_log.flush() == 2
+    assert event_log.materialize() == 2
+    engine.dispose()
+    purchase = _purchase(db_path)
+    assert purchase.download_count == 2
+    assert purchase.last_download_date is not None
+
+
+def test_async_database_url():
+    assert async_database_url("sqlite:///./app.db").drivername == "sqlite+aiosqlite"
+    assert async_database_url("postgresql://u:p@h/db").drivername == "postgresql+asyncpg"
+    assert async_database_url("postgresql+asyncpg://u:p@h/db").drivername == "postgresql+asyncpg"
+
+
+def _final_license(hardware_id):
+    return purchases.generate_final_license({
+        "order_id": "ORDER-1",
+        "hardware_id": hardware_id,
+        "version": "1.1",
+        "account_count": 1,
+        "post_count": 1,
+        "expire_date": datetime.utcnow() + timedelta(days=30),
+    })
+
+
+@pytest.mark.parametrize("count", [3, purchases.BATCH_VALIDATE_CHUNK * 2 + 5])
+def test_validate_batch_returns_verdicts_in_order(client, count):
+    items = [
+        {"license_key": _final_license(f"HWID-{i}"), "hardware_id": f"HWID-{i if i % 3 else 'X'}"}
+        for i in range(count)
+    ]
+    response = client.post("/purchases/validate/batch", json=items)
+    assert response.status_code == 200
+    verdicts = response.json()
+    assert len(verdicts) == count
+    assert [verdict["valid"] for verdict in verdicts] == [bool(i % 3) for i in range(count)]
+
+
+def test_validate_batch_rejects_oversized_batch(client):
+    items = [{"license_key": "x", "hardware_id": "y"}] * (purchases.BATCH_VALIDATE_MAX_ITEMS + 1)
+    assert client.post("/purchases/validate/batch", json=items).status_code == 422
+
+
+def test_client_batched_call(client, monkeypatch):
+    from app import client_license_system
+
+    monkeypatch.setattr(
+        client_license_system.requests,
+        "post",
+        lambda url, json, timeout: client.post(url.replace("http://fleet", ""), json=json),
+    )
+    monkeypatch.setattr(client_license_system.LicenseManager, "BATCH_VALIDATE_MAX_ITEMS", 2)
+    manager = client_license_system.LicenseManager(server_url="http://fleet")
+    licenses = [
+        {"license_key": _final_license(f"HWID-{i}"), "hardware_id": f"HWID-{i}"} for i in range(5)
+    ]
+    results = asyncio.run(manager.validate_licenses_batch(licenses))
+    assert [result["valid"] for result in results] == [True] * 5
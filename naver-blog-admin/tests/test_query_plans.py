@@ -0,0 +1,96 @@
+"""
+핫 경로 조회가 인덱스를 타는지 확인하는 쿼리 플랜 회귀 테스트
+
+SQLite의 EXPLAIN QUERY PLAN 결과에 테이블 전체 SCAN이 있으면 실패.
+모델(create_all)과 alembic 마이그레이션 결과 스키마 모두 검사.
+"""
+
+import os
+import subprocess
+from datetime import datetime
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+from sqlalchemy import create_engine, select, tuple_
+
+from app import models
+from app.database import Base
+
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+
+# (설명, 조회문) - 라우터에서 요청마다 실행되는 조회
+HOT_LOOKUPS = [
+    ("activate/download: 임시 라이선스",
+     select(models.Purchase).where(models.Purchase.temporary_license == "V11-A1P1-ABCDEF12")),
+    ("order: 주문번호",
+     select(models.Purchase).where(models.Purchase.order_id == "ORDER-1")),
+    ("하드웨어 ID",
+     select(models.Purchase).where(models.Purchase.hardware_id == "HWID-1234")),
+    ("auth/refresh: 리프레시 토큰",
+     select(models.User).where(models.User.refresh_token == "token")),
+    ("get_current_user: 이메일",
+     select(models.User).where(models.User.email == "user@example.com")),
+    ("licenses: 라이선스 키",
+     select(models.License).where(models.License.key == "KEY")),
+    ("purchases 목록: 키셋 다음 페이지",
+     select(models.Purchase)
+     .where(tuple_(models.Purchase.created_at, models.Purchase.id) < tuple_(datetime(2026, 1, 1), 100))
+     .order_by(models.Purchase.created_at.desc(), models.Purchase.id.desc()).limit(50)),
+    ("purchases 목록: 상태 필터 + 키셋",
+     select(models.Purchase)
+     .where(models.Purchase.status == "activated",
+            tuple_(models.Purchase.created_at, models.Purchase.id) < tuple_(datetime(2026, 1, 1), 100))
+     .order_by(models.Purchase.created_at.desc(), models.Purchase.id.desc()).limit(50)),
+    ("users 목록: 플랜 필터 + 키셋",
+     select(models.User).where(models.User.plan == "pro", models.User.id < 100)
+     .order_by(models.User.id.desc()).limit(50)),
+    ("licenses 목록: 사용자 범위 + 키셋",
+     select(models.License).where(models.License.user_id == 1, models.License.id < 100)
+     .order_by(models.License.id.desc()).limit(50)),
+    ("payments 목록: 상태 필터 + 키셋",
+     select(models.Payment).where(models.Payment.status == "paid", models.Payment.id < 100)
+     .order_by(models.Payment.id.desc()).limit(50)),
+    ("usages 목록: 사용자 범위 + 날짜 키셋",
+     select(models.Usage)
+     .where(models.Usage.user_id == 1,
+            tuple_(models.Usage.date, models.Usage.id) < tuple_(datetime(2026, 1, 1), 100))
+     .order_by(models.Usage.date.desc(), models.Usage.id.desc()).limit(50)),
+    ("download-info: 반영 전 다운로드 이벤트",
+     select(models.DownloadEvent).where(models.DownloadEvent.purchase_id == 1, models.DownloadEvent.id > 100)),
+]
+
+
+def _query_plan(engine, statement) -> list[str]:
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").fetchall()
+    return [row[-1] for row in rows]
+
+
+@pytest.fixture(scope="module")
+def model_engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+@pytest.fixture(scope="module")
+def migrated_engine(tmp_path_factory):
+    path = tmp_path_factory.mktemp("alembic") / "plan.db"
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}")
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=APP_ROOT, env=env, check=True, capture_output=True,
+    )
+    return create_engine(f"sqlite:///{path}")
+
+
+@pytest.mark.parametrize("name,statement", HOT_LOOKUPS, ids=[name for name, _ in HOT_LOOKUPS])
+@pytest.mark.parametrize("schema", ["model_engine", "migrated_engine"])
+def test_hot_lookup_uses_index(request, schema, name, statement):
+    engine = request.getfixturevalue(schema)
+    plan = _query_plan(engine, statement)
+    assert not any(step.startswith("SCAN") for step in plan), f"{name}: {plan}"
+    assert any("USING" in step and "INDEX" in step for step in plan), f"{name}: {plan}"
@@ -0,0 +1,39 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.rate_limit import MemoryRateLimitBackend, RateLimiter, RateLimitRule
+
+RULE = RateLimitRule("default", limit=3, window=60)
+
+
+def test_blocks_after_limit_and_recovers():
+    backend = MemoryRateLimitBackend()
+    results = [backend.hit("ip", RULE, now=1000.0 + i) for i in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert results[-1].retry_after > 0
+    # 이전 윈도우 가중치가 충분히 줄어들면 다시 허용
+    assert backend.hit("ip", RULE, now=1119.0).allowed
+
+
+def test_idle_clients_are_evicted():
+    backend = MemoryRateLimitBackend(shards=1)
+    for i in range(100):
+        backend.hit(f"10.0.0.{i}", RULE, now=1000.0)
+    assert len(backend) == 100
+    backend.hit("10.0.1.1", RULE, now=1200.0)
+    assert len(backend) == 1
+
+
+def test_route_rules_use_longest_prefix_and_separate_budgets():
+    validate = RateLimitRule("validate", limit=5)
+    limiter = RateLimiter(
+        MemoryRateLimitBackend(), RULE, [("/purchases", RULE), ("/purchases/validate", validate)]
+    )
+    assert limiter.rule_for("/purchases/validate") is validate
+    assert limiter.rule_for("/users/1") is RULE
+    for _ in range(3):
+        assert limiter.hit("ip", "/users/1").allowed
+    assert not limiter.hit("ip", "/users/1").allowed
+    assert limiter.hit("ip", "/purchases/validate").allowed
@@ -0,0 +1,149 @@
+import asyncio
+import multiprocessing
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.insert(0, APP_DIR)
+
+from app.rate_limit import RateLimiter, RateLimitRule, SQLiteRateLimitBackend
+
+RULE = RateLimitRule("default", limit=50, window=60)
+
+
+def _worker(path, attempts, results):
+    # 예산 공유만 확인 (락 대기로 통과되는 요청이 섞이지 않도록 충분히 기다림)
+    backend = SQLiteRateLimitBackend(path, busy_timeout_ms=5000)
+    allowed = sum(backend.hit("10.0.0.1", RULE).allowed for _ in range(attempts))
+    results.put(allowed)
+
+
+def test_sqlite_backend_shares_budget_between_processes(tmp_path):
+    path = str(tmp_path / "rate_limit.db")
+    SQLiteRateLimitBackend(path)
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=_worker, args=(path, 40, results)) for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+    assert sum(results.get(timeout=5) for _ in workers) == RULE.limit
+
+
+def _lock(path) -> sqlite3.Connection:
+    """다른 워커가 쓰기 트랜잭션을 잡고 있는 상태 재현"""
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("BEGIN IMMEDIATE")
+    return conn
+
+
+def test_sqlite_backend_fails_open_while_store_is_locked(tmp_path):
+    path = str(tmp_path / "rate_limit.db")
+    backend = SQLiteRateLimitBackend(path, busy_timeout_ms=50)
+    rule = RateLimitRule("default", limit=1, window=60)
+    locker = _lock(path)
+    try:
+        start = time.perf_counter()
+        assert backend.hit("10.0.0.1", rule).allowed
+        assert time.perf_counter() - start < 1
+        assert backend.failed_open == 1
+    finally:
+        locker.execute("ROLLBACK")
+        locker.close()
+    # 락이 풀리면 다시 예산 적용
+    assert backend.hit("10.0.0.1", rule).allowed
+    assert not backend.hit("10.0.0.1", rule).allowed
+
+
+def test_limiter_waits_for_sqlite_lock_off_the_event_loop(tmp_path):
+    path = str(tmp_path / "rate_limit.db")
+    limiter = RateLimiter(SQLiteRateLimitBackend(path, busy_timeout_ms=1000), RULE)
+    locker = _lock(path)
+
+    async def run():
+        hit = asyncio.create_task(limiter.ahit("10.0.0.1", "/health"))
+        start = time.perf_counter()
+        await asyncio.sleep(0.05)
+        # 락 대기 중에도 이벤트 루프는 다른 요청을 처리함
+        responsive = time.perf_counter() - start
+        locker.execute("ROLLBACK")
+        return responsive, await hit
+
+    try:
+        responsive, result = asyncio.run(run())
+    finally:
+        locker.close()
+    assert responsive < 0.5
+    assert result.allowed
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _status(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as res:
+            return res.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def test_uvicorn_workers_enforce_single_budget(tmp_path):
+    pytest.importorskip("uvicorn")
+    env = dict(
+        os.environ,
+        PYTHONPATH=APP_DIR,
+        DATABASE_URL=f"sqlite:///{tmp_path / 'app.db'}",
+        MAIL_SSL="false",
+        RATE_LIMIT_PER_MINUTE="10",
+        RATE_LIMIT_BACKEND="sqlite",
+        RATE_LIMIT_STORE_PATH=str(tmp_path / "rate_limit.db"),
+        RATE_LIMIT_BUSY_TIMEOUT_MS="5000",
+    )
+    subprocess.run(
+        [sys.executable, "-c", "from app import models; from app.database import Base, engine; "
+         "Base.metadata.create_all(bind=engine)"],
+        cwd=tmp_path, env=env, check=True,
+    )
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", "3"],
+        cwd=tmp_path, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        # 관리자 라우트 예산으로 기동 여부 확인 (기본 예산은 소모하지 않음)
+        deadline = time.time() + 30
+        while _status_or_none(f"http://127.0.0.1:{port}/api/realtime/stats") != 200:
+            assert time.time() < deadline, "uvicorn workers did not start"
+            time.sleep(0.2)
+        time.sleep(1)  # 나머지 워커 기동 대기
+
+        # 동시 요청으로 여러 워커에 분산시킴
+        with ThreadPoolExecutor(max_workers=30) as pool:
+            statuses = list(pool.map(_status, [f"http://127.0.0.1:{port}/health"] * 30))
+        assert statuses.count(200) == 10
+        assert statuses.count(429) == 20
+    finally:
+        server.terminate()
+        server.wait(10)
+
+
+def _status_or_none(url):
+    try:
+        return _status(url)
+    except OSError:
+        return None
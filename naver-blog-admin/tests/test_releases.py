@@ -0,0 +1,96 @@
+import builtins
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+
+from app.releases import ReleaseRegistry
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+
+
+@pytest.fixture
+def download_dir(tmp_path):
+    root = tmp_path / "downloads"
+    _write(root / "naver-blog-automation-latest.zip", b"stable")
+    _write(root / "naver-blog-automation-v2.3.zip", b"stable-2.3")
+    _write(root / "version_info.json", json.dumps({"version": "3.1.0", "requirements": ["Windows 10"]}).encode())
+    _write(root / "beta" / "naver-blog-automation-unified.exe", b"beta")
+    _write(root / "beta" / "version_info.json", json.dumps({"version": "3.2.0-beta"}).encode())
+    _write(root / "empty" / "README.txt", b"")
+    return root
+
+
+def test_scan_builds_channels_and_version_builds(download_dir):
+    registry = ReleaseRegistry(str(download_dir), poll_seconds=0)
+    assert registry.channels() == ["beta", "stable"]
+
+    stable = registry.release("stable")
+    assert stable.program_info["latest_version"] == "3.1.0"
+    assert stable.program_info["requirements"] == ["Windows 10"]
+    assert stable.artifact("1.1").path.endswith("naver-blog-automation-latest.zip")
+    build = stable.artifact("2.3")
+    assert build.size == len(b"stable-2.3")
+    assert build.etag == f'"{build.sha256[:32]}"'
+
+    beta = registry.release("beta")
+    assert beta.program_info["latest_version"] == "3.2.0-beta"
+    assert beta.artifact("2.3").path.endswith("naver-blog-automation-unified.exe")
+    assert registry.release("nightly") is None
+
+
+def test_lookups_do_not_touch_the_filesystem(download_dir, monkeypatch):
+    registry = ReleaseRegistry(str(download_dir), poll_seconds=0)
+    registry.scan()
+
+    def forbidden(*args, **kwargs):
+        raise AssertionError("filesystem access on the hot path")
+
+    monkeypatch.setattr(os, "scandir", forbidden)
+    monkeypatch.setattr(os, "stat", forbidden)
+    monkeypatch.setattr(builtins, "open", forbidden)
+    for _ in range(100):
+        assert registry.release("stable").artifact("2.3").size == len(b"stable-2.3")
+        assert registry.release("beta").program_info["latest_version"] == "3.2.0-beta"
+
+
+def test_rescan_only_rehashes_changed_files(download_dir):
+    registry = ReleaseRegistry(str(download_dir), poll_seconds=0)
+    registry.scan()
+    hashes = registry.stats()["hashes"]
+    assert hashes == 3
+    assert registry.scan() is False
+
+    _write(download_dir / "naver-blog-automation-latest.zip", b"stable, rebuilt")
+    (download_dir / "beta" / "naver-blog-automation-unified.exe").unlink()
+    assert registry.scan() is True
+    assert registry.stats()["hashes"] == hashes + 1
+    assert registry.release("stable").artifact().size == len(b"stable, rebuilt")
+    # 기본 패키지가 없어도 version_info가 있으면 채널 유지
+    assert registry.release("beta").artifact() is None
+
+    # stable/ 폴더가 있으면 최상위 대신 사용
+    _write(download_dir / "stable" / "naver-blog-automation-latest.zip", b"moved")
+    registry.scan()
+    assert registry.release("stable").artifact().size == len(b"moved")
+    assert registry.release("stable").builds == {}
+
+
+def test_poller_picks_up_new_release(download_dir):
+    registry = ReleaseRegistry(str(download_dir), poll_seconds=0.02)
+    registry.start()
+    try:
+        _write(download_dir / "naver-blog-automation-v5.10.zip", b"5.10")
+        deadline = time.monotonic() + 5
+        while "5.10" not in registry.release("stable").builds:
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.01)
+    finally:
+        registry.stop()
@@ -0,0 +1,209 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+pytest.importorskip("aiosqlite")
+
+from app import client_license_system, models
+from app.client_license_system import LicenseManager
+from app.config import get_settings
+from app.database import Base, get_async_db
+from app.license_validation import LicenseSigner, generate_private_key_pem, license_validator, load_revoked_licenses
+from app.revocation import BloomFilter, RevocationList, revoke_order
+from app.routers import purchases
+
+
+def _final_license(order_id, hardware_id="HWID-1"):
+    return purchases.generate_final_license({
+        "order_id": order_id,
+        "hardware_id": hardware_id,
+        "version": "2.3",
+        "account_count": 2,
+        "post_count": 3,
+        "expire_date": datetime.utcnow() + timedelta(days=30),
+    })
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    for i in range(3):
+        session.add(models.Purchase(
+            order_id=f"ORDER-{i}",
+            customer_email=f"buyer{i}@example.com",
+            version="2.3",
+            account_count=2,
+            post_count=3,
+            months=1,
+            temporary_license=f"V23-A2P3-0000000{i}",
+            final_license=_final_license(f"ORDER-{i}") if i else None,
+            expire_date=datetime.utcnow() + timedelta(days=30),
+            status="activated" if i else "pending",
+        ))
+    session.commit()
+    license_validator.clear()
+    yield session
+    session.close()
+    engine.dispose()
+    license_validator.clear()
+
+
+@pytest.fixture
+def client(db, tmp_path, monkeypatch):
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}", poolclass=NullPool)
+    AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSession() as session:
+            yield session
+
+    # 테스트마다 새 DB이므로 버전별 스냅샷 캐시도 새로 시작
+    monkeypatch.setattr(purchases, "revocation_list", RevocationList())
+    app = FastAPI()
+    app.include_router(purchases.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def manager(client, tmp_path, monkeypatch):
+    """서버 요청을 TestClient로 보내는 소비자 프로그램 LicenseManager"""
+    monkeypatch.setattr(client_license_system.requests, "get",
+                        lambda url, **kwargs: client.get(url.replace("http://localhost:8000", ""), **kwargs))
+    monkeypatch.setattr(LicenseManager, "REVOCATION_CACHE_FILE", str(tmp_path / "revocations.json"))
+    return LicenseManager()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter.for_capacity(2000)
+    items = [f"order:ORDER-{i}" for i in range(2000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+
+    false_positives = sum(f"order:OTHER-{i}" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.005
+
+
+def test_revocations_etag_and_delta(db, client):
+    empty = client.get("/purchases/revocations")
+    assert empty.status_code == 200
+    assert empty.json()["version"] == 0
+    assert empty.headers["etag"] == '"rev-0"'
+
+    first = revoke_order(db, "ORDER-1", "chargeback")
+    response = client.get("/purchases/revocations", headers={"If-None-Match": empty.headers["etag"]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["full"] is True
+    assert body["version"] == first.id
+    assert body["count"] == 2  # 주문번호 + 인증키 다이제스트
+    etag = response.headers["etag"]
+
+    not_modified = client.get("/purchases/revocations", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+
+    second = revoke_order(db, "ORDER-0")
+    delta = client.get("/purchases/revocations", params={"since": first.id},
+                       headers={"If-None-Match": etag}).json()
+    assert delta == {"version": second.id, "full": False, "since": first.id, "added": ["order:ORDER-0"]}
+
+    # 서버보다 앞선 버전은 전체 필터로 다시 받음
+    assert client.get("/purchases/revocations", params={"since": second.id + 10}).json()["full"] is True
+
+
+def test_revoked_license_fails_validation_and_activation(db, client):
+    purchase = db.query(models.Purchase).filter_by(order_id="ORDER-2").one()
+    final_license = purchase.final_license
+    assert license_validator.validate(final_license, "HWID-1")["valid"] is True
+
+    revoke_order(db, "ORDER-2")
+    assert license_validator.validate(final_license, "HWID-1")["valid"] is False
+
+    # 재시작 후에도 취소 목록에서 다시 불러옴
+    license_validator.clear()
+    load_revoked_licenses(db)
+    assert license_validator.validate(final_license, "HWID-1")["valid"] is False
+
+    revoke_order(db, "ORDER-0")
+    response = client.post("/purchases/activate", json={
+        "temporary_license": "V23-A2P3-00000000",
+        "hardware_id": "HWID-1",
+    })
+    assert response.status_code == 403
+
+
+def test_revocation_from_another_worker_reaches_cached_verdicts(db, client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "LICENSE_REVOCATION_SYNC_SECONDS", 0)
+    final_license = db.query(models.Purchase).filter_by(order_id="ORDER-1").one().final_license
+    params = {"license_key": final_license, "hardware_id": "HWID-1"}
+    assert client.post("/purchases/validate", params=params).json()["valid"] is True
+
+    # 다른 워커가 취소 (이 프로세스의 ORM 이벤트를 거치지 않는 Core INSERT/UPDATE)
+    db.execute(insert(models.LicenseRevocation).values(order_id="ORDER-1"))
+    db.execute(update(models.Purchase).where(models.Purchase.order_id == "ORDER-1").values(status="revoked"))
+    db.commit()
+
+    assert client.post("/purchases/validate", params=params).json() == {
+        "valid": False, "reason": "취소된 라이선스입니다"
+    }
+    batch = client.post("/purchases/validate/batch", json=[params]).json()
+    assert batch == [{"valid": False, "reason": "취소된 라이선스입니다"}]
+    assert license_validator.revocation_version == 1
+
+
+def test_revoke_unknown_order(db):
+    with pytest.raises(ValueError):
+        revoke_order(db, "ORDER-404")
+
+
+def test_client_checks_revocations_locally(db, manager, monkeypatch):
+    server_calls = []
+
+    async def fake_realtime():
+        server_calls.append(manager.stored_license)
+        return {"valid": False, "reason": "취소된 라이선스입니다"}
+
+    monkeypatch.setattr(manager, "validate_license_realtime", fake_realtime)
+    # 로컬 검증은 공개키로 서명을 확인할 수 있는 인증키만 가능
+    signer = LicenseSigner("EdDSA", private_key_pem=generate_private_key_pem("EdDSA"))
+    monkeypatch.setattr(purchases, "license_signer", signer)
+    manager.public_key_info = signer.public_key_info()
+    manager.hardware_id = "HWID-1"
+    manager.stored_license = _final_license("ORDER-1")
+
+    assert manager.refresh_revocations() is True
+    assert manager.is_possibly_revoked() is False
+    assert asyncio.run(manager.validate_license_cached())["valid"] is True
+    assert server_calls == []
+
+    revoke_order(db, "ORDER-1")
+    manager.refresh_revocations()
+    assert manager.revocations["version"] == 1
+    assert manager.is_possibly_revoked() is True
+    assert asyncio.run(manager.validate_license_cached())["valid"] is False
+    assert len(server_calls) == 1
+
+    # 다른 주문은 취소 목록 캐시 파일만으로 통과
+    other = LicenseManager()
+    other.hardware_id = "HWID-1"
+    other.stored_license = db.query(models.Purchase).filter_by(order_id="ORDER-2").one().final_license
+    other.revocations = other._load_revocations_from_file()
+    assert other.revocations["version"] == 1
+    assert other.is_possibly_revoked() is False
+    assert other.is_possibly_revoked(manager.stored_license) is True
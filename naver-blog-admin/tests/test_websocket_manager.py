@@ -0,0 +1,140 @@
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app import websocket_manager
+from app.websocket_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, gate: asyncio.Event = None):
+        self.received = []
+        self.closed = None
+        self.gate = gate
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.received.append(json.loads(message))
+
+    async def close(self, code=1000):
+        self.closed = code
+
+
+async def _settle():
+    # 발송 태스크들이 큐를 비울 때까지 몇 번 양보
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+def test_broadcast_serializes_once_and_reaches_everyone(monkeypatch):
+    dumps = []
+    original = websocket_manager.json.dumps
+    monkeypatch.setattr(websocket_manager.json, "dumps", lambda *a, **k: dumps.append(a) or original(*a, **k))
+
+    async def run():
+        manager = ConnectionManager(queue_size=8, send_timeout=1)
+        users = [FakeWebSocket() for _ in range(100)]
+        admin = FakeWebSocket()
+        for websocket in users:
+            await manager.connect(websocket)
+        await manager.connect(admin, is_admin=True)
+        assert (manager.user_count, manager.admin_count) == (100, 1)
+
+        assert await manager.broadcast_to_users({"type": "admin_notice", "message": "점검"}) == 100
+        await _settle()
+        assert all(websocket.received == [{"type": "admin_notice", "message": "점검"}] for websocket in users)
+        assert admin.received == []
+        assert len(dumps) == 1
+
+        manager.disconnect(users[0])
+        assert manager.user_count == 99
+        assert manager.disconnect(users[0]) is None
+
+    asyncio.run(run())
+
+
+def test_slow_consumer_does_not_stall_broadcast():
+    async def run():
+        manager = ConnectionManager(queue_size=8, send_timeout=0.05)
+        stuck = FakeWebSocket(gate=asyncio.Event())
+        fast = FakeWebSocket()
+        await manager.connect(stuck)
+        await manager.connect(fast)
+
+        await manager.broadcast_to_users({"n": 1})
+        await _settle()
+        assert fast.received == [{"n": 1}]
+
+        # 발송이 send_timeout 이상 막힌 연결은 끊김
+        await asyncio.sleep(0.1)
+        assert stuck.closed == 1013
+        assert manager.user_count == 1
+        assert manager.stats()["slow_disconnects"] == 1
+
+    asyncio.run(run())
+
+
+def test_full_queue_drops_oldest_messages():
+    async def run():
+        manager = ConnectionManager(queue_size=2, send_timeout=5)
+        gate = asyncio.Event()
+        websocket = FakeWebSocket(gate=gate)
+        await manager.connect(websocket)
+
+        await manager.broadcast_to_users({"n": 1})
+        await _settle()  # 1번은 발송 중
+        for n in range(2, 6):
+            await manager.broadcast_to_users({"n": n})
+        gate.set()
+        await _settle()
+        assert websocket.received == [{"n": 1}, {"n": 4}, {"n": 5}]
+        assert manager.stats()["dropped"] == 2
+
+    asyncio.run(run())
+
+
+def test_personal_messages_go_through_the_queue():
+    async def run():
+        manager = ConnectionManager(queue_size=4, send_timeout=1)
+        websocket = FakeWebSocket()
+        await manager.connect(websocket, is_admin=True)
+        await manager.send_json(websocket, {"type": "pong"})
+        await manager.broadcast_to_admins({"type": "user_activity"})
+        await _settle()
+        assert websocket.received == [{"type": "pong"}, {"type": "user_activity"}]
+
+    asyncio.run(run())
+
+
+def test_send_to_user_reaches_only_that_users_sockets():
+    async def run():
+        manager = ConnectionManager(queue_size=4, send_timeout=1)
+        first, second, other, anonymous = FakeWebSocket(), FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        await manager.connect(first, user_id=1)
+        await manager.connect(second, user_id=1)
+        await manager.connect(other, user_id=2)
+        await manager.connect(anonymous)
+        assert manager.connected_users == 2
+
+        assert await manager.send_to_user(1, {"type": "license_revoked"}) == 2
+        assert await manager.send_to_user(3, {"type": "license_revoked"}) == 0
+        await _settle()
+        assert first.received == second.received == [{"type": "license_revoked"}]
+        assert other.received == anonymous.received == []
+
+        # 연결이 모두 끊긴 사용자는 색인에서 제거
+        manager.disconnect(first)
+        assert manager.is_user_connected(1)
+        manager.disconnect(second)
+        assert not manager.is_user_connected(1)
+        assert manager.connected_users == 1
+        assert manager.user_count == 2
+
+    asyncio.run(run())
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.websocket_manager import ConnectionManager
+
+STATS_INTERVAL = 0.05
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.received = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        self.received.append(json.loads(message))
+
+    async def close(self, code=1000):
+        pass
+
+
+async def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def _workers(socket_path, count):
+    """같은 소켓 경로로 중계하는 워커(ConnectionManager) count개"""
+    workers = []
+    for _ in range(count):
+        manager = ConnectionManager(queue_size=16, send_timeout=1)
+        users = [FakeWebSocket() for _ in range(3)]
+        admin = FakeWebSocket()
+        for websocket in users:
+            await manager.connect(websocket)
+        await manager.connect(admin, is_admin=True)
+        await manager.start_relay(socket_path, stats_interval=STATS_INTERVAL)
+        workers.append((manager, users, admin))
+    for manager, _, _ in workers:
+        await manager.relay.wait_connected()
+    return workers
+
+
+def test_broadcast_reaches_every_worker_once(tmp_path):
+    async def run():
+        workers = await _workers(str(tmp_path / "ws.sock"), 3)
+        assert sum(manager.relay.is_broker for manager, _, _ in workers) == 1
+
+        sender = workers[1][0]
+        assert await sender.broadcast_to_users({"type": "admin_notice", "message": "점검"}) == 3
+        await _wait_for(lambda: all(ws.received for _, users, _ in workers for ws in users))
+        await asyncio.sleep(0.05)
+        for _, users, admin in workers:
+            assert all(ws.received == [{"type": "admin_notice", "message": "점검"}] for ws in users)
+            assert admin.received == []
+
+        await workers[2][0].broadcast_to_admins({"type": "user_activity", "user_id": "u1"})
+        await _wait_for(lambda: all(admin.received for _, _, admin in workers))
+        assert all(admin.received == [{"type": "user_activity", "user_id": "u1"}] for _, _, admin in workers)
+
+        # 특정 사용자 메시지는 그 사용자가 접속한 워커에서만 전달
+        target = FakeWebSocket()
+        await workers[2][0].connect(target, user_id=42)
+        assert await workers[0][0].send_to_user(42, {"type": "license_revoked"}) == 0
+        await _wait_for(lambda: target.received)
+        assert target.received == [{"type": "license_revoked"}]
+        assert all(len(ws.received) == 1 for _, users, _ in workers for ws in users)
+        workers[2][0].disconnect(target)
+
+        # 연결 수는 모든 워커 합계
+        await _wait_for(lambda: all(manager.total_counts() == (3, 9) for manager, _, _ in workers))
+        workers[0][0].disconnect(workers[0][1][0])
+        await _wait_for(lambda: workers[2][0].total_counts() == (3, 8))
+        assert workers[2][0].relay.workers() == 3
+
+        for manager, _, _ in workers:
+            await manager.stop_relay()
+
+    asyncio.run(run())
+
+
+def test_workers_elect_new_broker_when_broker_stops(tmp_path):
+    async def run():
+        workers = await _workers(str(tmp_path / "ws.sock"), 3)
+        broker = next(manager for manager, _, _ in workers if manager.relay.is_broker)
+        await broker.stop_relay()
+        survivors = [(manager, users) for manager, users, _ in workers if manager is not broker]
+
+        await _wait_for(lambda: sum(manager.relay.is_broker for manager, _ in survivors) == 1)
+        await _wait_for(lambda: all(manager.relay.connected for manager, _ in survivors))
+        # 재접속 직후 프레임이 유실되지 않도록 상대 워커가 보일 때까지 대기
+        await _wait_for(lambda: all(manager.relay.workers() == 2 for manager, _ in survivors))
+
+        await survivors[0][0].broadcast_to_users({"type": "admin_notice"})
+        await _wait_for(lambda: all(ws.received for ws in survivors[1][1]))
+        # 종료된 워커의 연결 수는 합계에서 빠짐
+        assert survivors[1][0].total_counts() == (2, 6)
+
+        for manager, _ in survivors:
+            await manager.stop_relay()
+
+    asyncio.run(run())
+
+
+def _process_worker(socket_path, index, workers, results):
+    async def run():
+        manager = ConnectionManager(queue_size=16, send_timeout=1)
+        users = [FakeWebSocket() for _ in range(5)]
+        for websocket in users:
+            await manager.connect(websocket)
+        await manager.start_relay(socket_path, stats_interval=STATS_INTERVAL)
+        await _wait_for(lambda: manager.relay.workers() == workers, timeout=10)
+        if index == 0:
+            await manager.broadcast_to_users({"type": "admin_notice", "from": os.getpid()})
+        await _wait_for(lambda: all(ws.received for ws in users), timeout=10)
+        results.put((index, manager.total_counts(), [ws.received for ws in users]))
+        # 다른 워커가 받을 때까지 중계 유지
+        await asyncio.sleep(0.5)
+        await manager.stop_relay()
+
+    asyncio.run(run())
+
+
+def test_broadcast_crosses_processes(tmp_path):
+    socket_path = str(tmp_path / "ws.sock")
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_process_worker, args=(socket_path, i, 3, results)) for i in range(3)
+    ]
+    for process in processes:
+        process.start()
+    collected = [results.get(timeout=20) for _ in processes]
+    for process in processes:
+        process.join(10)
+
+    senders = {received[0][0]["from"] for _, _, received in collected}
+    assert len(senders) == 1
+    assert all(len(received) == 5 and all(len(messages) == 1 for messages in received)
+               for _, _, received in collected)
+    assert all(counts == (0, 15) for _, counts, _ in collected)